@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Archive statistics for AusCheckt Is
+Aggregates the whole event history from the columnar event store in one
+pass over its columns into per-venue day and hour bitmaps: open days per venue and month, a weekday/hour
+heatmap, season start and end per venue and year, and the number of
+venues open per day. Renders generated/stats/index.html and stats.json
+"""
+
+import html
+import json
+from collections import Counter
+from datetime import date
+from itertools import compress
+from typing import Any, Dict, List, Tuple
+
+from event_store import FLAG_HAS_END, EventStore
+from site_templates import PageTemplate
+
+WEEKDAYS = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"]
+MONTHS = "Jän Feb Mär Apr Mai Jun Jul Aug Sep Okt Nov Dez".split()
+# 1970-01-01, day 0 of the store's epoch, was a Thursday
+EPOCH_WEEKDAY = 3
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def compute_stats(store: EventStore, labels: Dict[str, str]) -> Dict[str, Any]:
+    """All archive aggregates from one pass over the store's columns
+
+    Every venue gets a bytearray with one byte per day and one per hour of
+    the archive's time span; each row marks its days and hours with one
+    slice assignment. Overlapping archive files describe the same openings,
+    so the marks count distinct days and hours. Months and seasons are then
+    counted with one slice count per month and year, and the heatmap with
+    one strided slice count per weekday and hour.
+    """
+    count = store.count
+    if not count:
+        return _stats(store, labels, {}, 0, [[0] * 24 for _ in WEEKDAYS])
+
+    starts = store.columns["start"]
+    # Rows are in start order and none covers more than max_duration
+    first_day = starts[0] // 86400
+    base = first_day * 86400
+    span = (starts[count - 1] + max(store.max_duration, 1) - 1) // 86400 - first_day + 1
+    # Enough marks for the hours of the longest row
+    ones = memoryview(b"\x01" * (store.max_duration // 3600 + 2))
+
+    open_days: Dict[int, bytearray] = {}
+    open_hours: Dict[int, bytearray] = {}
+    for start, end, venue, flag in zip(
+        starts, store.columns["end"], store.columns["venue"], store.columns["flags"]
+    ):
+        days = open_days.get(venue)
+        if days is None:
+            days = open_days[venue] = bytearray(span)
+            open_hours[venue] = bytearray(span * 24)
+        hours = open_hours[venue]
+
+        start -= base
+        end -= base
+        if flag & FLAG_HAS_END and end > start:
+            # Hours open; without a closing time only the opening hour is known
+            day, last_day = start // 86400, (end - 1) // 86400
+            days[day : last_day + 1] = ones[: last_day - day + 1]
+            slot, last_slot = start // 3600, (end - 1) // 3600
+            hours[slot : last_slot + 1] = ones[: last_slot - slot + 1]
+        else:
+            days[start // 86400] = 1
+            hours[start // 3600] = 1
+
+    # Day index 0 of the span is a (first_day + EPOCH_WEEKDAY) % 7 weekday
+    heatmap = [[0] * 24 for _ in WEEKDAYS]
+    for hours in open_hours.values():
+        for weekday, row in enumerate(heatmap):
+            first = (weekday - first_day - EPOCH_WEEKDAY) % 7 * 24
+            for hour in range(24):
+                row[hour] += hours[first + hour :: 7 * 24].count(1)
+
+    return _stats(store, labels, open_days, first_day, heatmap)
+
+
+def _periods(first_day: int, span: int, key) -> List[Tuple[Any, int, int]]:
+    """(key, first, end) day index ranges of the span with equal key(date)"""
+    periods = []
+    for day in range(span):
+        value = key(date.fromordinal(EPOCH_ORDINAL + first_day + day))
+        if periods and periods[-1][0] == value:
+            continue
+        if periods:
+            periods[-1][2] = day
+        periods.append([value, day, span])
+    return [tuple(period) for period in periods]
+
+
+def _stats(
+    store: EventStore,
+    labels: Dict[str, str],
+    open_days: Dict[int, bytearray],
+    first_day: int,
+    heatmap: List[List[int]],
+) -> Dict[str, Any]:
+    """Stats of each venue's open days, counted month by month and year by year"""
+    span = len(next(iter(open_days.values()))) if open_days else 0
+    months = _periods(first_day, span, lambda day: day.strftime("%Y-%m"))
+    years = _periods(first_day, span, lambda day: day.year)
+
+    def to_date(day: int) -> str:
+        return date.fromordinal(EPOCH_ORDINAL + first_day + day).isoformat()
+
+    per_day = Counter()
+    venue_stats = {}
+    for venue_id in sorted(open_days, key=lambda v: store.venues[v]["key"]):
+        days = open_days[venue_id]
+        per_day.update(compress(range(span), days))
+        seasons = {}
+        for year, first, end in years:
+            count = days.count(1, first, end)
+            if count:
+                seasons[str(year)] = {
+                    "first": to_date(days.find(1, first, end)),
+                    "last": to_date(days.rfind(1, first, end)),
+                    "open_days": count,
+                }
+        per_month = {}
+        for month, first, end in months:
+            count = days.count(1, first, end)
+            if count:
+                per_month[month] = count
+        key = store.venues[venue_id]["key"]
+        venue_stats[key] = {
+            "label": labels.get(key, key),
+            "open_days": days.count(1),
+            "months": per_month,
+            "seasons": seasons,
+        }
+
+    return {
+        "events": store.count,
+        "first_day": to_date(min(per_day)) if per_day else None,
+        "last_day": to_date(max(per_day)) if per_day else None,
+        "venues": venue_stats,
+        "heatmap": {"weekdays": WEEKDAYS, "open_hours": heatmap},
+        "open_venues_per_day": {
+            to_date(day): count for day, count in sorted(per_day.items())
+        },
+    }
+
+
+def _timeline_svg(per_day: Dict[str, int]) -> str:
+    """Bar chart of open venues per day, one bar per calendar day"""
+    if not per_day:
+        return ""
+    days = list(per_day)
+    first = date.fromisoformat(days[0])
+    width = (date.fromisoformat(days[-1]) - first).days + 1
+    height = max(per_day.values())
+
+    bars = []
+    for day, count in per_day.items():
+        x = (date.fromisoformat(day) - first).days
+        bars.append(
+            f'<rect x="{x}" y="{height - count}" width="1" height="{count}">'
+            f"<title>{day}: {count}</title></rect>"
+        )
+    return (
+        f'<svg viewBox="0 0 {width} {height}" preserveAspectRatio="none" '
+        f'width="100%" height="160" fill="#457c43" role="img" '
+        f'aria-label="Geöffnete Heurige pro Tag">{"".join(bars)}</svg>'
+    )
+
+
+def _heatmap_table(heatmap: List[List[int]]) -> str:
+    peak = max((max(row) for row in heatmap), default=0) or 1
+    header = "".join(f"<th>{hour}</th>" for hour in range(24))
+    rows = []
+    for weekday, row in zip(WEEKDAYS, heatmap):
+        cells = "".join(
+            f'<td style="background-color: rgba(69, 124, 67, {count / peak:.2f})" '
+            f'title="{weekday} {hour}:00 - {count}"></td>'
+            for hour, count in enumerate(row)
+        )
+        rows.append(f"<tr><th>{weekday}</th>{cells}</tr>")
+    return (
+        '<table class="table table-sm table-bordered small text-center">'
+        f"<thead><tr><th></th>{header}</tr></thead><tbody>{''.join(rows)}</tbody></table>"
+    )
+
+
+def _season_table(venues: Dict[str, Any]) -> str:
+    rows = []
+    for venue in venues.values():
+        for year, season in venue["seasons"].items():
+            first = date.fromisoformat(season["first"]).strftime("%d.%m.")
+            last = date.fromisoformat(season["last"]).strftime("%d.%m.")
+            rows.append(
+                f"<tr><td>{html.escape(venue['label'])}</td><td>{year}</td>"
+                f"<td>{first}</td><td>{last}</td><td>{season['open_days']}</td></tr>"
+            )
+    return (
+        '<table class="table table-sm table-striped">'
+        "<thead><tr><th>Heuriger</th><th>Jahr</th><th>Erster Tag</th>"
+        "<th>Letzter Tag</th><th>Offene Tage</th></tr></thead>"
+        f"<tbody>{''.join(rows)}</tbody></table>"
+    )
+
+
+def _month_tables(venues: Dict[str, Any]) -> str:
+    years = sorted(
+        {month[:4] for venue in venues.values() for month in venue["months"]}
+    )
+    tables = []
+    header = "".join(f"<th>{month}</th>" for month in MONTHS)
+    for year in years:
+        rows = []
+        for venue in venues.values():
+            counts = [venue["months"].get(f"{year}-{m:02d}", 0) for m in range(1, 13)]
+            if not any(counts):
+                continue
+            cells = "".join(f"<td>{count or ''}</td>" for count in counts)
+            rows.append(f"<tr><td>{html.escape(venue['label'])}</td>{cells}</tr>")
+        tables.append(
+            f'<h4 class="h5 mt-4">{year}</h4>'
+            '<div class="table-responsive"><table class="table table-sm table-striped text-center">'
+            f"<thead><tr><th></th>{header}</tr></thead><tbody>{''.join(rows)}</tbody></table></div>"
+        )
+    return "".join(tables)
+
+
+def render_stats_page(stats: Dict[str, Any], template: PageTemplate) -> bytes:
+    first = stats["first_day"] and date.fromisoformat(stats["first_day"])
+    last = stats["last_day"] and date.fromisoformat(stats["last_day"])
+    period = (
+        f"{first.strftime('%d.%m.%Y')} bis {last.strftime('%d.%m.%Y')}"
+        if first
+        else "-"
+    )
+    return template.render(
+        event_count=str(stats["events"]),
+        venue_count=str(len(stats["venues"])),
+        period=period,
+        timeline=_timeline_svg(stats["open_venues_per_day"]),
+        heatmap=_heatmap_table(stats["heatmap"]["open_hours"]),
+        seasons=_season_table(stats["venues"]),
+        months=_month_tables(stats["venues"]),
+    )
+
+
+def stats_json(stats: Dict[str, Any]) -> bytes:
+    return json.dumps(stats, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
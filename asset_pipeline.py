@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Asset pipeline for AusCheckt Is
+Static files from input/assets get a content hash in their name
+(custom.3fa9c1d2.css) so they can be cached forever; well-known files that
+browsers and crawlers request by name keep it. References in the page
+templates and in CSS url() go through the asset manifest, and a sync only
+writes files whose content changed. Outdated files are kept for a few more
+builds, since cached pages (service worker, CDN) still reference them
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from fileutils import write_atomic
+
+# Served from the site root, everything else from /assets/
+ROOT_FILES = [
+    "custom.css",
+    "favicon.ico",
+    "favicon.svg",
+    "favicon-96x96.png",
+    "apple-touch-icon.png",
+    "web-app-manifest-192x192.png",
+    "web-app-manifest-512x512.png",
+    "site.webmanifest",
+    "robots.txt",
+    "CNAME",
+]
+# Requested by fixed name (browsers, crawlers, GitHub Pages, site.webmanifest)
+UNVERSIONED = set(ROOT_FILES) - {"custom.css"}
+
+MANIFEST_FILENAME = "asset-manifest.json"
+# Outdated output files -> builds they are still kept for
+RETIRED_FILENAME = "asset-retired.json"
+HASH_LENGTH = 8
+# Builds an outdated file survives; 1 keeps it until the next build
+KEEP_BUILDS = 2
+
+_CSS_URL_RE = re.compile(r"""url\(\s*(["']?)([^"')]+)\1\s*\)""")
+_HTML_URL_RE = re.compile(r"""((?:href|src)=")(/?)([^"#?]+)""")
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def fingerprint(logical: str, content: bytes) -> str:
+    """assets/font/OldLondon.ttf -> assets/font/OldLondon.<hash>.ttf"""
+    stem, extension = os.path.splitext(logical)
+    return f"{stem}.{content_hash(content)[:HASH_LENGTH]}{extension}"
+
+
+def _load_json(path: str, name: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"⚠️  Warning: Ignoring unreadable {name}: {e}")
+        return {}
+
+
+class AssetPipeline:
+    def __init__(self, source_dir: str):
+        self.source_dir = source_dir
+        # logical path (as referenced before fingerprinting) -> output path
+        self.urls: Dict[str, str] = {}
+        # output path -> (source file, rewritten content for CSS)
+        self.files: Dict[str, Tuple[str, Optional[bytes]]] = {}
+
+        sources = []
+        if os.path.isdir(source_dir):
+            for root, dirs, filenames in os.walk(source_dir):
+                dirs.sort()
+                for filename in sorted(filenames):
+                    path = os.path.join(root, filename)
+                    relative = os.path.relpath(path, source_dir).replace(os.sep, "/")
+                    logical = (
+                        relative if relative in ROOT_FILES else f"assets/{relative}"
+                    )
+                    sources.append((logical, path))
+
+        # Stylesheets last: their url() references need the final names
+        sources.sort(key=lambda item: item[0].endswith(".css"))
+        for logical, path in sources:
+            with open(path, "rb") as f:
+                content = f.read()
+            rewritten = None
+            if logical.endswith(".css"):
+                content = rewritten = self.rewrite_css(content, logical)
+            output = (
+                logical if logical in UNVERSIONED else fingerprint(logical, content)
+            )
+            self.urls[logical] = output
+            self.files[output] = (path, rewritten)
+
+    @property
+    def version(self) -> str:
+        """Changes whenever any output name does"""
+        payload = json.dumps(self.urls, sort_keys=True).encode("utf-8")
+        return content_hash(payload)[:HASH_LENGTH]
+
+    def content(self, output: str) -> bytes:
+        """Bytes of an output file, with rewritten url() references for CSS"""
+        source, rewritten = self.files[output]
+        if rewritten is not None:
+            return rewritten
+        with open(source, "rb") as f:
+            return f.read()
+
+    def rewrite_css(self, content: bytes, logical: str) -> bytes:
+        """Point url() references of a stylesheet at the fingerprinted files"""
+        base = os.path.dirname(logical)
+
+        def replace(match: re.Match) -> str:
+            quote, url = match.groups()
+            target = os.path.normpath(os.path.join(base, url)).replace(os.sep, "/")
+            if target not in self.urls:
+                return match.group(0)
+            relative = os.path.relpath(self.urls[target], base or ".").replace(
+                os.sep, "/"
+            )
+            return f"url({quote}{relative}{quote})"
+
+        return _CSS_URL_RE.sub(replace, content.decode("utf-8")).encode("utf-8")
+
+    def rewrite_html(self, source: str) -> str:
+        """Rewrite href/src attributes that name an asset (absolute or root-relative)"""
+
+        def replace(match: re.Match) -> str:
+            attribute, slash, path = match.groups()
+            if path not in self.urls:
+                return match.group(0)
+            return f"{attribute}{slash}{self.urls[path]}"
+
+        return _HTML_URL_RE.sub(replace, source)
+
+    def sync(
+        self, output_dir: str, keep_builds: int = KEEP_BUILDS
+    ) -> Tuple[List[str], int, List[str], List[str]]:
+        """Write changed assets, retire outdated ones for keep_builds builds before
+        removing them; (written, unchanged, removed, kept)"""
+        manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+        retired_path = os.path.join(output_dir, RETIRED_FILENAME)
+        previous: Dict[str, str] = _load_json(manifest_path, "asset manifest")
+        retired: Dict[str, int] = _load_json(retired_path, "retired assets list")
+
+        written = []
+        unchanged = 0
+        for output in self.files:
+            content = self.content(output)
+            target = os.path.join(output_dir, output)
+            if os.path.exists(target):
+                # Fingerprinted names only ever hold the same content
+                if output not in UNVERSIONED:
+                    unchanged += 1
+                    continue
+                with open(target, "rb") as f:
+                    if content_hash(f.read()) == content_hash(content):
+                        unchanged += 1
+                        continue
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            write_atomic(target, content)
+            written.append(target)
+
+        # Old fingerprints, unfingerprinted copies of earlier builds and
+        # anything else left in assets/
+        stale = {name for name in previous.values() if name not in self.files}
+        stale.update(name for name in retired if name not in self.files)
+        stale.update(logical for logical in self.urls if logical not in self.files)
+        assets_dir = os.path.join(output_dir, "assets")
+        for root, _, filenames in os.walk(assets_dir):
+            for filename in filenames:
+                if filename.endswith((".gz", ".br")):
+                    continue
+                relative = os.path.relpath(os.path.join(root, filename), output_dir)
+                relative = relative.replace(os.sep, "/")
+                if relative not in self.files:
+                    stale.add(relative)
+
+        # Pages cached before this build still load them until they run out
+        removed = []
+        kept = {}
+        for name in sorted(stale):
+            path = os.path.join(output_dir, name)
+            if not os.path.exists(path):
+                continue
+            builds_left = retired[name] - 1 if name in retired else keep_builds
+            if builds_left > 0:
+                kept[name] = builds_left
+            else:
+                os.remove(path)
+                removed.append(path)
+
+        if previous != self.urls:
+            write_atomic(
+                manifest_path,
+                json.dumps(self.urls, indent=2, sort_keys=True).encode("utf-8"),
+            )
+        if kept != retired:
+            write_atomic(
+                retired_path,
+                json.dumps(kept, indent=2, sort_keys=True).encode("utf-8"),
+            )
+        return written, unchanged, removed, list(kept)
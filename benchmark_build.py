@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+"""
+Build benchmark for AusCheckt Is
+Generates synthetic datasets seeded from the real data/*.json and
+data/archive/*.json files and times every build phase separately, plus
+the German date extractor on a text corpus built from the same venues and
+the archive statistics on event stores of growing length
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Tuple
+
+import archive_stats
+import german_dates
+import recurrence
+from build_manifest import BuildManifest
+from build_report import BuildReport
+from build_static_site import HeurigenSiteGenerator
+from calendar_index import CalendarIndex
+from event_store import EventStore, write_store
+from fileutils import write_atomic
+
+PHASES = [
+    "load",
+    "index",
+    "day_pages",
+    "map",
+    "stats",
+    "ical",
+    "sitemap",
+    "assets",
+    "compress",
+]
+DEFAULT_SCENARIOS = "50x1,500x1,500x3"
+# Archive lengths in years the statistics are timed on, for ARCHIVE_VENUES venues
+ARCHIVE_YEARS = [1, 4, 16]
+ARCHIVE_VENUES = 50
+GERMAN_MONTHS = [
+    "Jänner",
+    "Februar",
+    "März",
+    "April",
+    "Mai",
+    "Juni",
+    "Juli",
+    "August",
+    "September",
+    "Oktober",
+    "November",
+    "Dezember",
+]
+GERMAN_WEEKDAYS = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"]
+
+
+def load_seeds(base_dir: str) -> Tuple[List[Dict[str, Any]], List[List[Tuple]]]:
+    """Venue metadata and per-venue opening patterns from the real data"""
+    with open(
+        os.path.join(base_dir, "input", "heurigen_list.json"), "r", encoding="utf-8"
+    ) as f:
+        venues = list(json.load(f).values())
+
+    patterns = []
+    for directory in [
+        os.path.join(base_dir, "data"),
+        os.path.join(base_dir, "data", "archive"),
+    ]:
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".json"):
+                continue
+            with open(os.path.join(directory, filename), "r", encoding="utf-8") as f:
+                events = recurrence.expand(json.load(f))
+            if not events:
+                continue
+
+            # (day offset from the first event, start time, duration)
+            first_day = datetime.fromisoformat(events[0]["start"]).date()
+            pattern = []
+            for event in events:
+                start = datetime.fromisoformat(event["start"])
+                end = (
+                    datetime.fromisoformat(event["end"])
+                    if event.get("end")
+                    else start + timedelta(hours=6)
+                )
+                pattern.append(
+                    ((start.date() - first_day).days, start.time(), end - start)
+                )
+            patterns.append(pattern)
+
+    return venues, patterns
+
+
+def generate_dataset(
+    target_dir: str,
+    base_dir: str,
+    venue_count: int,
+    years: int,
+    seed: int = 42,
+) -> int:
+    """Write a synthetic input/ and data/ tree, return the number of events"""
+    rng = random.Random(seed)
+    seed_venues, patterns = load_seeds(base_dir)
+
+    os.makedirs(os.path.join(target_dir, "data"), exist_ok=True)
+    shutil.copytree(
+        os.path.join(base_dir, "input", "assets"),
+        os.path.join(target_dir, "input", "assets"),
+    )
+
+    today = datetime.now().date()
+    master = {}
+    event_count = 0
+    for i in range(venue_count):
+        template = seed_venues[i % len(seed_venues)]
+        key = f"venue_{i:05d}"
+        venue = {
+            "label": f"{template['label']} {i}",
+            "website": f"https://example.com/{key}/",
+            "link_opening_hours_page": f"https://example.com/{key}/",
+            "comment": "",
+            "location": f"https://maps.example.com/{key}",
+            "lat": template.get("lat", 48.3006) + rng.uniform(-0.01, 0.01),
+            "lng": template.get("lng", 16.3906) + rng.uniform(-0.01, 0.01),
+        }
+        master[key] = venue
+
+        pattern = patterns[i % len(patterns)]
+        events = []
+        for year in range(years):
+            season_start = today + timedelta(days=365 * year + rng.randint(0, 30))
+            for offset, start_time, duration in pattern:
+                start = datetime.combine(season_start + timedelta(days=offset), start_time)
+                events.append(
+                    {
+                        "title": venue["label"],
+                        "start": start.isoformat(),
+                        "end": (start + duration).isoformat(),
+                        "url": venue["website"],
+                        "mapLink": venue["location"],
+                        "lat": venue["lat"],
+                        "lng": venue["lng"],
+                    }
+                )
+        events.sort(key=lambda e: e["start"])
+        event_count += len(events)
+
+        with open(
+            os.path.join(target_dir, "data", f"{key}.json"), "w", encoding="utf-8"
+        ) as f:
+            json.dump(events, f, ensure_ascii=False, indent=2)
+
+    with open(
+        os.path.join(target_dir, "input", "heurigen_list.json"), "w", encoding="utf-8"
+    ) as f:
+        json.dump(master, f, ensure_ascii=False, indent=4)
+
+    return event_count
+
+
+def time_phases(site_dir: str, jobs: int = 1) -> Dict[str, float]:
+    """Run one full build in site_dir, returning wall seconds per phase (PHASES)"""
+    timings = {}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator = HeurigenSiteGenerator(site_dir)
+        os.makedirs(os.path.join(generator.output_dir, "day"), exist_ok=True)
+        manifest = BuildManifest(generator.output_dir)
+
+        today = datetime.now().date()
+
+        started = time.perf_counter()
+        calendar = CalendarIndex(generator.iter_events(since=today))
+        timings["load"] = time.perf_counter() - started
+
+        latest_date = generator.last_build_date(calendar, today)
+
+        started = time.perf_counter()
+        index_html = generator.generate_index_page(
+            calendar.events_between(today, latest_date)
+        )
+        write_atomic(os.path.join(generator.output_dir, "index.html"), index_html)
+        timings["index"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        generator.write_daily_pages(calendar, manifest, today, latest_date, jobs)
+        timings["day_pages"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        generator.write_map_layers(calendar, manifest, today, latest_date)
+        timings["map"] = time.perf_counter() - started
+
+        # Imports data/*.json into the event store first, as a fresh build does
+        started = time.perf_counter()
+        generator.generate_stats_pages(manifest)
+        timings["stats"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        generator.generate_ical_feeds(today, manifest)
+        timings["ical"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        generator.generate_sitemap(today, latest_date, calendar, manifest)
+        timings["sitemap"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        generator.copy_static_assets()
+        timings["assets"] = time.perf_counter() - started
+
+        # .gz/.br of everything written above
+        started = time.perf_counter()
+        generator.compress_output(
+            BuildReport(), generator.output_dir, manifest, generator.owns
+        )
+        timings["compress"] = time.perf_counter() - started
+
+    return timings
+
+
+def extractor_corpus(base_dir: str, copies: int = 5) -> str:
+    """Opening hours text written the way venue pages phrase the archived events"""
+    with open(
+        os.path.join(base_dir, "input", "heurigen_list.json"), "r", encoding="utf-8"
+    ) as f:
+        lines = [venue.get("comment", "") for venue in json.load(f).values()]
+
+    for directory in [
+        os.path.join(base_dir, "data"),
+        os.path.join(base_dir, "data", "archive"),
+    ]:
+        for filename in sorted(os.listdir(directory)):
+            if not filename.endswith(".json"):
+                continue
+            with open(os.path.join(directory, filename), "r", encoding="utf-8") as f:
+                events = recurrence.expand(json.load(f))
+
+            # One "27.-29. Juni 2025, Fr–So ab 16 Uhr" line per run of consecutive days
+            runs = []
+            for event in events:
+                start = datetime.fromisoformat(event["start"])
+                if runs and (start.date() - runs[-1][-1].date()).days == 1:
+                    runs[-1].append(start)
+                else:
+                    runs.append([start])
+            for run in runs:
+                first, last = run[0], run[-1]
+                weekdays = f"{GERMAN_WEEKDAYS[first.weekday()]}–{GERMAN_WEEKDAYS[last.weekday()]}"
+                lines.append(
+                    f"Ausg'steckt {first.day}.-{last.day}. {GERMAN_MONTHS[last.month - 1]} "
+                    f"{last.year}, {weekdays} ab {first.hour} Uhr, außer an Feiertagen. "
+                    f"Geöffnet {first.day}.{first.month}.-{last.day}.{last.month}. "
+                    f"{first:%H:%M} - 23:00 Uhr, Montag Ruhetag"
+                )
+
+    return "\n".join(lines * copies)
+
+
+def time_extractor(corpus: str, repeat: int) -> Dict[str, Any]:
+    """Best-of-N time of the extractor, of the bare combined scanner and of one scan per pattern"""
+    per_pattern = [
+        re.compile(pattern, re.IGNORECASE) for _, pattern in german_dates._PATTERNS
+    ]
+
+    best_extract = best_combined = best_separate = None
+    records = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        records = sum(1 for _ in german_dates.iter_records(corpus, 2025))
+        elapsed = time.perf_counter() - started
+        best_extract = min(elapsed, best_extract or elapsed)
+
+        started = time.perf_counter()
+        for _ in german_dates.SCANNER.finditer(corpus):
+            pass
+        elapsed = time.perf_counter() - started
+        best_combined = min(elapsed, best_combined or elapsed)
+
+        started = time.perf_counter()
+        for pattern in per_pattern:
+            for _ in pattern.finditer(corpus):
+                pass
+        elapsed = time.perf_counter() - started
+        best_separate = min(elapsed, best_separate or elapsed)
+
+    return {
+        "chars": len(corpus),
+        "patterns": len(per_pattern),
+        "records": records,
+        "phases": {"extract": best_extract, "scan": best_combined},
+        "per_pattern_s": best_separate,
+    }
+
+
+def iter_archive_events(
+    patterns: List[List[Tuple]], venue_count: int, years: int, seed: int = 42
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(venue key, event) pairs of a synthetic archive, one season per venue and year"""
+    rng = random.Random(seed)
+    for i in range(venue_count):
+        key = f"venue_{i:05d}"
+        pattern = patterns[i % len(patterns)]
+        for year in range(years):
+            season_start = date(2000 + year, 3, 1) + timedelta(days=rng.randint(0, 30))
+            for offset, start_time, duration in pattern:
+                start = datetime.combine(season_start + timedelta(days=offset), start_time)
+                yield key, {
+                    "title": key,
+                    "start": start.isoformat(),
+                    "end": (start + duration).isoformat(),
+                }
+
+
+def time_archive_stats(base_dir: str, repeat: int) -> Dict[str, Any]:
+    """Best-of-N time of compute_stats on archives of ARCHIVE_YEARS years"""
+    _, patterns = load_seeds(base_dir)
+    events = {}
+    phases = {}
+    with tempfile.TemporaryDirectory(prefix="auschecktis-bench-") as tmp:
+        for years in ARCHIVE_YEARS:
+            path = os.path.join(tmp, f"archive_{years}y.evs")
+            name = f"stats_{years}y"
+            events[name] = write_store(
+                path, iter_archive_events(patterns, ARCHIVE_VENUES, years)
+            )
+            with EventStore(path) as store:
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    archive_stats.compute_stats(store, {})
+                    elapsed = time.perf_counter() - started
+                    phases[name] = min(elapsed, phases.get(name, elapsed))
+
+    return {"venues": ARCHIVE_VENUES, "events": events, "phases": phases}
+
+
+def run_benchmarks(
+    base_dir: str, scenarios: List[Tuple[int, int]], repeat: int, jobs: int
+) -> Dict[str, Any]:
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "jobs": jobs,
+        "scenarios": {},
+    }
+
+    for venue_count, years in scenarios:
+        name = f"{venue_count}x{years}"
+        with tempfile.TemporaryDirectory(prefix="auschecktis-bench-") as tmp:
+            dataset_dir = os.path.join(tmp, "dataset")
+            event_count = generate_dataset(dataset_dir, base_dir, venue_count, years)
+
+            # Best of N runs, each on a fresh copy so nothing is skipped as unchanged
+            best = {}
+            for run in range(repeat):
+                site_dir = os.path.join(tmp, f"run{run}")
+                shutil.copytree(dataset_dir, site_dir)
+                for phase, seconds in time_phases(site_dir, jobs).items():
+                    best[phase] = min(seconds, best.get(phase, seconds))
+                shutil.rmtree(site_dir)
+
+        results["scenarios"][name] = {
+            "venues": venue_count,
+            "years": years,
+            "events": event_count,
+            "phases": best,
+        }
+        phases = ", ".join(f"{phase} {best[phase]:.3f}s" for phase in PHASES)
+        print(f"⏱️  {name}: {event_count} events - {phases}")
+
+    extractor = time_extractor(extractor_corpus(base_dir), repeat)
+    results["scenarios"]["extractor_corpus"] = extractor
+    print(
+        f"⏱️  extractor_corpus: {extractor['chars']} chars, {extractor['records']} records - "
+        f"extract {extractor['phases']['extract']:.3f}s, scan {extractor['phases']['scan']:.3f}s "
+        f"({extractor['patterns']} separate scans {extractor['per_pattern_s']:.3f}s)"
+    )
+
+    stats = time_archive_stats(base_dir, repeat)
+    results["scenarios"]["archive_stats"] = stats
+    print(
+        "⏱️  archive_stats: "
+        + ", ".join(
+            f"{name[len('stats_'):]} {stats['events'][name]} events {seconds:.3f}s "
+            f"({seconds / stats['events'][name] * 1e6:.1f} µs/event)"
+            for name, seconds in stats["phases"].items()
+        )
+    )
+
+    return results
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float,
+    min_delta: float = 0.005,
+) -> List[str]:
+    """Phases slower than baseline by more than threshold (relative) and min_delta seconds"""
+    regressions = []
+    for name, scenario in current["scenarios"].items():
+        old_scenario = baseline.get("scenarios", {}).get(name)
+        if not old_scenario:
+            continue
+        for phase, seconds in scenario["phases"].items():
+            old = old_scenario["phases"].get(phase)
+            if old is None:
+                continue
+            if seconds > old * (1 + threshold) and seconds - old > min_delta:
+                regressions.append(
+                    f"{name} {phase}: {old:.3f}s -> {seconds:.3f}s (+{(seconds / old - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def parse_scenarios(value: str) -> List[Tuple[int, int]]:
+    scenarios = []
+    for item in value.split(","):
+        venues, years = item.lower().split("x")
+        scenarios.append((int(venues), int(years)))
+    return scenarios
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the AusCheckt Is build on synthetic datasets"
+    )
+    parser.add_argument(
+        "--scenarios",
+        default=DEFAULT_SCENARIOS,
+        help=f"comma separated VENUESxYEARS list (default: {DEFAULT_SCENARIOS})",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="day page workers")
+    parser.add_argument(
+        "--output", "-o", default="bench_results.json", help="results JSON file"
+    )
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed relative slowdown per phase (default: 0.25)",
+    )
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    results = run_benchmarks(
+        base_dir, parse_scenarios(args.scenarios), max(1, args.repeat), args.jobs
+    )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"📄 Wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, results, args.threshold)
+        if regressions:
+            print("❌ Performance regressions:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print("✅ No phase regressed beyond the threshold")
+
+
+if __name__ == "__main__":
+    main()
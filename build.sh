@@ -14,7 +14,7 @@ fi
 
 # Step 2: Build static site
 echo "🏗️  Building static site..."
-python3 build_static_site.py
+python3 build_static_site.py "$@"
 
 # Step 3: Static assets are now handled by build_static_site.py
 echo "📁 Static assets copied by build_static_site.py"
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Build manifest for AusCheckt Is
+Remembers a hash of the inputs behind every generated page so unchanged
+pages are not rewritten and their real last-change time is known
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+
+def _json_default(value: Any) -> Any:
+    to_dict = getattr(value, "to_dict", None)
+    return to_dict() if to_dict is not None else str(value)
+
+
+class BuildManifest:
+    FILENAME = ".build_manifest.json"
+
+    def __init__(self, output_dir: str, filename: str = FILENAME):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, filename)
+        self.pages: Dict[str, Dict[str, str]] = {}
+        # sha256 of every text file at the time its .gz/.br were written
+        self.compressed: Dict[str, str] = {}
+
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.pages = data.get("pages", {})
+                self.compressed = data.get("compressed", {})
+            except Exception as e:
+                print(f"⚠️  Warning: Ignoring unreadable build manifest: {e}")
+
+    @staticmethod
+    def digest(*parts: Any) -> str:
+        """Stable hash over JSON-serializable build inputs (events by their JSON form)"""
+        payload = json.dumps(
+            parts,
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=_json_default,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def is_current(self, page: str, digest: str) -> bool:
+        """True if the page exists on disk and was built from the same inputs"""
+        entry = self.pages.get(page)
+        return (
+            entry is not None
+            and entry.get("hash") == digest
+            and os.path.exists(os.path.join(self.output_dir, page))
+        )
+
+    def record(self, page: str, digest: str):
+        """Store the inputs hash of a freshly written page"""
+        entry = self.pages.get(page)
+        if entry is None or entry.get("hash") != digest:
+            self.pages[page] = {
+                "hash": digest,
+                "lastmod": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+            }
+
+    def forget(self, page: str):
+        self.pages.pop(page, None)
+
+    def lastmod(self, page: str) -> Optional[str]:
+        entry = self.pages.get(page)
+        return entry.get("lastmod") if entry else None
+
+    def save(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"pages": self.pages, "compressed": self.compressed},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
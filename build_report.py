@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Build report for AusCheckt Is
+Collects wall/CPU time per build phase, counters, bytes written per
+output type and peak memory, and writes them as JSON
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_memory_bytes(children: bool = False) -> Optional[int]:
+    """Peak resident set size of this process (or its finished children)"""
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    max_rss = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is kilobytes on Linux but bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class BuildReport:
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.counts: Dict[str, int] = {}
+        self.events_per_venue: Dict[str, int] = {}
+        self.bytes_written: Dict[str, int] = {}
+        # Raw and compressed size of every text file in the output
+        self.file_sizes: Dict[str, Dict[str, int]] = {}
+        # Events collapsed by normalization, per venue
+        self.normalization: Dict[str, Dict[str, int]] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a build phase; repeated phases accumulate"""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            entry = self.phases.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0})
+            entry["wall_s"] += time.perf_counter() - wall_start
+            entry["cpu_s"] += time.process_time() - cpu_start
+
+    def count(self, name: str, amount: int = 1):
+        self.counts[name] = self.counts.get(name, 0) + amount
+
+    def add_files(self, output_type: str, paths: Iterable[str]):
+        """Add the size of written files to an output type"""
+        total = self.bytes_written.get(output_type, 0)
+        for path in paths:
+            if os.path.exists(path):
+                total += os.path.getsize(path)
+        self.bytes_written[output_type] = total
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+            "python": sys.version.split()[0],
+            "phases": {
+                name: {key: round(value, 6) for key, value in entry.items()}
+                for name, entry in self.phases.items()
+            },
+            "counts": self.counts,
+            "events_per_venue": dict(sorted(self.events_per_venue.items())),
+            "bytes_written": self.bytes_written,
+            "file_sizes": self.file_sizes,
+            "normalization": self.normalization,
+            "peak_memory_bytes": {
+                "main": peak_memory_bytes(),
+                "workers": peak_memory_bytes(children=True),
+            },
+        }
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
@@ -4,98 +4,129 @@ Static Site Generator for AusCheckt Is
 Converts JSON event data to SEO-optimized static HTML with structured data
 """
 
+import argparse
+import cProfile
 import json
 import os
-from datetime import datetime, timedelta
-from typing import Dict, List, Any
-import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
+import time
+
+import archive_stats
+import dev_server
+import ical_feed
+import precompress
+import recurrence
+import service_worker
+import sitemap
+from asset_pipeline import MANIFEST_FILENAME, RETIRED_FILENAME, AssetPipeline
+from build_manifest import BuildManifest
+from build_report import BuildReport
+from calendar_index import CalendarIndex
+from event_model import Event
+from event_store import EventStore, import_if_stale
+from event_stream import EventStream
+from fileutils import write_atomic
+from regions import SUMMARY_FILENAME, Region, load_regions
+from site_templates import SiteTemplates
+from spatial import SpatialIndex
+
+# Bump whenever page markup changes so every page is re-rendered once
+TEMPLATE_VERSION = "9"
+SITE_URL = "https://auschecktis.at"
+# Build manifest of the files all regions share (assets, sw.js, regions/)
+SHARED_MANIFEST = ".shared_manifest.json"
 
 
 class HeurigenSiteGenerator:
-    def __init__(self, base_dir: str = "."):
+    def __init__(
+        self, base_dir: str = ".", minify: bool = True, region: Optional[Region] = None
+    ):
         self.base_dir = base_dir
-        self.data_dir = os.path.join(base_dir, "data")
         self.input_dir = os.path.join(base_dir, "input")
-        self.output_dir = os.path.join(base_dir, "generated")
+        self.site_dir = os.path.join(base_dir, "generated")
+
+        # The first region in input/regions.json is the default
+        self.regions = load_regions(base_dir)
+        self.region = region or next(iter(self.regions.values()))
+        self.data_dir = self.region.data_dir
+        self.master_path = self.region.master_list
+        self.output_dir = self.region.output_dir(self.site_dir)
 
         # Load master heurigen data
-        with open(
-            os.path.join(self.input_dir, "heurigen_list.json"), "r", encoding="utf-8"
-        ) as f:
+        with open(self.master_path, "r", encoding="utf-8") as f:
             self.heurigen_master = json.load(f)
+        self.spatial = SpatialIndex(self.heurigen_master)
 
-    def load_all_events(self) -> List[Dict[str, Any]]:
-        """Load all events from data/*.json files"""
-        all_events = []
-
-        for filename in os.listdir(self.data_dir):
-            if filename.endswith(".json") and filename != "archive":
-                heurigen_key = filename.replace(".json", "")
-                file_path = os.path.join(self.data_dir, filename)
-
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        events = json.load(f)
+        self.minify = minify
+        self.load_assets()
 
-                    # Add heurigen metadata to each event
-                    for event in events:
-                        event["heurigen_key"] = heurigen_key
-                        if heurigen_key in self.heurigen_master:
-                            event["heurigen_data"] = self.heurigen_master[heurigen_key]
-                        all_events.append(event)
+    def load_assets(self):
+        """Fingerprint input/assets and compile the page templates against it"""
+        # Fingerprinted asset names are known from input/assets alone
+        self.assets = AssetPipeline(os.path.join(self.input_dir, "assets"))
 
-                except Exception as e:
-                    print(f"Error loading {filename}: {e}")
+        # Page templates are compiled (and minified) once per generator
+        region_links = (
+            ' · <a href="/regions/">Alle Regionen</a>' if len(self.regions) > 1 else ""
+        )
+        self.templates = SiteTemplates(
+            self.minify, self.assets.rewrite_html, self.region, region_links
+        )
+        # Region settings are part of the markup, so they invalidate its pages
+        region_version = BuildManifest.digest(self.region.config, region_links)[:8]
+        self.template_version = (
+            f"{TEMPLATE_VERSION}-{self.assets.version}-{region_version}"
+            + ("" if self.minify else "-unminified")
+        )
 
-        # Sort events by start date
-        all_events.sort(key=lambda x: x["start"])
-        return all_events
+    def iter_events(
+        self, since: Optional[date] = None, until: Optional[date] = None
+    ) -> EventStream:
+        """Events of all data files of the region in start order, merged file by file"""
+        return EventStream(self.data_dir, self.heurigen_master, since, until)
 
-    def generate_json_ld(self, event: Dict[str, Any]) -> str:
+    def generate_json_ld(self, event: Event) -> str:
         """Generate JSON-LD structured data for an event"""
-        heurigen_data = event.get("heurigen_data", {})
+        venue = event.venue
 
         json_ld = {
             "@context": "https://schema.org",
             "@type": "Event",
-            "name": f"{event['title']} - Ausg'steckt",
-            "description": f"Der Heurige {event['title']} hat ausg'steckt in Stammersdorf, Wien",
-            "startDate": event["start"],
-            "endDate": event["end"],
+            "name": f"{venue.title} - Ausg'steckt",
+            "description": f"Der Heurige {venue.title} hat ausg'steckt in {self.region.place}",
+            "startDate": event.start_iso,
+            "endDate": event.end_iso,
             "eventStatus": "https://schema.org/EventScheduled",
             "eventAttendanceMode": "https://schema.org/OfflineEventAttendanceMode",
             "location": {
                 "@type": "Place",
-                "name": event["title"],
-                "address": {
-                    "@type": "PostalAddress",
-                    "addressLocality": "Wien",
-                    "addressRegion": "Wien",
-                    "addressCountry": "AT",
-                    "postalCode": "1210",
-                },
+                "name": venue.title,
+                "address": {"@type": "PostalAddress", **self.region.address},
             },
-            "url": event.get("url", ""),
+            "url": venue.url or "",
             "organizer": {
                 "@type": "Organization",
-                "name": event["title"],
-                "url": event.get("url", ""),
+                "name": venue.title,
+                "url": venue.url or "",
             },
         }
 
         # Add coordinates if available
-        if "lat" in event and "lng" in event:
+        if venue.position is not None:
             json_ld["location"]["geo"] = {
                 "@type": "GeoCoordinates",
-                "latitude": event["lat"],
-                "longitude": event["lng"],
+                "latitude": venue.lat,
+                "longitude": venue.lng,
             }
 
+        if self.minify:
+            return json.dumps(json_ld, ensure_ascii=False, separators=(",", ":"))
         return json.dumps(json_ld, indent=2, ensure_ascii=False)
 
-    def format_date_german(self, date_str: str) -> str:
-        """Format ISO date to German format"""
-        dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+    def format_date_german(self, dt: datetime) -> str:
+        """Format a date as German weekday and date"""
         weekdays = [
             "Montag",
             "Dienstag",
@@ -108,598 +139,933 @@ class HeurigenSiteGenerator:
         weekday = weekdays[dt.weekday()]
         return f"{weekday}, {dt.strftime('%d.%m.%Y')}"
 
-    def format_time_german(self, date_str: str) -> str:
-        """Format ISO time to German format"""
-        dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+    def format_time_german(self, dt: datetime) -> str:
+        """Format a time as German HH:MM"""
         return dt.strftime("%H:%M")
 
-    def generate_event_html(self, event: Dict[str, Any]) -> str:
+    def generate_event_html(self, event: Event) -> bytes:
         """Generate HTML for a single event with microdata"""
-        heurigen_data = event.get("heurigen_data", {})
-        start_time = self.format_time_german(event["start"])
-        map_link = event.get("mapLink", "")
-
-        return f"""
-        <div class="event-card mb-3 p-3 border rounded" itemscope itemtype="https://schema.org/Event">
-            <h4 itemprop="name">{event['title']}</h4>
-            <div class="event-details">
-                <time itemprop="startDate" datetime="{event['start']}" class="text-muted">
-                    ab {start_time} Uhr
-                </time>
-                <div itemprop="location" itemscope itemtype="https://schema.org/Place">
-                    <span itemprop="name" class="d-none">{event['title']}</span>
-                    <div itemprop="address" itemscope itemtype="https://schema.org/PostalAddress">
-                        <span itemprop="addressLocality" class="d-none">Wien</span>
-                        <span itemprop="addressRegion" class="d-none">Wien</span>
-                        <span itemprop="postalCode" class="d-none">1210</span>
-                    </div>
-                </div>
-            </div>
-            <div class="event-actions mt-2">
-                <a href="{event.get('url', '#')}" target="_blank" class="btn btn-sm btn-outline-primary" itemprop="url">
-                    Website
-                </a>
-                {f'<a href="{map_link}" target="_blank" class="btn btn-sm btn-outline-secondary">Google Maps</a>' if map_link else ''}
-            </div>
-        </div>"""
-
-    def generate_daily_page(self, date: datetime, events: List[Dict[str, Any]]) -> str:
-        """Generate HTML page for a specific date"""
-        date_str = date.strftime("%Y-%m-%d")
-        date_german = self.format_date_german(date.isoformat())
-
-        # Filter events for this date
-        day_events = [e for e in events if e["start"].startswith(date_str)]
+        venue = event.venue
+        map_link = venue.map_link
+
+        return self.templates.event_card.render(
+            title=venue.title,
+            start=event.start_iso,
+            start_time=self.format_time_german(event.start),
+            url=venue.url or "#",
+            map_button=(
+                f'<a href="{map_link}" target="_blank" class="btn btn-sm btn-outline-secondary">Google Maps</a>'
+                if map_link
+                else ""
+            ),
+        )
+
+    def generate_daily_page(self, date: datetime, day_events: List[Event]) -> bytes:
+        """Generate HTML page for a specific date from the events open on that day"""
+        date_german = self.format_date_german(date)
 
         # Generate JSON-LD for all events on this day
         json_ld_list = [self.generate_json_ld(event) for event in day_events]
-        json_ld_combined = ",\n".join(json_ld_list) if json_ld_list else ""
+        json_ld_combined = ("," if self.minify else ",\n").join(json_ld_list)
 
         # Generate event HTML
-        events_html = ""
-        map_markers = []
+        events_html = b""
+        # Nearby venues share a marker
+        layer = self.spatial.day_layer(day_events, nearest=False)
 
         if day_events:
-            events_html = "\n".join(
+            events_html = b"\n".join(
                 [self.generate_event_html(event) for event in day_events]
             )
-
-            # Prepare map markers
-            for event in day_events:
-                if "lat" in event and "lng" in event:
-                    map_markers.append(
-                        {
-                            "lat": event["lat"],
-                            "lng": event["lng"],
-                            "title": event["title"],
-                            "url": event.get("url", "#"),
-                            "mapLink": event.get("mapLink", ""),
-                        }
-                    )
         else:
             events_html = (
                 '<p class="text-muted">Kein Heuriger hat heute ausg\'steckt.</p>'
             )
 
-        # Generate map JavaScript
-        map_js = self.generate_map_js(map_markers)
-
-        html_template = f"""<!DOCTYPE html>
-<html lang="de">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AusCheckt is - Heurigenkalender für Stammersdorf am {date_german}</title>
-    <meta name="description" content="Welche Heurige in Stammersdorf haben heute ausg'steckt? Der Heurigenkalender zeigt alle Öffnungszeiten und Standorte der schönsten Heurigen Stammersdorfs. Die Informationen werden laufend von den Webseiten der Heurigen aktualisiert.">
-    
-    <!-- Favicons -->
-    <link rel="icon" type="image/png" href="/favicon-96x96.png" sizes="96x96" />
-    <link rel="icon" type="image/svg+xml" href="/favicon.svg" />
-    <link rel="shortcut icon" href="/favicon.ico" />
-    <link rel="apple-touch-icon" sizes="180x180" href="/apple-touch-icon.png" />
-    <link rel="manifest" href="/site.webmanifest" />
-    
-    <!-- CSS -->
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" />
-    <link rel="stylesheet" href="/custom.css">
-    
-    <!-- Structured Data -->
-    <script type="application/ld+json">
-    [
-        {json_ld_combined}
-    ]
-    </script>
-</head>
-<body>
-    <div class="container mt-4">
-        <header class="text-center mb-5">
-            <h1 class="text-primary old-london">Auscheckt is</h1>
-            <p class="text-primary"><strong>Wo auscheckt is, wo ausg'steckt is.</strong></p>
-            <nav>
-                <a href="/" class="btn btn-outline-primary">← Zurück zur Übersicht</a>
-            </nav>
-        </header>
-        
-        <main>
-            <h2 class="mb-4">Heurigen am {date_german}</h2>
-            
-            {f'<div id="map" class="mb-4" style="height: 400px;"></div>' if map_markers else ''}
-            
-            <div class="events-list">
-                {events_html}
-            </div>
-        </main>
-        
-        <footer class="text-center mt-5 py-4 border-top" style="background-color: #f1f1f1;">
-            <p><small>Open-Source-Projekt für Heurigenliebhaber:innen und Aficionados.</small></p>
-            <p><small><a href="https://github.com/sektionschef/auschecktis">GitHub Repo</a></small></p>
-        </footer>
-    </div>
-    
-    <!-- JavaScript -->
-    <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
-    <script>
-        {map_js}
-    </script>
-</body>
-</html>"""
-
-        return html_template
-
-    def generate_map_js(self, markers: List[Dict[str, Any]]) -> str:
-        """Generate JavaScript for Leaflet map"""
-        if not markers:
-            return ""
+        return self.templates.day_page.render(
+            date_german=date_german,
+            json_ld=json_ld_combined,
+            map_container=(
+                '<div id="map" class="mb-4" style="height: 400px;"></div>'
+                if layer["c"]
+                else ""
+            ),
+            events_html=events_html,
+            map_js=self.generate_map_js(layer),
+        )
+
+    def generate_map_js(self, layer: Dict[str, Any]) -> bytes:
+        """Generate JavaScript for Leaflet map: one marker per cluster of a day layer"""
+        if not layer["c"]:
+            return b""
 
         markers_js = []
-        for marker in markers:
-            popup_html = f"""<strong>{marker['title']}</strong><br>
-            <a href="{marker['url']}" target="_blank" style="color:#457c43;text-decoration:underline;">Website</a>"""
-            if marker.get("mapLink"):
-                popup_html += f""" &middot; 
-                <a href="{marker['mapLink']}" target="_blank" style="color:#457c43;text-decoration:underline;">Google Maps</a>"""
+        for lat, lng, members in layer["c"]:
+            popups = []
+            for index in members:
+                title, url, map_link = layer["v"][index][:3]
+                popup_html = f"""<strong>{title}</strong><br> <a href="{url}" target="_blank" style="color:#457c43;text-decoration:underline;">Website</a>"""
+                if map_link:
+                    popup_html += f""" &middot; <a href="{map_link}" target="_blank" style="color:#457c43;text-decoration:underline;">Google Maps</a>"""
+                popups.append(popup_html)
 
             markers_js.append(
-                f"""
-            L.marker([{marker['lat']}, {marker['lng']}], {{icon: greenIcon}})
-                .bindPopup(`{popup_html}`)
-                .addTo(map);"""
+                self.templates.map_marker.render(
+                    lat=str(lat), lng=str(lng), popup='<hr class="my-1">'.join(popups)
+                )
             )
 
-        bounds = [[m["lat"], m["lng"]] for m in markers]
-
-        return f"""
-        // Initialize map
-        const map = L.map('map').setView([48.3006, 16.3906], 13);
-        
-        L.tileLayer('https://{{s}}.tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png', {{
-            attribution: '&copy; OpenStreetMap contributors'
-        }}).addTo(map);
-        
-        // Custom green icon
-        const greenIcon = L.icon({{
-            iconUrl: 'data:image/svg+xml;utf8,<svg xmlns="http://www.w3.org/2000/svg" width="32" height="48" viewBox="0 0 32 48"><path fill="%23457c43" stroke="white" stroke-width="2" d="M16 2C8.268 2 2 8.268 2 16c0 10.493 12.03 28.01 12.53 28.74a2 2 0 0 0 3.94 0C17.97 44.01 30 26.493 30 16c0-7.732-6.268-14-14-14zm0 20a6 6 0 1 1 0-12 6 6 0 0 1 0 12z"/></svg>',
-            iconSize: [32, 48],
-            iconAnchor: [16, 47],
-            popupAnchor: [0, -40]
-        }});
-        
-        // Add markers
-        {''.join(markers_js)}
-        
-        // Fit bounds if multiple markers
-        {f"map.fitBounds({bounds}, {{padding: [20, 20]}});" if len(markers) > 1 else ""}
-        """
-
-    def generate_index_page(self, events: List[Dict[str, Any]]) -> str:
-        """Generate main index page with interactive map and date navigation"""
-        today = datetime.now().date()
-
-        # Generate all events data as JSON for JavaScript
-        events_json = json.dumps(events, ensure_ascii=False, indent=2)
-
-        return f"""<!DOCTYPE html>
-<html lang="de">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AusCheckt is - Heurigenkalender für Stammersdorf</title>
-    <meta name="description" content="Welche Heurige in Stammersdorf haben heute ausg'steckt? Der Heurigenkalender zeigt alle Öffnungszeiten und Standorte der schönsten Heurigen Stammersdorfs. Die Informationen werden laufend von den Webseiten der Heurigen aktualisiert.">
-    
-    <!-- Favicons -->
-    <link rel="icon" type="image/png" href="/favicon-96x96.png" sizes="96x96" />
-    <link rel="icon" type="image/svg+xml" href="/favicon.svg" />
-    <link rel="shortcut icon" href="/favicon.ico" />
-    <link rel="apple-touch-icon" sizes="180x180" href="/apple-touch-icon.png" />
-    <link rel="manifest" href="/site.webmanifest" />
-    
-    <!-- CSS -->
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" />
-    <link rel="stylesheet" href="/custom.css">
-</head>
-<body>
-    <div id="main">
-        <div class="mb-5 container text-center">
-            <h1 class="text-primary old-london">AusCheckt is</h1>
-            <p class="text-primary"><strong>Wo auscheckt is, wo ausg'steckt is.</strong></p>
-        </div>
-        <div class="container text-center mb-4">
-            <p>Der Heurigenkalender zeigt die <strong>Öffnungszeiten und Standorte</strong> der schönsten Heurigen in <strong>Stammersdorf</strong>. Die Öffnungszeiten werden regelmäßig automatisch von den Webseiten der Heurigen und dem <a href="http://weinort-stammersdorf.at/weinbau/wp-content/uploads/2021/03/Heurigenkalender-2025_v3-druck.pdf" target="_blank">offiziellen Kalender</a> aktualisiert.</p>
-        </div>
-        <div id="open-today" class="container text-center mb-4">
-            <div class="mb-4">
-                <button id="prev-day" class="btn btn-primary btn-lg rounded-circle me-2 d-inline-flex align-items-center justify-content-center" style="width:2.5em; height:2.5em;" disabled title="Vortag">
-                    <span class="visually-hidden">Vortag</span>
-                    <svg xmlns="http://www.w3.org/2000/svg" width="1.5em" height="1.5em" fill="currentColor" viewBox="0 0 16 16">
-                        <path fill-rule="evenodd" d="M11.354 1.646a.5.5 0 0 1 0 .708L5.707 8l5.647 5.646a.5.5 0 0 1-.708.708l-6-6a.5.5 0 0 1 0-.708l6-6a.5.5 0 0 1 .708 0z"/>
-                    </svg>
-                </button>
-                <button id="next-day" class="btn btn-primary btn-lg rounded-circle d-inline-flex align-items-center justify-content-center" style="width:2.5em; height:2.5em;" title="Nächster Tag">
-                    <span class="visually-hidden">Nächster Tag</span>
-                    <svg xmlns="http://www.w3.org/2000/svg" width="1.5em" height="1.5em" fill="currentColor" viewBox="0 0 16 16">
-                        <path fill-rule="evenodd" d="M4.646 14.354a.5.5 0 0 1 0-.708L10.293 8 4.646 2.354a.5.5 0 1 1 .708-.708l6 6a.5.5 0 0 1 0 .708l-6 6a.5.5 0 0 1-.708 0z"/>
-                    </svg>
-                </button>
-            </div>
-            <h2 class="mb-4 text-primary"><span id="current-date"></span></h2>
-            <div id="map" class="mb-4" style="height: 320px; width: 100%; margin-bottom: 1em;"></div>
-            <ul id="open-today-list" class="list-unstyled text-start mx-auto" style="max-width: 300px;"></ul>
-        </div>
-    </div>
-    <footer class="text-center mt-5 py-4 border-top" style="background-color: #f1f1f1;">
-        <p>
-            <small>Open-Source-Projekt für Heurigenliebhaber:innen und Aficionados.</small>
-        </p>
-        <p>
-            <small><img src="assets/github-mark.svg" alt="GitHub" style="height: 1em; vertical-align: middle; margin-right: 0.3em;"> <a href="https://github.com/sektionschef/auschecktis">GitHub Repo</a></small>
-        </p>
-    </footer>
-    
-    <!-- JavaScript -->
-    <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
-    <script>
-        // All events data
-        const allEvents = {events_json};
-        
-        // Wait for DOM to be ready
-        document.addEventListener('DOMContentLoaded', function() {{
-            const today = new Date();
-            const maxDate = new Date(today);
-            maxDate.setDate(today.getDate() + 7);
-            
-            let currentDate = new Date(today);
-            
-            const ul = document.getElementById('open-today-list');
-            const currentDateSpan = document.getElementById('current-date');
-            const prevBtn = document.getElementById('prev-day');
-            const nextBtn = document.getElementById('next-day');
-            
-            function formatDate(date) {{
-                return date.toLocaleDateString('de-AT', {{ weekday: 'long', year: 'numeric', month: '2-digit', day: '2-digit' }});
-            }}
-            
-            function getISO(date) {{
-                return date.toISOString().slice(0, 10);
-            }}
-            
-            // Initialize map
-            let map = L.map('map').setView([48.3006, 16.3906], 13); // Center on Stammersdorf
-            
-            L.tileLayer('https://{{s}}.tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png', {{
-                attribution: '&copy; OpenStreetMap contributors'
-            }}).addTo(map);
-            
-            let markerGroup = L.layerGroup().addTo(map);
-            
-            function clearMarkers() {{
-                markerGroup.clearLayers();
-            }}
-            
-            function addMarker(lat, lng, popupHtml) {{
-                L.marker([lat, lng], {{ icon: greenIcon }}).bindPopup(popupHtml).addTo(markerGroup);
-            }}
-            
-            // Custom green icon
-            const greenIcon = L.icon({{
-                iconUrl: 'data:image/svg+xml;utf8,<svg xmlns="http://www.w3.org/2000/svg" width="32" height="48" viewBox="0 0 32 48"><path fill="%23457c43" stroke="white" stroke-width="2" d="M16 2C8.268 2 2 8.268 2 16c0 10.493 12.03 28.01 12.53 28.74a2 2 0 0 0 3.94 0C17.97 44.01 30 26.493 30 16c0-7.732-6.268-14-14-14zm0 20a6 6 0 1 1 0-12 6 6 0 0 1 0 12z"/></svg>',
-                iconSize:     [32, 48],
-                iconAnchor:   [16, 47],
-                popupAnchor:  [0, -40]
-            }});
-            
-            function renderList() {{
-                const currentISO = getISO(currentDate);
-                const todayISO = getISO(today);
-                const tomorrow = new Date(today);
-                tomorrow.setDate(today.getDate() + 1);
-                const tomorrowISO = getISO(tomorrow);
-            
-                // Set heading text
-                if (currentISO === todayISO) {{
-                    currentDateSpan.textContent = "Heute geöffnet";
-                }} else if (currentISO === tomorrowISO) {{
-                    currentDateSpan.textContent = "Morgen geöffnet";
-                }} else {{
-                    currentDateSpan.textContent = "Geöffnet am " + formatDate(currentDate);
-                }}
-            
-                // Enable/disable prev/next buttons
-                prevBtn.disabled = currentISO <= todayISO;
-                nextBtn.disabled = currentISO >= getISO(maxDate);
-            
-                // Filter for current date
-                const openToday = allEvents.filter(event => event.start.slice(0, 10) === currentISO);
-            
-                ul.innerHTML = '';
-                clearMarkers();
-            
-                if (openToday.length === 0) {{
-                    ul.innerHTML = '<li>Kein Heuriger geöffnet.</li>';
-                }} else {{
-                    let bounds = [];
-                    openToday.forEach(event => {{
-                        const li = document.createElement('li');
-                        li.innerHTML = `<strong><a href="${{event.url}}" target="_blank">${{event.title}}</a></strong> 
-            (ab ${{new Date(event.start).toLocaleTimeString('de-AT', {{hour: '2-digit', minute:'2-digit', hour12: false}})}} Uhr)`;
-                        ul.appendChild(li);
-            
-                        // Add marker if possible
-                        if (
-                            typeof event.lat === "number" &&
-                            typeof event.lng === "number"
-                        ) {{
-                            const latlng = [event.lat, event.lng];
-                            let popupHtml = `<strong>${{event.title}}</strong><br>
-                                <a href="${{event.url}}" target="_blank" style="color:#457c43;text-decoration:underline;">Website</a>`;
-                            if (event.mapLink) {{
-                                popupHtml += ` &middot; <a href="${{event.mapLink}}" target="_blank" style="color:#457c43;text-decoration:underline;">Google Maps</a>`;
-                            }}
-                            addMarker(latlng[0], latlng[1], popupHtml);
-                            bounds.push(latlng);
-                        }}
-                    }});
-                    // Zoom to bounds if markers exist
-                    if (bounds.length > 0) {{
-                        map.fitBounds(bounds, {{padding: [30, 30]}});
-                    }} else {{
-                        map.setView([48.3006, 16.3906], 13);
-                    }}
-                }}
-            }}
-            
-            // Helper to extract lat/lng from Google Maps short links
-            function extractLatLng(mapLink) {{
-                try {{
-                    if (mapLink.includes('@')) {{
-                        const match = mapLink.match(/@([0-9\\.\\-]+),([0-9\\.\\-]+)/);
-                        if (match) return [parseFloat(match[1]), parseFloat(match[2])];
-                    }}
-                }} catch (e) {{}}
-                return null;
-            }}
-            
-            // Initialize and render
-            renderList();
-            
-            prevBtn.addEventListener('click', () => {{
-                if (getISO(currentDate) > getISO(today)) {{
-                    currentDate.setDate(currentDate.getDate() - 1);
-                    renderList();
-                }}
-            }});
-            
-            nextBtn.addEventListener('click', () => {{
-                if (getISO(currentDate) < getISO(maxDate)) {{
-                    currentDate.setDate(currentDate.getDate() + 1);
-                    renderList();
-                }}
-            }});
-        }});
-    </script>
-    <!-- GoatCounter -->
-    <script data-goatcounter="https://auschecktis.goatcounter.com/count"
-       async
-       src="//gc.zgo.at/count.js"></script>
-</body>
-</html>"""
-
-    def copy_static_assets(self):
-        """Copy static assets to output directory"""
-        import shutil
-
-        # List of static files to copy from assets directory
-        static_files = [
-            # CSS files
-            ("input/assets/custom.css", "custom.css"),
-            # Icon files
-            ("input/assets/favicon.ico", "favicon.ico"),
-            ("input/assets/favicon.svg", "favicon.svg"),
-            ("input/assets/favicon-96x96.png", "favicon-96x96.png"),
-            ("input/assets/apple-touch-icon.png", "apple-touch-icon.png"),
-            (
-                "input/assets/web-app-manifest-192x192.png",
-                "web-app-manifest-192x192.png",
-            ),
-            (
-                "input/assets/web-app-manifest-512x512.png",
-                "web-app-manifest-512x512.png",
+        return self.templates.map_js.render(
+            markers=b"".join(markers_js),
+            fit_bounds=(
+                f"map.fitBounds({layer['b']}, {{padding: [20, 20]}});"
+                if len(layer["c"]) > 1
+                else ""
             ),
-            ("input/assets/site.webmanifest", "site.webmanifest"),
-            # Other files
-            ("input/assets/robots.txt", "robots.txt"),
-            ("input/assets/CNAME", "CNAME"),
-        ]
+        )
+
+    def write_map_layers(
+        self,
+        calendar: CalendarIndex,
+        manifest: BuildManifest,
+        first_date: date,
+        last_date: date,
+    ) -> Tuple[List[str], int]:
+        """map/YYYY-MM-DD.json per day for the index map, only where the open
+        venues changed; returns the written paths and the skipped count"""
+        map_dir = os.path.join(self.output_dir, "map")
+        os.makedirs(map_dir, exist_ok=True)
+        # Days that have passed
+        for filename in sorted(os.listdir(map_dir)):
+            if filename.endswith(".json") and filename[:-5] < first_date.isoformat():
+                os.remove(os.path.join(map_dir, filename))
+                manifest.forget(f"map/{filename}")
+
+        # Venue positions decide grid and clusters of every day
+        positions = BuildManifest.digest(self.spatial.positions)
+        written = []
+        skipped_count = 0
+        day = first_date
+        while day <= last_date:
+            page = f"map/{day.isoformat()}.json"
+            day_events = calendar.events_on(day)
+            digest = manifest.digest(positions, page, day_events)
+            if manifest.is_current(page, digest):
+                skipped_count += 1
+            else:
+                path = os.path.join(self.output_dir, page)
+                write_atomic(path, self.map_layer_json(day_events))
+                manifest.record(page, digest)
+                written.append(path)
+            day += timedelta(days=1)
+
+        print(
+            f"📍 Generated {len(written)} map layers, skipped {skipped_count} unchanged"
+        )
+        return written, skipped_count
 
-        # Copy individual files
-        for src, dst in static_files:
-            src_path = os.path.join(self.base_dir, src)
-            dst_path = os.path.join(self.output_dir, dst)
-
-            if os.path.exists(src_path):
-                try:
-                    shutil.copy2(src_path, dst_path)
-                    print(f"📄 Copied {dst}")
-                except Exception as e:
-                    print(f"⚠️  Warning: Could not copy {src}: {e}")
-
-        # Copy entire assets directory (for subdirectories like fonts)
-        assets_src = os.path.join(self.base_dir, "input", "assets")
-        assets_dst = os.path.join(self.output_dir, "assets")
-        if os.path.exists(assets_src):
-            try:
-                # Remove existing assets directory to avoid conflicts
-                if os.path.exists(assets_dst):
-                    shutil.rmtree(assets_dst)
-
-                # Copy assets directory, excluding files already copied individually
-                shutil.copytree(assets_src, assets_dst, dirs_exist_ok=True)
-                print("📁 Copied assets directory")
-
-                # Remove the duplicated files from assets (since they're copied to root)
-                for _, dst in static_files:
-                    duplicate_path = os.path.join(assets_dst, os.path.basename(dst))
-                    if os.path.exists(duplicate_path):
-                        os.remove(duplicate_path)
-
-            except Exception as e:
-                print(f"⚠️  Warning: Could not copy assets: {e}")
-
-    def generate_sitemap(self, start_date, end_date):
-        """Generate XML sitemap for SEO"""
-        from datetime import datetime
-
-        base_url = "https://auschecktis.at"
-        now = datetime.now().strftime("%Y-%m-%dT%H:%M:%S+00:00")
-
-        sitemap_urls = []
-
-        # Add homepage
-        sitemap_urls.append(
-            {"loc": base_url, "lastmod": now, "changefreq": "daily", "priority": "1.0"}
+    def map_layer_json(self, day_events: List[Event]) -> str:
+        return json.dumps(
+            self.spatial.day_layer(day_events),
+            ensure_ascii=False,
+            separators=(",", ":"),
         )
 
-        # Add all daily pages
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.strftime("%Y-%m-%d")
-            sitemap_urls.append(
+    def build_index_payload(self, events: List[Event]) -> Dict[str, Any]:
+        """Compact event payload: venue table once, events as (venue id, start, end)
+        and regular series as recurrence rules"""
+        venues = []
+        venue_ids = {}
+        compact_events = []
+
+        for event in events:
+            # Positions are in the per-day map layers
+            venue = (
+                event.venue.title,
+                event.venue.url or "#",
+                event.venue.map_link or "",
+            )
+            venue_id = venue_ids.get(venue)
+            if venue_id is None:
+                venue_id = venue_ids[venue] = len(venues)
+                venues.append(list(venue))
+            compact_events.append(
                 {
-                    "loc": f"{base_url}/day/{date_str}.html",
-                    "lastmod": now,
+                    "venue": venue_id,
+                    "start": event.start_iso,
+                    "end": event.end_iso or "",
+                }
+            )
+
+        explicit = []
+        rules = []
+        for entry in recurrence.compact(compact_events):
+            row = [entry["venue"], entry["start"], entry["end"]]
+            if recurrence.is_rule(entry):
+                rule = entry["recurrence"]
+                row.append([recurrence.WEEKDAYS.index(day) for day in rule["weekdays"]])
+                row.append(rule["until"])
+                row.append(rule.get("except", []))
+                rules.append(row)
+            else:
+                explicit.append(row)
+
+        return {"v": venues, "e": explicit, "r": rules}
+
+    def generate_index_page(self, events: List[Event]) -> bytes:
+        """Generate main index page with interactive map and date navigation"""
+        # Generate compact events data as JSON for JavaScript
+        events_json = json.dumps(
+            self.build_index_payload(events), ensure_ascii=False, separators=(",", ":")
+        ).replace("</", "<\\/")
+
+        return self.templates.index_page.render(events_json=events_json)
+
+    def copy_static_assets(self) -> List[str]:
+        """Sync input/assets into the site root, returning the written paths"""
+        written, unchanged, removed, kept = self.assets.sync(self.site_dir)
+        for path in written:
+            print(f"📄 Copied {os.path.relpath(path, self.site_dir)}")
+        for path in removed:
+            # Its variants were written by the region build that owned it before
+            for suffix in (".gz", ".br"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            print(f"🗑️  Removed {os.path.relpath(path, self.site_dir)}")
+        if unchanged:
+            print(f"⏭️  {unchanged} assets unchanged")
+        if kept:
+            print(f"🕰️  Kept {len(kept)} outdated assets for cached pages")
+        return written
+
+    def generate_service_worker(self, manifest: BuildManifest) -> List[str]:
+        """sw.js with the precache manifest of this build, returns written paths"""
+        precache = service_worker.precache_manifest(self.assets, self.templates)
+        digest = manifest.digest(self.template_version, precache)
+        if manifest.is_current("sw.js", digest):
+            print("⏭️  sw.js unchanged")
+            return []
+
+        path = os.path.join(self.site_dir, "sw.js")
+        write_atomic(
+            path, service_worker.render_service_worker(precache, self.templates)
+        )
+        manifest.record("sw.js", digest)
+        print(
+            f"📶 Generated sw.js (shell {service_worker.cache_version(precache)}, "
+            f"{len(precache)} files)"
+        )
+        return [path]
+
+    def generate_stats_pages(self, manifest: BuildManifest) -> List[str]:
+        """Archive statistics as stats/index.html and stats/stats.json, returns written paths"""
+        store_path = os.path.join(self.data_dir, "events.evs")
+        if import_if_stale(self.data_dir, self.master_path, store_path):
+            print(f"📦 Rebuilt {os.path.relpath(store_path, self.base_dir)}")
+
+        labels = {key: data["label"] for key, data in self.heurigen_master.items()}
+        with EventStore(store_path) as store:
+            stats = archive_stats.compute_stats(store, labels)
+
+        stats_dir = os.path.join(self.output_dir, "stats")
+        os.makedirs(stats_dir, exist_ok=True)
+        digest = manifest.digest(self.template_version, stats)
+        if manifest.is_current("stats/index.html", digest) and os.path.exists(
+            os.path.join(stats_dir, "stats.json")
+        ):
+            print("⏭️  stats unchanged")
+            return []
+
+        written = [
+            os.path.join(stats_dir, "index.html"),
+            os.path.join(stats_dir, "stats.json"),
+        ]
+        write_atomic(
+            written[0],
+            archive_stats.render_stats_page(stats, self.templates.stats_page),
+        )
+        write_atomic(written[1], archive_stats.stats_json(stats))
+        manifest.record("stats/index.html", digest)
+        print(
+            f"📈 Generated stats for {stats['events']} events of {len(stats['venues'])} heurigen"
+        )
+        return written
+
+    def generate_ical_feeds(self, today: date, manifest: BuildManifest) -> List[str]:
+        """ical/<venue>.ics per venue and ical/all.ics, returns written paths"""
+        ical_dir = os.path.join(self.output_dir, "ical")
+        stream = self.iter_events(since=today)
+        feeds = []
+        for key, filenames in stream.venue_keys().items():
+            label = self.heurigen_master.get(key, {}).get("label", key)
+            feeds.append((f"ical/{key}.ics", label, stream.iter_key(key, filenames)))
+        feeds.append(("ical/all.ics", "Alle Heurigen", self.iter_events(since=today)))
+
+        written = []
+        for page, label, events in feeds:
+            _, changed = ical_feed.write_feed(
+                self.output_dir, page, f"AusCheckt Is - {label}", events, manifest
+            )
+            if changed:
+                written.append(os.path.join(self.output_dir, page))
+
+        # Venues whose data file is gone
+        pages = {page for page, _, _ in feeds}
+        for filename in sorted(os.listdir(ical_dir)):
+            if filename.endswith(".ics") and f"ical/{filename}" not in pages:
+                os.remove(os.path.join(ical_dir, filename))
+                manifest.forget(f"ical/{filename}")
+                print(f"🗑️  Removed ical/{filename}")
+
+        print(
+            f"📆 Generated {len(written)} iCal feeds, skipped {len(feeds) - len(written)} unchanged"
+        )
+        return written
+
+    def iter_sitemap_urls(
+        self,
+        start_date: date,
+        end_date: date,
+        calendar: CalendarIndex,
+        lastmod: Callable[[str], Optional[str]],
+    ) -> Iterator[Tuple[str, Dict[str, Optional[str]]]]:
+        """(shard, URL) of every page worth indexing: index and statistics, then
+        the days with events from start_date to end_date, sharded per year.
+        lastmod(page) gives a page's last content change"""
+        base_url = SITE_URL + self.region.url_prefix.rstrip("/")
+
+        yield "pages", {
+            "loc": f"{base_url}/" if self.region.path else base_url,
+            "lastmod": lastmod("index.html"),
+            "changefreq": "daily",
+            "priority": "1.0",
+        }
+
+        # Archive statistics
+        if lastmod("stats/index.html"):
+            yield "pages", {
+                "loc": f"{base_url}/stats/",
+                "lastmod": lastmod("stats/index.html"),
+                "changefreq": "weekly",
+                "priority": "0.5",
+            }
+
+        # Days without events only say so; search engines need not visit them
+        for day in calendar.days():
+            if start_date <= day <= end_date:
+                page = f"day/{day.strftime('%Y-%m-%d')}.html"
+                yield str(day.year), {
+                    "loc": f"{base_url}/{page}",
+                    "lastmod": lastmod(page),
                     "changefreq": "daily",
                     "priority": "0.8",
                 }
+
+    def generate_sitemap(
+        self,
+        start_date: date,
+        end_date: date,
+        calendar: CalendarIndex,
+        manifest: BuildManifest,
+    ) -> Tuple[List[Dict[str, Optional[str]]], List[str]]:
+        """Gzipped sitemap shards with lastmod from the build manifest; returns
+        their sitemap index entries and the shards that were rewritten"""
+        entries, url_count, written = sitemap.write_shards(
+            manifest,
+            "",
+            SITE_URL + self.region.url_prefix.rstrip("/"),
+            self.iter_sitemap_urls(start_date, end_date, calendar, manifest.lastmod),
+        )
+        # sitemap.xml is the index at the site root, written by build_shared
+        if self.region.path:
+            for suffix in ("", ".gz", ".br"):
+                stale = os.path.join(self.output_dir, f"sitemap.xml{suffix}")
+                if os.path.exists(stale):
+                    os.remove(stale)
+        print(
+            f"🗺️  Generated {len(written)} sitemaps, skipped {len(entries) - len(written)} "
+            f"unchanged ({url_count} URLs)"
+        )
+        return entries, written
+
+    def write_daily_page(self, day: date, calendar: CalendarIndex) -> str:
+        """Render and atomically write the page for one day, returning its path"""
+        page = f"day/{day.strftime('%Y-%m-%d')}.html"
+        daily_html = self.generate_daily_page(
+            datetime.combine(day, datetime.min.time()), calendar.events_on(day)
+        )
+        write_atomic(os.path.join(self.output_dir, page), daily_html)
+        return page
+
+    def write_daily_pages(
+        self,
+        calendar: CalendarIndex,
+        manifest: BuildManifest,
+        first_date: date,
+        last_date: date,
+        jobs: int = 1,
+    ) -> Tuple[List[str], int]:
+        """Write all day pages whose inputs changed, optionally across worker processes
+
+        Returns the written page paths (relative to the output directory) and
+        the number of unchanged pages that were skipped.
+        """
+        pending = {}
+        skipped_count = 0
+        # Marker clusters depend on the venue positions of the master list
+        positions = BuildManifest.digest(self.spatial.positions)
+        current_date = first_date
+        while current_date <= last_date:
+            page = f"day/{current_date.strftime('%Y-%m-%d')}.html"
+            digest = manifest.digest(
+                self.template_version, positions, page, calendar.events_on(current_date)
             )
+            if manifest.is_current(page, digest):
+                skipped_count += 1
+            else:
+                pending[current_date] = digest
             current_date += timedelta(days=1)
 
-        # Generate XML
-        sitemap_xml = '<?xml version="1.0" encoding="UTF-8"?>\n'
-        sitemap_xml += '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        dates = list(pending)
+        written = [f"day/{day.strftime('%Y-%m-%d')}.html" for day in dates]
+        if jobs > 1 and len(dates) > 1:
+            # Contiguous date chunks; generator and calendar are handed to each worker once
+            chunk_size = -(-len(dates) // jobs)
+            chunks = [
+                dates[i : i + chunk_size] for i in range(0, len(dates), chunk_size)
+            ]
+            with ProcessPoolExecutor(
+                max_workers=len(chunks),
+                initializer=_init_day_worker,
+                initargs=(self, calendar),
+            ) as pool:
+                for chunk in pool.map(_write_day_chunk, chunks):
+                    for day in chunk:
+                        manifest.record(
+                            f"day/{day.strftime('%Y-%m-%d')}.html", pending[day]
+                        )
+        else:
+            for day in dates:
+                manifest.record(self.write_daily_page(day, calendar), pending[day])
+
+        print(
+            f"📅 Generated {len(dates)} daily pages, skipped {skipped_count} unchanged (until {last_date})"
+        )
+        return written, skipped_count
+
+    def last_build_date(self, calendar: CalendarIndex, today: date) -> date:
+        """Last day to generate a page for"""
+        # Calculate end date (end of February 2026)
+        end_date = datetime(2026, 2, 28).date()
+
+        # Use the later of the latest event day or end_date
+        latest_date = max(today, end_date)
+        if calendar.last_day and calendar.last_day > latest_date:
+            latest_date = calendar.last_day
+        return latest_date
+
+    def benchmark_render(self, rounds: int = 3) -> float:
+        """Render index and all day pages in memory (no writes), return pages/second"""
+        today = datetime.now().date()
+        calendar = CalendarIndex(self.iter_events(since=today))
+        latest_date = self.last_build_date(calendar, today)
+        days = [
+            today + timedelta(days=offset)
+            for offset in range((latest_date - today).days + 1)
+        ]
 
-        for url in sitemap_urls:
-            sitemap_xml += "  <url>\n"
-            sitemap_xml += f'    <loc>{url["loc"]}</loc>\n'
-            sitemap_xml += f'    <lastmod>{url["lastmod"]}</lastmod>\n'
-            sitemap_xml += f'    <changefreq>{url["changefreq"]}</changefreq>\n'
-            sitemap_xml += f'    <priority>{url["priority"]}</priority>\n'
-            sitemap_xml += "  </url>\n"
+        page_count = 0
+        total_bytes = 0
+        started = time.perf_counter()
+        for _ in range(rounds):
+            total_bytes += len(
+                self.generate_index_page(calendar.events_between(today, latest_date))
+            )
+            for day in days:
+                total_bytes += len(
+                    self.generate_daily_page(
+                        datetime.combine(day, datetime.min.time()),
+                        calendar.events_on(day),
+                    )
+                )
+            page_count += len(days) + 1
+        elapsed = time.perf_counter() - started
+
+        pages_per_second = page_count / elapsed if elapsed else float("inf")
+        print(
+            f"⏱️  Rendered {page_count} pages ({total_bytes / 1024 / 1024:.1f} MB) "
+            f"in {elapsed:.3f}s: {pages_per_second:.0f} pages/s"
+        )
+        return pages_per_second
+
+    def is_shared(self, path: str) -> bool:
+        """True for site-relative paths that build_shared writes for all regions"""
+        return (
+            path.split("/")[0] in ("assets", "regions")
+            or path in self.assets.files
+            or path
+            in (
+                "sw.js",
+                "sitemap.xml",
+                "build_report_shared.json",
+                MANIFEST_FILENAME,
+                RETIRED_FILENAME,
+            )
+        )
+
+    def owns(self, relative: str) -> bool:
+        """True for paths below output_dir that this region's build writes"""
+        path = os.path.relpath(
+            os.path.join(self.output_dir, relative), self.site_dir
+        ).replace(os.sep, "/")
+        if self.is_shared(path):
+            return False
+        return not any(
+            region.key != self.region.key
+            and region.path
+            and path.startswith(f"{region.path}/")
+            for region in self.regions.values()
+        )
+
+    def write_region_summary(
+        self,
+        today: date,
+        latest_date: date,
+        calendar: CalendarIndex,
+        sitemaps: List[Dict[str, Optional[str]]],
+    ) -> str:
+        """region.json with what the cross-region index shows of this region"""
+        open_per_day = {}
+        day = today
+        while day <= latest_date:
+            venues = {event.venue.key for event in calendar.events_on(day)}
+            if venues:
+                open_per_day[day.isoformat()] = len(venues)
+            day += timedelta(days=1)
+
+        path = os.path.join(self.output_dir, SUMMARY_FILENAME)
+        summary = {
+            "key": self.region.key,
+            "name": self.region.name,
+            "url": self.region.url_prefix,
+            "venues": len(self.heurigen_master),
+            "open": open_per_day,
+            # Entries for the sitemap index
+            "sitemaps": sitemaps,
+        }
+        write_atomic(path, json.dumps(summary, ensure_ascii=False, indent=2))
+        return path
+
+    def read_region_summaries(self) -> List[Dict[str, Any]]:
+        """region.json of every region that has been built, in definition order"""
+        summaries = []
+        for region in self.regions.values():
+            path = os.path.join(region.output_dir(self.site_dir), SUMMARY_FILENAME)
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    summaries.append(json.load(f))
+        return summaries
+
+    def generate_regions_page(self, manifest: BuildManifest) -> List[str]:
+        """regions/index.html from the region.json of every built region"""
+        if len(self.regions) < 2:
+            return []
+
+        summaries = self.read_region_summaries()
+        digest = manifest.digest(
+            self.template_version,
+            [
+                [summary[field] for field in ("key", "url", "name", "venues", "open")]
+                for summary in summaries
+            ],
+        )
+        if manifest.is_current("regions/index.html", digest):
+            print("⏭️  regions/index.html unchanged")
+            return []
+
+        regions_html = b"\n".join(
+            self.templates.region_item.render(
+                key=summary["key"],
+                url=summary["url"],
+                name=summary["name"],
+                venue_count=str(summary["venues"]),
+            )
+            for summary in summaries
+        )
+        open_json = json.dumps(
+            {summary["key"]: summary["open"] for summary in summaries},
+            separators=(",", ":"),
+        )
+        path = os.path.join(self.site_dir, "regions", "index.html")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_atomic(
+            path,
+            self.templates.regions_page.render(
+                regions_html=regions_html, open_json=open_json
+            ),
+        )
+        manifest.record("regions/index.html", digest)
+        print(f"🧭 Generated regions/index.html for {len(summaries)} regions")
+        return [path]
+
+    def generate_sitemap_index(self, manifest: BuildManifest) -> List[str]:
+        """sitemap.xml listing the sitemaps of every region (and of regions/)"""
+        entries = []
+        for summary in self.read_region_summaries():
+            entries.extend(summary.get("sitemaps", []))
+
+        written = []
+        if len(self.regions) > 1:
+            regions_url = {
+                "loc": f"{SITE_URL}/regions/",
+                "lastmod": manifest.lastmod("regions/index.html"),
+                "changefreq": "daily",
+                "priority": "0.6",
+            }
+            regions_entries, _, written = sitemap.write_shards(
+                manifest, "regions", SITE_URL, [("regions", regions_url)]
+            )
+            entries.extend(regions_entries)
 
-        sitemap_xml += "</urlset>\n"
+        path = os.path.join(self.site_dir, "sitemap.xml")
+        if sitemap.write_index(manifest, "sitemap.xml", entries):
+            written.append(path)
+            print(f"🗺️  Generated sitemap.xml index of {len(entries)} sitemaps")
+        else:
+            print("⏭️  sitemap.xml unchanged")
+        return written
+
+    def compress_output(
+        self,
+        report: BuildReport,
+        output_dir: str,
+        manifest: BuildManifest,
+        owns: Callable[[str], bool],
+    ):
+        """.gz/.br next to every owned text file, only for files whose bytes changed"""
+        sizes, written = precompress.precompress(output_dir, manifest, owns)
+        manifest.save()
+        report.file_sizes = sizes
+        report.count("files_compressed", len(written))
+        totals = {
+            kind: sum(size[kind] for size in sizes.values())
+            for kind in ["bytes"] + [suffix[1:] for suffix in precompress.suffixes()]
+        }
+        for kind in totals:
+            if kind != "bytes":
+                report.add_files(
+                    kind, [path for path in written if path.endswith(f".{kind}")]
+                )
+        print(
+            f"🗜️  Compressed {len(written)} files ({len(sizes)} text files: "
+            + ", ".join(f"{kind} {total // 1024} KB" for kind, total in totals.items())
+            + ")"
+        )
 
-        # Write sitemap
-        sitemap_path = os.path.join(self.output_dir, "sitemap.xml")
-        with open(sitemap_path, "w", encoding="utf-8") as f:
-            f.write(sitemap_xml)
+    def build_shared(self, compress: bool = True) -> BuildReport:
+        """Assets, sw.js and the cross-region index, shared by all regions
 
-        print(f"🗺️  Generated sitemap.xml with {len(sitemap_urls)} URLs")
+        Writes build_report_shared.json next to the default region's build_report.json
+        """
+        print("🏗️  Building shared files...")
+        report = BuildReport()
+        manifest = BuildManifest(self.site_dir, SHARED_MANIFEST)
 
-    def build_site(self):
-        """Build the complete static site"""
-        print("🏗️  Building static site...")
+        # Copy static assets
+        with report.phase("assets"):
+            copied = self.copy_static_assets()
+        report.count("assets_copied", len(copied))
+        report.add_files("assets", copied)
+
+        # Offline shell for repeat visits
+        with report.phase("service_worker"):
+            sw_files = self.generate_service_worker(manifest)
+            manifest.save()
+        report.add_files("js", sw_files)
+
+        with report.phase("regions"):
+            regions_files = self.generate_regions_page(manifest)
+            manifest.save()
+        report.add_files("html", regions_files)
+
+        with report.phase("sitemap"):
+            sitemap_files = self.generate_sitemap_index(manifest)
+            manifest.save()
+        report.add_files("xml", sitemap_files)
+
+        if compress:
+            with report.phase("compress"):
+                self.compress_output(report, self.site_dir, manifest, self.is_shared)
+
+        report.save(os.path.join(self.site_dir, "build_report_shared.json"))
+        print("📊 Wrote build_report_shared.json")
+        return report
+
+    def build_site(self, jobs: int = 1, compress: bool = True) -> BuildReport:
+        """Build the region's pages and write build_report.json into its output"""
+        print(f"🏗️  Building static site for {self.region.name}...")
+        report = BuildReport()
 
         # Create output directory
         os.makedirs(self.output_dir, exist_ok=True)
         os.makedirs(os.path.join(self.output_dir, "day"), exist_ok=True)
 
-        # Load all events
-        events = self.load_all_events()
-        print(f"📅 Loaded {len(events)} events")
-
-        # Generate index page
-        index_html = self.generate_index_page(events)
-        with open(
-            os.path.join(self.output_dir, "index.html"), "w", encoding="utf-8"
-        ) as f:
-            f.write(index_html)
-        print("📄 Generated index.html")
+        manifest = BuildManifest(self.output_dir)
 
-        # Generate daily pages
         today = datetime.now().date()
 
-        # Calculate end date (end of February 2026)
-        end_date = datetime(2026, 2, 28).date()
-
-        # Find the latest event date
-        latest_date = today
+        # Stream events into the day index; past events never reach a page
+        with report.phase("load"):
+            stream = self.iter_events(since=today)
+            calendar = CalendarIndex(stream)
+        events = calendar.events
+        print(f"📅 Loaded {len(events)} events ({stream.dropped} past events skipped)")
+        if stream.normalization.collapsed or stream.normalization.aliased:
+            print(f"🧹 {stream.normalization.summary()}")
+
+        report.count("events_loaded", len(events))
+        report.count("events_skipped_past", stream.dropped)
+        report.count("events_merged", stream.normalization.collapsed)
+        report.normalization = stream.normalization.to_dict()
         for event in events:
-            event_date = datetime.fromisoformat(
-                event["start"].replace("Z", "+00:00")
-            ).date()
-            if event_date > latest_date:
-                latest_date = event_date
-
-        # Use the later of latest_date or end_date
-        if end_date > latest_date:
-            latest_date = end_date
-
-        # Delete old HTML files (before today)
-        day_dir = os.path.join(self.output_dir, "day")
-        if os.path.exists(day_dir):
+            key = event.venue.key
+            report.events_per_venue[key] = report.events_per_venue.get(key, 0) + 1
+
+        latest_date = self.last_build_date(calendar, today)
+
+        # Generate index page (past events are never shown there)
+        with report.phase("index"):
+            index_path = os.path.join(self.output_dir, "index.html")
+            index_events = calendar.events_between(today, latest_date)
+            index_digest = manifest.digest(self.template_version, index_events)
+            if manifest.is_current("index.html", index_digest):
+                report.count("pages_skipped")
+                print("⏭️  index.html unchanged")
+            else:
+                index_html = self.generate_index_page(index_events)
+                write_atomic(index_path, index_html)
+                manifest.record("index.html", index_digest)
+                report.count("pages_written")
+                report.add_files("html", [index_path])
+                print("📄 Generated index.html")
+
+        with report.phase("day_pages"):
+            # Delete old HTML files (before today)
+            day_dir = os.path.join(self.output_dir, "day")
             deleted_count = 0
-            for filename in os.listdir(day_dir):
-                if filename.endswith(".html"):
-                    # Extract date from filename
-                    try:
-                        file_date_str = filename.replace(".html", "")
-                        file_date = datetime.strptime(file_date_str, "%Y-%m-%d").date()
-                        if file_date < today:
-                            os.remove(os.path.join(day_dir, filename))
-                            deleted_count += 1
-                    except:
-                        pass
-            if deleted_count > 0:
-                print(f"🗑️  Deleted {deleted_count} old HTML pages")
-
-        # Generate pages from today until the latest date
-        current_date = today
-        page_count = 0
-        while current_date <= latest_date:
-            daily_html = self.generate_daily_page(
-                datetime.combine(current_date, datetime.min.time()), events
+            if os.path.exists(day_dir):
+                for filename in os.listdir(day_dir):
+                    if filename.endswith(".html"):
+                        # Extract date from filename
+                        try:
+                            file_date_str = filename.replace(".html", "")
+                            file_date = datetime.strptime(
+                                file_date_str, "%Y-%m-%d"
+                            ).date()
+                            if file_date < today:
+                                os.remove(os.path.join(day_dir, filename))
+                                manifest.forget(f"day/{filename}")
+                                deleted_count += 1
+                        except:
+                            pass
+                if deleted_count > 0:
+                    print(f"🗑️  Deleted {deleted_count} old HTML pages")
+
+            # Generate pages from today until the latest date
+            written, skipped_count = self.write_daily_pages(
+                calendar, manifest, today, latest_date, jobs
             )
-            filename = f"{current_date.strftime('%Y-%m-%d')}.html"
-
-            with open(
-                os.path.join(self.output_dir, "day", filename), "w", encoding="utf-8"
-            ) as f:
-                f.write(daily_html)
+        report.count("pages_deleted", deleted_count)
+        report.count("pages_written", len(written))
+        report.count("pages_skipped", skipped_count)
+        report.add_files(
+            "html", [os.path.join(self.output_dir, page) for page in written]
+        )
 
-            current_date += timedelta(days=1)
-            page_count += 1
+        # Clusters, bounds and nearest open venue per day for the index map
+        with report.phase("map"):
+            map_files, map_skipped = self.write_map_layers(
+                calendar, manifest, today, latest_date
+            )
+        report.count("map_layers_written", len(map_files))
+        report.count("map_layers_skipped", map_skipped)
+        report.add_files("json", map_files)
+
+        # Statistics over current and archived events
+        with report.phase("stats"):
+            stats_files = self.generate_stats_pages(manifest)
+        report.count("pages_written", 1 if stats_files else 0)
+        report.count("pages_skipped", 0 if stats_files else 1)
+        report.add_files("html", stats_files[:1])
+        report.add_files("json", stats_files[1:])
+
+        # Calendar subscriptions, streamed from the loader
+        with report.phase("ical"):
+            ical_files = self.generate_ical_feeds(today, manifest)
+        report.count("feeds_written", len(ical_files))
+        report.add_files("ics", ical_files)
+
+        # Sitemap shards; the index over all regions is written by build_shared
+        with report.phase("sitemap"):
+            sitemaps, sitemap_files = self.generate_sitemap(
+                today, latest_date, calendar, manifest
+            )
+            manifest.save()
+        report.add_files("xml", sitemap_files)
 
-        print(f"📅 Generated {page_count} daily pages (until {latest_date})")
+        # What the cross-region index shows of this region
+        self.write_region_summary(today, latest_date, calendar, sitemaps)
 
-        # Generate sitemap
-        self.generate_sitemap(today, latest_date)
+        # .gz/.br next to every text file, only for files whose bytes changed
+        if compress:
+            with report.phase("compress"):
+                self.compress_output(report, self.output_dir, manifest, self.owns)
 
-        # Copy static assets
-        self.copy_static_assets()
+        report.save(os.path.join(self.output_dir, "build_report.json"))
+        print("📊 Wrote build_report.json")
 
         print(f"✅ Site built in {self.output_dir}/")
+        return report
+
+
+# Per-process state for parallel day page rendering
+_worker_generator = None
+_worker_calendar = None
+
+
+def _init_day_worker(generator: HeurigenSiteGenerator, calendar: CalendarIndex):
+    global _worker_generator, _worker_calendar
+    _worker_generator = generator
+    _worker_calendar = calendar
+
+
+def _write_day_chunk(days: List[date]) -> List[date]:
+    for day in days:
+        _worker_generator.write_daily_page(day, _worker_calendar)
+    return days
+
+
+def build_region(
+    base_dir: str, minify: bool, key: str, jobs: int = 1, compress: bool = True
+) -> str:
+    """Build one region from scratch (also the entry point of region workers)"""
+    region = load_regions(base_dir)[key]
+    HeurigenSiteGenerator(base_dir, minify, region).build_site(jobs, compress)
+    return key
+
+
+def build_regions(
+    base_dir: str = ".",
+    minify: bool = True,
+    keys: Optional[List[str]] = None,
+    jobs: int = 1,
+    compress: bool = True,
+):
+    """Build the given regions (default: all), then the files they share
+
+    Regions only read their own data and write their own output, so with
+    several jobs they are built in parallel, one worker process each.
+    """
+    keys = keys or list(load_regions(base_dir))
+    if jobs > 1 and len(keys) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(keys))) as pool:
+            futures = [
+                pool.submit(build_region, base_dir, minify, key, 1, compress)
+                for key in keys
+            ]
+            for future in futures:
+                future.result()
+    else:
+        for key in keys:
+            build_region(base_dir, minify, key, jobs, compress)
+
+    HeurigenSiteGenerator(base_dir, minify).build_shared(compress)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the AusCheckt Is static site")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["build", "serve"],
+        default="build",
+        help="build generated/ (default) or serve the site from memory",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="serve: re-render the pages touched by changes to data/ and input/",
+    )
+    parser.add_argument(
+        "--port", type=int, default=8000, help="serve: HTTP port (default: 8000)"
+    )
+    parser.add_argument(
+        "--region",
+        action="append",
+        metavar="KEY",
+        help="only build this region from input/regions.json (repeatable); "
+        "serve and --benchmark-render use the first one given",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="number of worker processes for regions, or for the day pages "
+        "of a single region (default: 1)",
+    )
+    parser.add_argument(
+        "--benchmark-render",
+        action="store_true",
+        help="only render all pages in memory and report pages/second",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="build_profile.pstats",
+        metavar="PATH",
+        help="write a cProfile/pstats dump of the build (default: build_profile.pstats)",
+    )
+    parser.add_argument(
+        "--no-minify",
+        action="store_true",
+        help="keep the indented HTML/JS/JSON of the templates",
+    )
+    parser.add_argument(
+        "--no-compress",
+        action="store_true",
+        help="do not write .gz/.br variants of the text files",
+    )
+    args = parser.parse_args()
+
+    regions = load_regions()
+    for key in args.region or []:
+        if key not in regions:
+            parser.error(f"unknown region '{key}' (choose from {', '.join(regions)})")
+
+    if args.command == "serve" or args.benchmark_render:
+        region = regions[args.region[0]] if args.region else None
+        generator = HeurigenSiteGenerator(minify=not args.no_minify, region=region)
+        if args.command == "serve":
+            dev_server.serve(generator, port=args.port, watch=args.watch)
+        else:
+            generator.benchmark_render()
+        return
+
+    build = {
+        "minify": not args.no_minify,
+        "keys": args.region,
+        "jobs": max(1, args.jobs),
+        "compress": not args.no_compress,
+    }
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.runcall(build_regions, **build)
+        profiler.dump_stats(args.profile)
+        print(f"🔬 Wrote profile to {args.profile}")
+    else:
+        build_regions(**build)
 
 
 if __name__ == "__main__":
-    generator = HeurigenSiteGenerator()
-    generator.build_site()
+    main()
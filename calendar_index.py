@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Calendar index for AusCheckt Is
+Buckets events by every day they cover so lookups by day, date range or
+instant do not have to scan the complete event list
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+from event_model import Event, start_order
+
+
+class CalendarIndex:
+    def __init__(self, events: Iterable[Event]):
+        # Events in start order; each day bucket keeps that order. Sorting an
+        # already merged EventStream is a single linear pass
+        self.events: List[Event] = sorted(events, key=start_order)
+        self._days: Dict[date, List[Event]] = {}
+
+        for event in self.events:
+            for day in event.days():
+                self._days.setdefault(day, []).append(event)
+
+        self._sorted_days: List[date] = sorted(self._days)
+
+    @property
+    def first_day(self) -> Optional[date]:
+        return self._sorted_days[0] if self._sorted_days else None
+
+    @property
+    def last_day(self) -> Optional[date]:
+        return self._sorted_days[-1] if self._sorted_days else None
+
+    def days(self) -> List[date]:
+        """Days that have at least one event, in order"""
+        return list(self._sorted_days)
+
+    def events_on(self, day: date) -> List[Event]:
+        """Events open at any time on the given day"""
+        return list(self._days.get(day, ()))
+
+    def events_between(self, first: date, last: date) -> List[Event]:
+        """Events covering any day in [first, last], each once, in start order"""
+        lo = bisect_left(self._sorted_days, first)
+        hi = bisect_right(self._sorted_days, last)
+
+        seen = set()
+        result = []
+        for day in self._sorted_days[lo:hi]:
+            for event in self._days[day]:
+                if id(event) not in seen:
+                    seen.add(id(event))
+                    result.append(event)
+
+        result.sort(key=start_order)
+        return result
+
+    def open_at(self, instant: datetime) -> List[Event]:
+        """Events whose interval contains the given instant"""
+        result = []
+        for event in self._days.get(instant.date(), ()):
+            start, end = event.interval()
+            if start <= instant < end:
+                result.append(event)
+        return result
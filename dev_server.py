@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Development server for AusCheckt Is
+Keeps the events of every venue and the master list in memory, renders the
+index, the day pages and the sitemap into memory and serves them over
+HTTP. With --watch, the region's data files and master list and
+input/assets are polled and only the pages a change touches are rendered
+again. One region is served at its URL path; other paths come from generated/
+"""
+
+import heapq
+import io
+import json
+import mimetypes
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlsplit
+
+import normalize
+import sitemap
+from calendar_index import CalendarIndex
+from event_model import Event, start_order
+from spatial import SpatialIndex
+
+POLL_INTERVAL = 0.5
+
+CONTENT_TYPES = {".webmanifest": "application/manifest+json"}
+
+# Replaces the offline cache of a production build, which would hide every change
+DEV_SERVICE_WORKER = b"""self.addEventListener('install', () => self.skipWaiting());
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys.map(key => caches.delete(key))))
+            .then(() => self.registration.unregister())
+    );
+});
+"""
+
+
+def event_identity(event: Event) -> str:
+    """What a page shows of an event, without the venue's master list entry"""
+    return json.dumps([event.venue.key, event.to_dict()], sort_keys=True)
+
+
+def snapshot(paths: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+    """(mtime, size) of every existing path"""
+    result = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        result[path] = (stat.st_mtime_ns, stat.st_size)
+    return result
+
+
+class DevSite:
+    """In-memory pages of one generator, re-rendered per changed venue"""
+
+    def __init__(self, generator):
+        self.generator = generator
+        self.master_path = generator.master_path
+        self.assets_dir = os.path.join(generator.input_dir, "assets")
+        self.lock = threading.Lock()
+        # page path relative to the site root -> rendered bytes
+        self.pages: Dict[str, bytes] = {}
+        self.lastmod: Dict[str, str] = {}
+        self.venues: Dict[str, List[Event]] = {}
+        self.load()
+
+    # Loading
+
+    def venue_files(self) -> List[str]:
+        return self.generator.iter_events().venue_files()
+
+    def load_venue(self, key: str) -> Optional[List[Event]]:
+        """Normalized events of one venue from today on, None while a file is not valid JSON"""
+        stream = self.generator.iter_events(since=self.today)
+        filenames = stream.venue_keys().get(key, [])
+        for filename in filenames:
+            try:
+                with open(
+                    os.path.join(self.generator.data_dir, filename),
+                    "r",
+                    encoding="utf-8",
+                ) as f:
+                    json.load(f)
+            except ValueError as e:
+                print(f"⚠️  Warning: Keeping previous events of {key}: {e}")
+                return None
+        return list(stream.iter_key(key, filenames))
+
+    def load(self):
+        """Load every venue and render all pages"""
+        started = time.perf_counter()
+        self.today = datetime.now().date()
+        previous = self.venues
+        self.venues = {}
+        for key in self.generator.iter_events().venue_keys():
+            events = self.load_venue(key)
+            self.venues[key] = events if events is not None else previous.get(key, [])
+        self.index_calendar()
+        self.render(self.days(), full=True)
+        print(
+            f"🧭 Rendered {len(self.pages)} pages of {len(self.calendar.events)} events "
+            f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+
+    def index_calendar(self):
+        # Same tie order as EventStream: venues in key order
+        self.calendar = CalendarIndex(
+            heapq.merge(
+                *(self.venues[key] for key in sorted(self.venues)),
+                key=start_order,
+            )
+        )
+        self.latest_date = self.generator.last_build_date(self.calendar, self.today)
+
+    # Rendering
+
+    @staticmethod
+    def day_page(day: date) -> str:
+        return f"day/{day.strftime('%Y-%m-%d')}.html"
+
+    def days(self) -> List[date]:
+        return [
+            self.today + timedelta(days=offset)
+            for offset in range((self.latest_date - self.today).days + 1)
+        ]
+
+    def render(self, days: Iterable[date], full: bool = False):
+        """Render the given day pages, index and sitemap and swap them in"""
+        generator = self.generator
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+        rendered = {}
+        for day in days:
+            day_events = self.calendar.events_on(day)
+            rendered[self.day_page(day)] = generator.generate_daily_page(
+                datetime.combine(day, datetime.min.time()), day_events
+            )
+            rendered[f"map/{day.isoformat()}.json"] = generator.map_layer_json(
+                day_events
+            ).encode("utf-8")
+        rendered["index.html"] = generator.generate_index_page(
+            self.calendar.events_between(self.today, self.latest_date)
+        )
+
+        with self.lock:
+            if full:
+                self.pages = {}
+            else:
+                # Days that dropped out of the range
+                first, last = self.today.isoformat(), self.latest_date.isoformat()
+                for page in [p for p in self.pages if p.startswith(("day/", "map/"))]:
+                    if not first <= page[4:14] <= last:
+                        del self.pages[page]
+                        self.lastmod.pop(page, None)
+            self.pages.update(rendered)
+            for page in rendered:
+                self.lastmod[page] = now
+            # One plain sitemap of the region instead of index and gzipped shards
+            urls = generator.iter_sitemap_urls(
+                self.today, self.latest_date, self.calendar, self.page_lastmod
+            )
+            buffer = io.BytesIO()
+            sitemap.write_urlset(buffer, (url for _, url in urls))
+            self.pages["sitemap.xml"] = buffer.getvalue()
+
+    def page_lastmod(self, page: str) -> Optional[str]:
+        if page in self.lastmod:
+            return self.lastmod[page]
+        # Statistics are only built by a full build
+        path = os.path.join(self.generator.output_dir, page)
+        if os.path.exists(path):
+            return datetime.fromtimestamp(
+                os.path.getmtime(path), timezone.utc
+            ).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+        return None
+
+    def affected_days(self, before: List[Event], after: List[Event]) -> Set[date]:
+        """Days covered by events that were added, removed or changed"""
+        old = {event_identity(event): event for event in before}
+        new = {event_identity(event): event for event in after}
+        days = set()
+        for identity in old.keys() ^ new.keys():
+            days.update((old.get(identity) or new[identity]).days())
+        return days
+
+    # Changes
+
+    def update_venues(self, keys: Iterable[str], force: bool = False) -> int:
+        """Reload venues and render the pages they touch; returns the page count"""
+        started = time.perf_counter()
+        changed_days = set()
+        existing = self.generator.iter_events().venue_keys()
+        for key in keys:
+            before = self.venues.get(key, [])
+            after = self.load_venue(key)
+            if after is None:
+                continue
+            if key in existing:
+                self.venues[key] = after
+            else:
+                self.venues.pop(key, None)
+            if force:
+                changed_days.update(
+                    day for event in before + after for day in event.days()
+                )
+            else:
+                changed_days.update(self.affected_days(before, after))
+
+        previous_latest = self.latest_date
+        self.index_calendar()
+        days = [
+            day for day in self.days() if day in changed_days or day > previous_latest
+        ]
+        if not days and self.latest_date == previous_latest:
+            print("⏭️  No page changed")
+            return 0
+
+        self.render(days)
+        print(
+            f"🔄 Rendered {len(days)} day pages, index and sitemap "
+            f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+        return len(days) + 2
+
+    def update_master(self):
+        """Reload the master list and the venues whose entry changed"""
+        try:
+            with open(self.master_path, "r", encoding="utf-8") as f:
+                master = json.load(f)
+        except ValueError as e:
+            print(f"⚠️  Warning: Keeping previous heurigen_list.json: {e}")
+            return
+        previous = self.generator.heurigen_master
+        previous_positions = self.generator.spatial.positions
+        self.generator.heurigen_master = master
+        self.generator.spatial = SpatialIndex(master)
+        keys = sorted(
+            key
+            for key in set(previous) | set(master)
+            if previous.get(key) != master.get(key)
+        )
+        print(f"📋 heurigen_list.json: {len(keys)} entries changed")
+        if (
+            normalize.alias_map(previous) != normalize.alias_map(master)
+            or self.generator.spatial.positions != previous_positions
+        ):
+            # Files move between venues, or the grid and nearest venues of every day
+            self.load()
+        else:
+            self.update_venues([key for key in keys if key in self.venues], force=True)
+
+    def update_assets(self):
+        """New fingerprints change every page's links, so everything is rendered again"""
+        self.generator.load_assets()
+        print(f"🎨 Assets changed (version {self.generator.assets.version})")
+        self.load()
+
+    # Watching
+
+    def watched_files(self) -> Dict[str, List[str]]:
+        data_dir = self.generator.data_dir
+        assets = []
+        for root, _, filenames in os.walk(self.assets_dir):
+            assets.extend(os.path.join(root, filename) for filename in filenames)
+        return {
+            "data": [os.path.join(data_dir, f) for f in self.venue_files()],
+            "master": [self.master_path],
+            "assets": assets,
+        }
+
+    def watch(self, interval: float = POLL_INTERVAL):
+        """Poll the inputs and apply changes until the process exits"""
+        state = {
+            group: snapshot(paths) for group, paths in self.watched_files().items()
+        }
+        while True:
+            time.sleep(interval)
+            current = {
+                group: snapshot(paths) for group, paths in self.watched_files().items()
+            }
+            try:
+                if datetime.now().date() != self.today:
+                    print("📆 New day, reloading everything")
+                    self.load()
+                elif current["assets"] != state["assets"]:
+                    self.update_assets()
+                else:
+                    if current["master"] != state["master"]:
+                        self.update_master()
+                    if current["data"] != state["data"]:
+                        changed = {
+                            os.path.basename(path)
+                            for path in set(current["data"]) | set(state["data"])
+                            if current["data"].get(path) != state["data"].get(path)
+                        }
+                        print(f"✏️  Changed: {', '.join(sorted(changed))}")
+                        stream = self.generator.iter_events()
+                        self.update_venues(
+                            sorted({stream.venue_key(name) for name in changed})
+                        )
+            except Exception as e:
+                print(f"❌ Error while rebuilding: {e}")
+            state = current
+
+    # Serving
+
+    def lookup(self, path: str) -> Optional[bytes]:
+        """Page or asset for a request path; anything else from generated/"""
+        relative = unquote(urlsplit(path).path).lstrip("/")
+        if relative == "" or relative.endswith("/"):
+            relative += "index.html"
+
+        if relative == "sw.js":
+            return DEV_SERVICE_WORKER
+        # Pages are keyed relative to the served region's output
+        prefix = self.generator.region.url_prefix.lstrip("/")
+        if relative.startswith(prefix):
+            with self.lock:
+                page = self.pages.get(relative[len(prefix) :])
+            if page is not None:
+                return page
+
+        if relative in self.generator.assets.files:
+            return self.generator.assets.content(relative)
+
+        site_dir = os.path.abspath(self.generator.site_dir)
+        target = os.path.abspath(os.path.join(site_dir, relative))
+        if os.path.commonpath([site_dir, target]) == site_dir and os.path.isfile(
+            target
+        ):
+            with open(target, "rb") as f:
+                return f.read()
+        return None
+
+
+def serve(generator, port: int = 8000, watch: bool = False):
+    """Serve the site from memory on localhost, optionally re-rendering on changes"""
+    site = DevSite(generator)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            try:
+                body = site.lookup(self.path)
+            except OSError:
+                body = None
+            if body is None:
+                self.send_error(404)
+                return
+            path = urlsplit(self.path).path
+            if path.endswith("/"):
+                path += "index.html"
+            content_type = (
+                CONTENT_TYPES.get(os.path.splitext(path)[1])
+                or mimetypes.guess_type(path)[0]
+                or "application/octet-stream"
+            )
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    if watch:
+        threading.Thread(target=site.watch, daemon=True).start()
+        print(
+            f"👀 Watching {os.path.relpath(generator.data_dir, generator.base_dir)}/, "
+            f"{os.path.relpath(generator.master_path, generator.base_dir)} and input/assets"
+        )
+    print(
+        f"🌐 Serving {generator.region.name} on "
+        f"http://127.0.0.1:{port}{generator.region.url_prefix} (Ctrl+C to stop)"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped")
+    finally:
+        server.server_close()
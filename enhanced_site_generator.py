@@ -6,15 +6,29 @@ Can work with existing JSON files OR generate directly from master list
 
 import json
 import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Optional
 import requests
 from bs4 import BeautifulSoup
-import re
+
+import german_dates
+import pdf_calendar
+import recurrence
+from event_model import Event, VenueTable, start_order
+from event_stream import EventStream
+from fetch_cache import FetchCache
+from fetch_engine import FetchEngine, FetchResult
+from fileutils import write_atomic
+
+# Scrapers that parse the fetched opening hours page. All others build events from
+# the master list and today's date, so their output must not be cached by page content
+PAGE_SCRAPERS = {'presshaus'}
 
 class EnhancedHeurigenSiteGenerator:
-    def __init__(self, base_dir: str = "."):
+    def __init__(self, base_dir: str = ".", fetch_engine: Optional[FetchEngine] = None):
         self.base_dir = base_dir
+        self.fetch_engine = fetch_engine
         self.data_dir = os.path.join(base_dir, "data")
         self.input_dir = os.path.join(base_dir, "input")
         self.output_dir = os.path.join(base_dir, "generated")
@@ -22,15 +36,149 @@ class EnhancedHeurigenSiteGenerator:
         # Load master heurigen data
         with open(os.path.join(self.input_dir, "heurigen_list.json"), 'r', encoding='utf-8') as f:
             self.heurigen_master = json.load(f)
+        
+        # ETag/Last-Modified, content hashes and generated events per opening hours page
+        self.fetch_cache = FetchCache(os.path.join(self.input_dir, "fetch_cache.json"))
+        
+        # Content hashes and extracted events of the PDF calendars ("pdf_calendar" in the master list)
+        self.pdf_cache = pdf_calendar.PdfCalendarCache(os.path.join(self.input_dir, "pdf_calendar_cache.json"))
+        
+        # Scraped events share one Venue per venue, like the ones loaded from data/*.json
+        self.venues = VenueTable(self.heurigen_master)
+    
+    def ingest_pdf_calendars(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Turn PDF calendars into data/<key>.json, skipping PDFs whose content has not changed"""
+        calendars = {}
+        
+        for heurigen_key, heurigen_data in self.heurigen_master.items():
+            source = heurigen_data.get("pdf_calendar")
+            if not source:
+                continue
+            
+            data_file = os.path.join(self.data_dir, f"{heurigen_key}.json")
+            try:
+                content = self._pdf_content(heurigen_key, source)
+                digest = pdf_calendar.content_hash(content)
+                
+                events = self.pdf_cache.cached_events(heurigen_key, digest)
+                if events is not None and os.path.exists(data_file):
+                    print(f"⏭️  {heurigen_data['label']} PDF unchanged, reusing {len(events)} cached events")
+                    calendars[heurigen_key] = events
+                    continue
+                refusal = self.pdf_cache.cached_refusal(heurigen_key, digest)
+                if refusal is not None:
+                    print(f"⏭️  {heurigen_data['label']} PDF unchanged, still not using it: {refusal}")
+                    continue
+                
+                print(f"📄 Reading PDF calendar of {heurigen_data['label']}...")
+                events = pdf_calendar.events_from_pdf(content, heurigen_data, datetime.now().year)
+            except pdf_calendar.UnmarkedCalendarError as e:
+                print(f"⚠️  Not using PDF calendar of {heurigen_data['label']}, keeping data/{heurigen_key}.json: {e}")
+                self.pdf_cache.store_refusal(heurigen_key, source, digest, str(e))
+                continue
+            except Exception as e:
+                print(f"Error reading PDF calendar of {heurigen_key}: {e}")
+                continue
+            
+            self.pdf_cache.store_events(heurigen_key, source, digest, events)
+            entries = recurrence.compact(events)
+            write_atomic(data_file, json.dumps(entries, ensure_ascii=False, indent=2).encode('utf-8'))
+            print(f"✅ Wrote {len(events)} events ({len(entries)} entries) to data/{heurigen_key}.json")
+            calendars[heurigen_key] = events
+        
+        for heurigen_key in self.pdf_cache.prune(key for key, data in self.heurigen_master.items() if data.get("pdf_calendar")):
+            print(f"🗑️  Evicted {heurigen_key} from PDF calendar cache")
+        self.pdf_cache.save()
+        return calendars
+    
+    def _pdf_content(self, heurigen_key: str, source: str) -> bytes:
+        """Bytes of a PDF calendar given as URL or as path relative to the repository"""
+        if source.startswith(("http://", "https://")):
+            if self.fetch_engine is None:
+                self.fetch_engine = FetchEngine()
+            page = self.fetch_engine.fetch(heurigen_key, source)
+            if not page.ok:
+                raise RuntimeError(page.error or f"HTTP {page.status}")
+            return page.content
+        
+        with open(os.path.join(self.base_dir, source), 'rb') as f:
+            return f.read()
+    
+    def fetch_pages(self, heurigen_keys: Iterable[str]) -> Dict[str, FetchResult]:
+        """Fetch the opening hours pages the given heurigen are scraped from, concurrently (conditional requests)"""
+        urls = {}
+        headers = {}
+        for heurigen_key in heurigen_keys:
+            if heurigen_key not in PAGE_SCRAPERS:
+                continue
+            url = self.heurigen_master[heurigen_key].get("link_opening_hours_page", "")
+            if url:
+                urls[heurigen_key] = url
+                headers[heurigen_key] = self.fetch_cache.conditional_headers(heurigen_key, url)
+        
+        if not urls:
+            return {}
+        
+        if self.fetch_engine is None:
+            self.fetch_engine = FetchEngine()
+        
+        started = time.monotonic()
+        pages = self.fetch_engine.fetch_all(urls, headers)
+        failed = [key for key, page in pages.items() if not page.ok]
+        not_modified = sum(1 for page in pages.values() if page.status == 304)
+        print(f"🌐 Fetched {len(pages)} pages in {time.monotonic() - started:.1f}s ({not_modified} not modified, {len(failed)} failed)")
+        for key in failed:
+            print(f"⚠️  {key}: {pages[key].error or pages[key].status}")
+        
+        return pages
+    
+    def scrape_if_changed(self, heurigen_key: str, heurigen_data: Dict[str, Any], page: Optional[FetchResult]) -> List[Dict[str, Any]]:
+        """Scrape a heuriger, reusing cached events when its page content has not changed"""
+        if heurigen_key not in PAGE_SCRAPERS or page is None or not page.ok:
+            return self.scrape_opening_hours(heurigen_key, heurigen_data, page)
+        
+        content_hash = self.fetch_cache.page_hash(page)
+        if content_hash is None:
+            # 304 without a cached hash: fetch the full page again
+            page = self.fetch_engine.fetch(heurigen_key, page.url)
+            if not page.ok:
+                return self.scrape_opening_hours(heurigen_key, heurigen_data, page)
+            content_hash = self.fetch_cache.page_hash(page)
+        
+        cached_events = self.fetch_cache.cached_events(heurigen_key, page.url, content_hash)
+        if cached_events is not None:
+            print(f"⏭️  {heurigen_data['label']} unchanged, reusing {len(cached_events)} cached events")
+            return cached_events
+        
+        events = self.scrape_opening_hours(heurigen_key, heurigen_data, page)
+        self.fetch_cache.store_events(heurigen_key, page.url, content_hash, events)
+        return events
     
-    def scrape_opening_hours(self, heurigen_key: str, heurigen_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def save_fetch_cache(self):
+        """Evict venues that left the master list (or are not scraped from their page) and write the fetch cache"""
+        evicted = self.fetch_cache.prune({key: data for key, data in self.heurigen_master.items() if key in PAGE_SCRAPERS})
+        for entry in evicted:
+            print(f"🗑️  Evicted {entry} from fetch cache")
+        self.fetch_cache.save()
+    
+    def _page_content(self, heurigen_data: Dict[str, Any], page: Optional[FetchResult]) -> bytes:
+        """Content of a prefetched page, or fetch it now when scraping a single heuriger"""
+        if page is not None:
+            if not page.ok:
+                raise RuntimeError(page.error or f"HTTP {page.status}")
+            return page.content
+        
+        response = requests.get(heurigen_data["link_opening_hours_page"], timeout=10)
+        return response.content
+    
+    def scrape_opening_hours(self, heurigen_key: str, heurigen_data: Dict[str, Any], page: Optional[FetchResult] = None) -> List[Dict[str, Any]]:
         """Scrape opening hours directly from website and generate events"""
         events = []
         
         try:
             # Example implementation for different heuriger types
             if heurigen_key == "presshaus":
-                events = self._scrape_presshaus(heurigen_data)
+                events = self._scrape_presshaus(heurigen_data, page)
             elif heurigen_key == "wieninger":
                 events = self._scrape_wieninger(heurigen_data)
             # Add more specific scrapers as needed
@@ -44,7 +192,7 @@ class EnhancedHeurigenSiteGenerator:
         
         return events
     
-    def _scrape_presshaus(self, heurigen_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _scrape_presshaus(self, heurigen_data: Dict[str, Any], page: Optional[FetchResult] = None) -> List[Dict[str, Any]]:
         """Specific scraper for Presshaus"""
         events = []
         url = heurigen_data.get("link_opening_hours_page", "")
@@ -53,50 +201,36 @@ class EnhancedHeurigenSiteGenerator:
             return events
             
         try:
-            response = requests.get(url, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for date patterns in the text
-            text = soup.get_text()
+            content = self._page_content(heurigen_data, page)
+            soup = BeautifulSoup(content, 'html.parser')
             
-            # Pattern for dates like "27.-29. Juni 2025"
-            date_patterns = re.findall(r'(\d{1,2})\.-(\d{1,2})\.\s+(\w+)\s+(\d{4})', text)
+            # Look for date ranges like "27.-29. Juni 2025" in the text
+            text = soup.get_text(' ')
             
-            for start_day, end_day, month_name, year in date_patterns:
-                # Convert German month names to numbers
-                month_map = {
-                    'Januar': 1, 'Februar': 2, 'März': 3, 'April': 4,
-                    'Mai': 5, 'Juni': 6, 'Juli': 7, 'August': 8,
-                    'September': 9, 'Oktober': 10, 'November': 11, 'Dezember': 12
-                }
-                
-                month_num = month_map.get(month_name, 0)
-                if month_num == 0:
+            for record in german_dates.iter_records(text):
+                if not isinstance(record, german_dates.DateRange) or record.end <= record.start:
                     continue
                 
                 # Generate events for the date range
-                for day in range(int(start_day), int(end_day) + 1):
-                    try:
-                        date = datetime(int(year), month_num, day)
-                        
-                        # Friday starts at 16:00, Sat/Sun at 14:00
-                        start_hour = 16 if date.weekday() == 4 else 14
-                        
-                        event = {
-                            "title": heurigen_data["label"],
-                            "start": f"{date.strftime('%Y-%m-%d')}T{start_hour:02d}:00:00",
-                            "end": f"{date.strftime('%Y-%m-%d')}T23:00:00",
-                            "allDay": False,
-                            "url": heurigen_data["website"],
-                            "extendedProps": {
-                                "mapLink": heurigen_data["location"],
-                                "lat": heurigen_data["lat"],
-                                "lng": heurigen_data["lng"]
-                            }
+                date = record.start
+                while date <= record.end:
+                    # Friday starts at 16:00, Sat/Sun at 14:00
+                    start_hour = 16 if date.weekday() == 4 else 14
+                    
+                    event = {
+                        "title": heurigen_data["label"],
+                        "start": f"{date.strftime('%Y-%m-%d')}T{start_hour:02d}:00:00",
+                        "end": f"{date.strftime('%Y-%m-%d')}T23:00:00",
+                        "allDay": False,
+                        "url": heurigen_data["website"],
+                        "extendedProps": {
+                            "mapLink": heurigen_data["location"],
+                            "lat": heurigen_data["lat"],
+                            "lng": heurigen_data["lng"]
                         }
-                        events.append(event)
-                    except ValueError:
-                        continue
+                    }
+                    events.append(event)
+                    date += timedelta(days=1)
                         
         except Exception as e:
             print(f"Error scraping Presshaus: {e}")
@@ -107,37 +241,38 @@ class EnhancedHeurigenSiteGenerator:
         """Generic scraper for heurigen with regular schedules"""
         events = []
         
-        # Use comment field for regular schedules
+        # Use comment field for regular schedules, e.g. "Samstag und Sonntag ab 16 Uhr bis 22 Uhr"
         comment = heurigen_data.get("comment", "")
+        records = german_dates.extract(comment)
+        leftover = german_dates.unresolved(comment, records)
+        if leftover:
+            # Only a comment the rules fully describe may replace the venue's events
+            print(f"⚠️  Could not resolve the schedule of {heurigen_data['label']} ({' / '.join(leftover)}), keeping data/{heurigen_key}.json")
+            return self._load_existing_json(heurigen_key)
+        rules = german_dates.opening_rules(records)
         
-        if "Samstag und Sonntag" in comment and "16 Uhr bis 22 Uhr" in comment:
-            # Generate weekend events for next 8 weeks
-            today = datetime.now().date()
-            for week in range(8):
-                base_date = today + timedelta(weeks=week)
-                
-                # Find Saturday and Sunday of this week
-                days_until_saturday = (5 - base_date.weekday()) % 7
-                saturday = base_date + timedelta(days=days_until_saturday)
-                sunday = saturday + timedelta(days=1)
-                
-                for date in [saturday, sunday]:
-                    if date >= today:  # Only future dates
-                        event = {
-                            "title": heurigen_data["label"],
-                            "start": f"{date.strftime('%Y-%m-%d')}T16:00:00",
-                            "end": f"{date.strftime('%Y-%m-%d')}T22:00:00", 
-                            "allDay": False,
-                            "url": heurigen_data["website"],
-                            "extendedProps": {
-                                "mapLink": heurigen_data["location"],
-                                "lat": heurigen_data["lat"],
-                                "lng": heurigen_data["lng"]
-                            }
-                        }
-                        events.append(event)
+        # Generate events for the next 8 weeks
+        today = datetime.now().date()
+        last_day = today + timedelta(weeks=8) - timedelta(days=1)
+        for rule in rules:
+            for start, end in german_dates.expand_rule(rule, today, last_day):
+                event = {
+                    "title": heurigen_data["label"],
+                    "start": start.strftime('%Y-%m-%dT%H:%M:%S'),
+                    "end": end.strftime('%Y-%m-%dT%H:%M:%S'),
+                    "allDay": False,
+                    "url": heurigen_data["website"],
+                    "extendedProps": {
+                        "mapLink": heurigen_data["location"],
+                        "lat": heurigen_data["lat"],
+                        "lng": heurigen_data["lng"]
+                    }
+                }
+                events.append(event)
         
-        return events
+        events.sort(key=lambda e: e["start"])
+        # Regular schedules are stored as recurrence rules, not one event per day
+        return recurrence.compact(events)
     
     def _load_existing_json(self, heurigen_key: str) -> List[Dict[str, Any]]:
         """Load existing JSON file as fallback"""
@@ -163,7 +298,7 @@ class EnhancedHeurigenSiteGenerator:
                 return choice
             print("Please enter 1, 2, or 3")
     
-    def load_all_events(self, mode: str = "1") -> List[Dict[str, Any]]:
+    def load_all_events(self, mode: str = "1") -> List[Event]:
         """Load events based on chosen mode"""
         all_events = []
         
@@ -177,71 +312,60 @@ class EnhancedHeurigenSiteGenerator:
             # Hybrid approach
             all_events = self._hybrid_generation()
         
-        # Sort events by start date
-        all_events.sort(key=lambda x: x['start'])
+        # Sort events by start date (JSON files alone already come merged in order)
+        if mode != "1":
+            all_events.sort(key=start_order)
         return all_events
     
-    def _load_from_json_files(self) -> List[Dict[str, Any]]:
-        """Load events from existing JSON files (current approach)"""
-        all_events = []
-        
-        for filename in os.listdir(self.data_dir):
-            if filename.endswith('.json') and filename != 'archive':
-                heurigen_key = filename.replace('.json', '')
-                file_path = os.path.join(self.data_dir, filename)
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        events = json.load(f)
-                    
-                    # Add heurigen metadata to each event
-                    for event in events:
-                        event['heurigen_key'] = heurigen_key
-                        if heurigen_key in self.heurigen_master:
-                            event['heurigen_data'] = self.heurigen_master[heurigen_key]
-                        all_events.append(event)
-                        
-                except Exception as e:
-                    print(f"Error loading {filename}: {e}")
-        
-        return all_events
+    def _load_from_json_files(self) -> List[Event]:
+        """Load events from existing JSON files, merged in start order"""
+        return list(EventStream(self.data_dir, self.heurigen_master))
     
-    def _generate_from_master_list(self) -> List[Dict[str, Any]]:
+    def _generate_from_master_list(self) -> List[Event]:
         """Generate events directly from master list by scraping"""
         all_events = []
         
+        # PDF calendars first, then fetch all other pages concurrently and parse them one by one
+        calendars = self.ingest_pdf_calendars()
+        pages = self.fetch_pages(key for key in self.heurigen_master if key not in calendars)
+        
         for heurigen_key, heurigen_data in self.heurigen_master.items():
-            print(f"📊 Generating events for {heurigen_data['label']}...")
-            events = self.scrape_opening_hours(heurigen_key, heurigen_data)
+            if heurigen_key in calendars:
+                events = calendars[heurigen_key]
+            else:
+                print(f"📊 Generating events for {heurigen_data['label']}...")
+                events = self.scrape_if_changed(heurigen_key, heurigen_data, pages.get(heurigen_key))
             
-            for event in events:
-                event['heurigen_key'] = heurigen_key
-                event['heurigen_data'] = heurigen_data
-                all_events.append(event)
+            for event in recurrence.expand(events):
+                all_events.append(self.venues.event(heurigen_key, event))
         
+        self.save_fetch_cache()
         return all_events
     
-    def _hybrid_generation(self) -> List[Dict[str, Any]]:
+    def _hybrid_generation(self) -> List[Event]:
         """Hybrid: Use JSON files where available, scrape where missing"""
         all_events = []
         
-        # First, load existing JSON files
+        # Refresh data/<key>.json of changed PDF calendars, then load existing JSON files
+        self.ingest_pdf_calendars()
         existing_events = self._load_from_json_files()
-        existing_keys = set(event['heurigen_key'] for event in existing_events)
+        existing_keys = set(event.venue.key for event in existing_events)
         
         all_events.extend(existing_events)
         
         # Then, generate for missing heurigen
-        for heurigen_key, heurigen_data in self.heurigen_master.items():
-            if heurigen_key not in existing_keys:
-                print(f"📊 Generating events for missing {heurigen_data['label']}...")
-                events = self.scrape_opening_hours(heurigen_key, heurigen_data)
-                
-                for event in events:
-                    event['heurigen_key'] = heurigen_key
-                    event['heurigen_data'] = heurigen_data
-                    all_events.append(event)
+        missing_keys = [key for key in self.heurigen_master if key not in existing_keys]
+        pages = self.fetch_pages(missing_keys)
+        
+        for heurigen_key in missing_keys:
+            heurigen_data = self.heurigen_master[heurigen_key]
+            print(f"📊 Generating events for missing {heurigen_data['label']}...")
+            events = self.scrape_if_changed(heurigen_key, heurigen_data, pages.get(heurigen_key))
+            
+            for event in recurrence.expand(events):
+                all_events.append(self.venues.event(heurigen_key, event))
         
+        self.save_fetch_cache()
         return all_events
 
 if __name__ == "__main__":
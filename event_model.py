@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Event model for AusCheckt Is
+Loaded events are slotted, immutable objects instead of JSON dicts: start
+and end are parsed once, the days an event covers are computed once, and
+the venue fields every event repeats (title, links, position) live on one
+shared Venue. from_dict/to_dict convert from and to the data/*.json shape
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# data/*.json fields kept on the venue, in Venue field order
+VENUE_FIELDS = ("title", "url", "mapLink", "lat", "lng")
+# Fields that are not carried over into Event.extra
+MODEL_FIELDS = set(VENUE_FIELDS) | {
+    "start",
+    "end",
+    "extendedProps",
+    "heurigen_key",
+    "heurigen_data",
+}
+
+
+def parse_datetime(value: str) -> datetime:
+    """Parse an ISO timestamp as used in data/*.json"""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+@dataclass(frozen=True, slots=True)
+class Venue:
+    key: str
+    title: str
+    url: Optional[str] = None
+    map_link: Optional[str] = None
+    lat: Optional[float] = None
+    lng: Optional[float] = None
+    # Master list entry, by reference
+    master: Optional[Dict[str, Any]] = field(default=None, compare=False, repr=False)
+
+    @property
+    def position(self) -> Optional[Tuple[float, float]]:
+        if self.lat is None or self.lng is None:
+            return None
+        return self.lat, self.lng
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    venue: Venue
+    start: datetime
+    # None if the event lasts until midnight
+    end: Optional[datetime] = None
+    # Other data/*.json fields (allDay, ...) as (name, value) pairs
+    extra: Tuple[Tuple[str, Any], ...] = ()
+    # First and last day the event covers (closing at 00:00 stays on the day before)
+    first_day: date = field(init=False)
+    last_day: date = field(init=False)
+
+    def __post_init__(self):
+        first_day = self.start.date()
+        # Without end (or ending before it starts) the event stays on its first day
+        if self.end is not None and self.end > self.start:
+            last_day = (self.end - timedelta(microseconds=1)).date()
+        else:
+            last_day = first_day
+        object.__setattr__(self, "first_day", first_day)
+        object.__setattr__(self, "last_day", last_day)
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any], venue: Venue) -> "Event":
+        end = raw.get("end")
+        extra = raw.keys() - MODEL_FIELDS
+        return cls(
+            venue,
+            parse_datetime(raw["start"]),
+            parse_datetime(end) if end else None,
+            tuple((name, raw[name]) for name in raw if name in extra) if extra else (),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The event in data/*.json shape"""
+        venue = self.venue
+        event: Dict[str, Any] = {"title": venue.title, "start": self.start_iso}
+        if self.end is not None:
+            event["end"] = self.end_iso
+        for name, value in [
+            ("url", venue.url),
+            ("mapLink", venue.map_link),
+            ("lat", venue.lat),
+            ("lng", venue.lng),
+        ]:
+            if value is not None:
+                event[name] = value
+        event.update(self.extra)
+        return event
+
+    @property
+    def start_iso(self) -> str:
+        return self.start.isoformat()
+
+    @property
+    def end_iso(self) -> Optional[str]:
+        return self.end.isoformat() if self.end is not None else None
+
+    def interval(self) -> Tuple[datetime, datetime]:
+        """(start, end); events without end last until midnight"""
+        end = self.end
+        if end is None:
+            end = datetime.combine(
+                self.start.date() + timedelta(days=1), time(), self.start.tzinfo
+            )
+        return self.start, max(end, self.start)
+
+    def days(self) -> List[date]:
+        """All days the event covers"""
+        if self.first_day == self.last_day:
+            return [self.first_day]
+        return [
+            date.fromordinal(ordinal)
+            for ordinal in range(
+                self.first_day.toordinal(), self.last_day.toordinal() + 1
+            )
+        ]
+
+
+def start_order(event: Event) -> str:
+    """Sort key of events: the start as written in data/*.json"""
+    return event.start.isoformat()
+
+
+class VenueTable:
+    """Venues by their fields, so all events of a venue share one Venue"""
+
+    def __init__(self, heurigen_master: Dict[str, Dict[str, Any]]):
+        self.heurigen_master = heurigen_master
+        self.venues: Dict[Tuple, Venue] = {}
+
+    def venue(self, key: str, raw: Dict[str, Any]) -> Venue:
+        props = raw.get("extendedProps")
+        if props:
+            # Scraped events keep map link and position in extendedProps
+            raw = {**props, **raw}
+        fields = (
+            key,
+            raw.get("title"),
+            raw.get("url"),
+            raw.get("mapLink"),
+            raw.get("lat"),
+            raw.get("lng"),
+        )
+        venue = self.venues.get(fields)
+        if venue is None:
+            venue = self.venues[fields] = Venue(
+                *fields, master=self.heurigen_master.get(key)
+            )
+        return venue
+
+    def event(self, key: str, raw: Dict[str, Any]) -> Event:
+        """Event of a data/*.json dict, filed under the given venue key"""
+        return Event.from_dict(raw, self.venue(key, raw))
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Columnar event store for AusCheckt Is
+Packs current and archived events into one binary file of fixed-width
+columns (start/end epoch seconds, venue, title, url, UTC offset, flags)
+plus a small string and venue table. The file is memory-mapped and range
+queries by date are a binary search over the sorted start column
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import normalize
+import recurrence
+from regions import load_regions
+
+MAGIC = b"AUSEVT1\n"
+VERSION = 1
+# magic, version, event count, max duration (s), length of the JSON table
+HEADER = struct.Struct("<8sIIqQ")
+EPOCH = datetime(1970, 1, 1)
+NO_OFFSET = -32768
+
+FLAG_HAS_END = 1
+FLAG_ALL_DAY = 2
+
+# (name, array typecode); every column is padded to 8 bytes
+COLUMNS = [
+    ("start", "q"),
+    ("end", "q"),
+    ("venue", "I"),
+    ("title", "I"),
+    ("url", "I"),
+    ("offset", "h"),
+    ("flags", "B"),
+]
+
+def to_epoch(value: str) -> Tuple[int, int]:
+    """Wall-clock epoch seconds and UTC offset in minutes (NO_OFFSET if naive)"""
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    offset = NO_OFFSET
+    if parsed.tzinfo is not None:
+        offset = int(parsed.utcoffset().total_seconds() // 60)
+        parsed = parsed.replace(tzinfo=None)
+    return int((parsed - EPOCH).total_seconds()), offset
+
+
+def from_epoch(seconds: int, offset: int) -> str:
+    value = EPOCH + timedelta(seconds=seconds)
+    if offset != NO_OFFSET:
+        value = value.replace(tzinfo=timezone(timedelta(minutes=offset)))
+    return value.isoformat()
+
+
+def day_epoch(day: date) -> int:
+    return (day - EPOCH.date()).days * 86400
+
+
+def covered_until(start: int, end: int, flags: int) -> int:
+    """Exclusive end used for day lookups; events without end last until midnight"""
+    if not flags & FLAG_HAS_END:
+        return start - start % 86400 + 86400
+    return max(end, start)
+
+
+def normalize_event(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten the older archive format (extendedProps, allDay) into the data/*.json shape"""
+    event = {key: value for key, value in raw.items() if key != "extendedProps"}
+    event.update(raw.get("extendedProps", {}))
+    return event
+
+
+def iter_json_events(
+    directory: str, aliases: Optional[Dict[str, str]] = None
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(venue key, event) for every *.json file in a directory, rules expanded
+
+    Files named after an alias (see normalize.alias_map) get the canonical key.
+    """
+    aliases = aliases or {}
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".json"):
+            continue
+        key = filename[: -len(".json")]
+        with open(os.path.join(directory, filename), "r", encoding="utf-8") as f:
+            events = json.load(f)
+        for raw in recurrence.iter_expanded(events):
+            yield aliases.get(key, key), normalize_event(raw)
+
+
+def write_store(path: str, events: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+    """Write (venue key, event) pairs as a store file, return the event count"""
+    strings: List[str] = []
+    string_ids: Dict[str, int] = {}
+    venues: List[Dict[str, Any]] = []
+    venue_ids: Dict[str, int] = {}
+
+    def string_id(value: Optional[str]) -> int:
+        value = value or ""
+        if value not in string_ids:
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    rows = []
+    for key, event in events:
+        if key not in venue_ids:
+            venue_ids[key] = len(venues)
+            venues.append({"key": key, "mapLink": None, "lat": None, "lng": None})
+        venue = venues[venue_ids[key]]
+        if venue["mapLink"] is None and event.get("mapLink"):
+            # Older exports of a venue come without location
+            venue.update(
+                mapLink=event["mapLink"], lat=event.get("lat"), lng=event.get("lng")
+            )
+        start, offset = to_epoch(event["start"])
+        flags = FLAG_ALL_DAY if event.get("allDay") else 0
+        end = start
+        if event.get("end"):
+            end, _ = to_epoch(event["end"])
+            flags |= FLAG_HAS_END
+        rows.append(
+            (
+                start,
+                end,
+                venue_ids[key],
+                string_id(event.get("title")),
+                string_id(event.get("url")),
+                offset,
+                flags,
+            )
+        )
+    rows.sort()
+
+    columns = [array(typecode) for _, typecode in COLUMNS]
+    max_duration = 0
+    for row in rows:
+        for column, value in zip(columns, row):
+            column.append(value)
+        max_duration = max(max_duration, covered_until(row[0], row[1], row[6]) - row[0])
+
+    table = json.dumps(
+        {"strings": strings, "venues": venues},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(rows), max_duration, len(table)))
+        for column in columns:
+            if sys.byteorder != "little":
+                column.byteswap()
+            data = column.tobytes()
+            f.write(data + b"\0" * (-len(data) % 8))
+        f.write(table)
+    os.replace(tmp_path, path)
+    return len(rows)
+
+
+class EventStore:
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self._mmap = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+            )
+        if self._mmap is None or size < HEADER.size:
+            raise ValueError(f"{path} is not an event store")
+
+        magic, version, count, max_duration, table_size = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an event store (version {VERSION})")
+        if sys.byteorder != "little":
+            raise ValueError("event stores can only be memory-mapped on little-endian")
+
+        self.count = count
+        self.max_duration = max_duration
+        view = memoryview(self._mmap)
+        offset = HEADER.size
+        self.columns: Dict[str, memoryview] = {}
+        for name, typecode in COLUMNS:
+            size = array(typecode).itemsize * count
+            self.columns[name] = view[offset : offset + size].cast(typecode)
+            offset += size + (-size % 8)
+
+        table = json.loads(bytes(view[offset : offset + table_size]).decode("utf-8"))
+        self.strings: List[str] = table["strings"]
+        self.venues: List[Dict[str, Any]] = table["venues"]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> "EventStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # Views into the map have to be released before it can be closed
+        for column in self.columns.values():
+            column.release()
+        self.columns = {}
+        self._mmap.close()
+
+    def venue_key(self, index: int) -> str:
+        return self.venues[self.columns["venue"][index]]["key"]
+
+    def indices_between(self, first: date, last: date) -> List[int]:
+        """Rows covering any day in [first, last], in start order"""
+        starts = self.columns["start"]
+        ends = self.columns["end"]
+        flags = self.columns["flags"]
+        window_start = day_epoch(first)
+        window_end = day_epoch(last) + 86400
+
+        # Nothing that starts before window_start - max_duration can reach it
+        lo = bisect_left(starts, window_start - self.max_duration)
+        hi = bisect_left(starts, window_end, lo)
+        return [
+            i
+            for i in range(lo, hi)
+            if covered_until(starts[i], ends[i], flags[i]) > window_start
+        ]
+
+    def event(self, index: int) -> Dict[str, Any]:
+        """One row in the data/*.json event format"""
+        columns = self.columns
+        venue = self.venues[columns["venue"][index]]
+        offset = columns["offset"][index]
+        flags = columns["flags"][index]
+
+        event = {
+            "title": self.strings[columns["title"][index]],
+            "start": from_epoch(columns["start"][index], offset),
+        }
+        if flags & FLAG_HAS_END:
+            event["end"] = from_epoch(columns["end"][index], offset)
+        if flags & FLAG_ALL_DAY:
+            event["allDay"] = True
+        url = self.strings[columns["url"][index]]
+        if url:
+            event["url"] = url
+        for key in ("mapLink", "lat", "lng"):
+            if venue.get(key) is not None:
+                event[key] = venue[key]
+        return event
+
+    def events_between(self, first: date, last: date) -> List[Dict[str, Any]]:
+        return [self.event(i) for i in self.indices_between(first, last)]
+
+    def export_json(self, directory: str) -> Dict[str, int]:
+        """Write one <venue key>.json per venue, return events per venue"""
+        per_venue: Dict[int, List[Dict[str, Any]]] = {}
+        for index in range(self.count):
+            per_venue.setdefault(self.columns["venue"][index], []).append(
+                self.event(index)
+            )
+
+        os.makedirs(directory, exist_ok=True)
+        counts = {}
+        for venue_id, events in per_venue.items():
+            key = self.venues[venue_id]["key"]
+            with open(
+                os.path.join(directory, f"{key}.json"), "w", encoding="utf-8"
+            ) as f:
+                json.dump(events, f, ensure_ascii=False, indent=2)
+            counts[key] = len(events)
+        return counts
+
+
+def import_json(
+    data_dir: str, master_path: str, path: str, archive: bool = True
+) -> int:
+    """Build a store from <data_dir>/*.json and (optionally) <data_dir>/archive/*.json
+
+    Current and archived files repeat each other, so every venue's events are
+    sorted once and duplicate or overlapping openings are merged. Aliases come
+    from the region's master list.
+    """
+    with open(master_path, "r", encoding="utf-8") as f:
+        aliases = normalize.alias_map(json.load(f))
+
+    directories = [data_dir]
+    archive_dir = os.path.join(data_dir, "archive")
+    if archive and os.path.isdir(archive_dir):
+        directories.append(archive_dir)
+    per_venue: Dict[str, List[Dict[str, Any]]] = {}
+    for directory in directories:
+        for key, event in iter_json_events(directory, aliases):
+            per_venue.setdefault(key, []).append(event)
+
+    stats = normalize.NormalizationStats()
+    count = write_store(
+        path,
+        (
+            (key, event)
+            for key, events in per_venue.items()
+            for event in normalize.merge_overlapping(
+                sorted(events, key=lambda event: event["start"]), key, stats
+            )
+        ),
+    )
+    if stats.collapsed:
+        print(f"🧹 {stats.summary()}")
+    return count
+
+
+def import_if_stale(data_dir: str, master_path: str, path: str) -> bool:
+    """Rebuild the store when any data or archive file (or the master list with the
+    aliases) is newer, True if rebuilt"""
+    newest = os.path.getmtime(master_path)
+    archive_dir = os.path.join(data_dir, "archive")
+    for directory in [data_dir] + ([archive_dir] if os.path.isdir(archive_dir) else []):
+        # The directory mtime changes when a file is added or removed
+        newest = max(newest, os.path.getmtime(directory))
+        for filename in os.listdir(directory):
+            if filename.endswith(".json"):
+                newest = max(
+                    newest, os.path.getmtime(os.path.join(directory, filename))
+                )
+
+    if os.path.exists(path) and os.path.getmtime(path) >= newest:
+        return False
+    import_json(data_dir, master_path, path)
+    # Writing the store into data/ touches the directory itself
+    os.utime(path)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build, query or export the AusCheckt Is columnar event store"
+    )
+    parser.add_argument(
+        "--region", help="region from input/regions.json (default: the first one)"
+    )
+    parser.add_argument(
+        "--store", help="store file (default: events.evs in the region's data dir)"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("import", help="import data/ and data/archive/")
+    build.add_argument("--no-archive", action="store_true", help="skip data/archive/")
+
+    query = commands.add_parser("query", help="print events covering FIRST..LAST")
+    query.add_argument("first", type=date.fromisoformat)
+    query.add_argument("last", type=date.fromisoformat, nargs="?")
+
+    export = commands.add_parser("export", help="write <venue>.json files")
+    export.add_argument("directory")
+
+    args = parser.parse_args()
+
+    regions = load_regions()
+    region = regions[args.region] if args.region else next(iter(regions.values()))
+    if args.store is None:
+        args.store = os.path.join(region.data_dir, "events.evs")
+
+    if args.command == "import":
+        count = import_json(
+            region.data_dir, region.master_list, args.store, archive=not args.no_archive
+        )
+        print(f"📦 Wrote {count} events to {args.store}")
+        return
+
+    with EventStore(args.store) as store:
+        if args.command == "query":
+            events = store.events_between(args.first, args.last or args.first)
+            print(json.dumps(events, ensure_ascii=False, indent=2))
+        elif args.command == "export":
+            counts = store.export_json(args.directory)
+            print(
+                f"📄 Exported {sum(counts.values())} events for {len(counts)} venues to {args.directory}"
+            )
+
+
+if __name__ == "__main__":
+    main()
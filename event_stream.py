@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Streaming event loader for AusCheckt Is
+Every data/*.json file is normally in start order, so instead of loading and
+sorting everything the per-venue files are decoded incrementally and merged
+with a heap. Every file is decoded once; a window of at most SORT_WINDOW
+entries and one read buffer per venue are held, and the window puts entries
+that a hand edit left out of place back in start order.
+Recurrence rules are expanded on the way, for the requested window only,
+each venue's events are normalized (aliases, duplicates, overlaps) and
+only then turned into Event objects
+"""
+
+import heapq
+import json
+import os
+import re
+from itertools import repeat
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import normalize
+import recurrence
+from event_model import Event, VenueTable, parse_datetime
+
+CHUNK_SIZE = 16 * 1024
+# Entries a data file may have out of place and still stream in start order
+SORT_WINDOW = 64
+
+# The C scanner behind JSONDecoder.raw_decode, without the wrapper
+_scan_once = json.JSONDecoder().scan_once
+_SEPARATOR = re.compile(r"[\s,]*")
+
+
+def iter_json_array(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array without reading the whole file"""
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        position = 0
+        started = False
+        eof = False
+
+        while True:
+            # Skip whitespace and separators, then the opening bracket once
+            position = _SEPARATOR.match(buffer, position).end()
+            if not started and position < len(buffer):
+                if buffer[position] != "[":
+                    raise ValueError(f"{path} does not contain a JSON array")
+                started = True
+                position += 1
+                continue
+
+            if position < len(buffer):
+                if buffer[position] == "]":
+                    return
+                try:
+                    item, end = _scan_once(buffer, position)
+                except (StopIteration, json.JSONDecodeError):
+                    # Item continues in the next chunk
+                    if eof:
+                        raise ValueError(f"{path} contains invalid JSON")
+                else:
+                    # A number at the very end of the buffer may still be cut off
+                    if end < len(buffer) or eof:
+                        yield item
+                        position = end
+                        continue
+
+            if eof:
+                if not started:
+                    raise ValueError(f"{path} does not contain a JSON array")
+                raise ValueError(f"{path} ends inside the JSON array")
+
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+
+def ends_before(event: Dict[str, Any], day: date) -> bool:
+    """True if the event is over before the given day starts (same days as CalendarIndex)"""
+    start = parse_datetime(event["start"])
+    end = parse_datetime(event["end"]) if event.get("end") else None
+    # Closing at 00:00 belongs to the previous day
+    last_day = (
+        (end - timedelta(microseconds=1)).date()
+        if end and end > start
+        else start.date()
+    )
+    return last_day < day
+
+
+class EventStream:
+    """Events of all data/*.json files in global start order
+
+    Events of one venue share a Venue, which references its master list entry.
+    Events that are over before `since` or start after `until` are dropped
+    before they reach the merge. Files of alias keys are merged into their
+    canonical venue, and duplicate or overlapping openings are collapsed.
+    """
+
+    def __init__(
+        self,
+        data_dir: str,
+        heurigen_master: Dict[str, Dict[str, Any]],
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+    ):
+        self.data_dir = data_dir
+        self.heurigen_master = heurigen_master
+        self.since = since
+        self.until = until
+        self.loaded = 0
+        self.dropped = 0
+        self.unsorted_files: List[str] = []
+        self.aliases = normalize.alias_map(heurigen_master)
+        self.normalization = normalize.NormalizationStats()
+        self.venues = VenueTable(heurigen_master)
+
+    def venue_files(self) -> List[str]:
+        return sorted(
+            filename
+            for filename in os.listdir(self.data_dir)
+            if filename.endswith(".json")
+        )
+
+    def venue_key(self, filename: str) -> str:
+        """Canonical venue key of a data file"""
+        key = filename[: -len(".json")]
+        return self.aliases.get(key, key)
+
+    def venue_keys(self) -> Dict[str, List[str]]:
+        """Canonical venue key -> its data files, in key order"""
+        keys: Dict[str, List[str]] = {}
+        for filename in self.venue_files():
+            keys.setdefault(self.venue_key(filename), []).append(filename)
+        return dict(sorted(keys.items()))
+
+    def _iter_sorted(self, filename: str) -> Iterator[Dict[str, Any]]:
+        """Entries of a data file in start order, decoded in a single pass
+
+        The writers keep the files sorted. Each entry waits in a heap until
+        SORT_WINDOW later ones are read, so an entry moved by a hand edit is
+        still yielded in place; one that comes even later is yielded at once.
+        """
+        path = os.path.join(self.data_dir, filename)
+        window: List[Tuple[str, int, Dict[str, Any]]] = []
+        previous_start = ""
+        last_start = ""
+        too_late = False
+        for index, entry in enumerate(iter_json_array(path)):
+            start = entry["start"]
+            if start < previous_start and filename not in self.unsorted_files:
+                # The heap merge and the overlap sweep need start order
+                self.unsorted_files.append(filename)
+                print(f"⚠️  Warning: {filename} is not sorted by start, sorting it")
+            previous_start = start
+            if start < last_start:
+                if not too_late:
+                    too_late = True
+                    print(
+                        f"⚠️  Warning: {filename} has entries more than "
+                        f"{SORT_WINDOW} places out of order, sort it with "
+                        f"python recurrence.py expand {path}"
+                    )
+                yield entry
+                continue
+
+            heapq.heappush(window, (start, index, entry))
+            if len(window) > SORT_WINDOW:
+                last_start, _, entry = heapq.heappop(window)
+                yield entry
+        while window:
+            yield heapq.heappop(window)[2]
+
+    def iter_venue(self, filename: str) -> Iterator[Dict[str, Any]]:
+        """Events of one data file as dicts, counting those of alias files"""
+        file_key = filename[: -len(".json")]
+        heurigen_key = self.aliases.get(file_key, file_key)
+        since = self.since.isoformat() if self.since else None
+        until = self.until.isoformat() if self.until else None
+
+        try:
+            entries = self._iter_sorted(filename)
+            for event in recurrence.iter_expanded(entries, self.since, self.until):
+                if until and event["start"][:10] > until:
+                    self.dropped += 1
+                    continue
+                if since and (event.get("end") or event["start"])[:10] <= since:
+                    # Only events touching the first day need a closer look
+                    if ends_before(event, self.since):
+                        self.dropped += 1
+                        continue
+
+                if file_key != heurigen_key:
+                    self.normalization.aliased[file_key] += 1
+                self.loaded += 1
+                yield event
+        except Exception as e:
+            print(f"Error loading {filename}: {e}")
+
+    def iter_normalized(
+        self, key: str, filenames: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Normalized events of one venue across all of its data files, as dicts"""
+        if filenames is None:
+            filenames = self.venue_keys().get(key, [])
+        events = heapq.merge(
+            *(self.iter_venue(filename) for filename in filenames),
+            key=lambda event: event["start"],
+        )
+        return normalize.merge_overlapping(events, key, self.normalization)
+
+    def iter_key(
+        self, key: str, filenames: Optional[List[str]] = None
+    ) -> Iterator[Event]:
+        """Normalized events of one venue across all of its data files"""
+        return (
+            self.venues.event(key, event)
+            for event in self.iter_normalized(key, filenames)
+        )
+
+    def __iter__(self) -> Iterator[Event]:
+        # Merged on the start strings, then every event is converted once
+        merged = heapq.merge(
+            *(
+                zip(repeat(key), self.iter_normalized(key, filenames))
+                for key, filenames in self.venue_keys().items()
+            ),
+            key=lambda item: item[1]["start"],
+        )
+        return (self.venues.event(key, event) for key, event in merged)
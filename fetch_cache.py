@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Fetch cache for the Auscheckt Is scrapers
+Stores ETag/Last-Modified and a normalized-text content hash per opening
+hours page, plus the events generated from that content, so unchanged
+pages are neither re-downloaded in full nor parsed again
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from fetch_engine import FetchResult
+
+
+class FetchCache:
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                print(f"⚠️  Warning: Ignoring unreadable fetch cache: {e}")
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        """Hash of the visible page text, ignoring markup, scripts and whitespace"""
+        soup = BeautifulSoup(content, "html.parser")
+        for tag in soup(["script", "style", "noscript"]):
+            tag.decompose()
+        text = re.sub(r"\s+", " ", soup.get_text(" ")).strip()
+        return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+    def conditional_headers(self, heurigen_key: str, url: str) -> Dict[str, str]:
+        """If-None-Match/If-Modified-Since, only when cached events could be reused"""
+        entry = self.entries.get(url)
+        if not entry or heurigen_key not in entry.get("venues", {}):
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def page_hash(self, page: FetchResult) -> Optional[str]:
+        """Content hash of a fetched page; a 304 response keeps the cached hash"""
+        entry = self.entries.setdefault(page.url, {"venues": {}})
+        if page.status == 304:
+            return entry.get("content_hash")
+
+        entry["etag"] = page.headers.get("ETag")
+        entry["last_modified"] = page.headers.get("Last-Modified")
+        entry["content_hash"] = self.content_hash(page.content)
+        entry["fetched_at"] = datetime.now(timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%S+00:00"
+        )
+        return entry["content_hash"]
+
+    def cached_events(
+        self, heurigen_key: str, url: str, content_hash: Optional[str]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Events generated from exactly this page content, if any"""
+        venue = self.entries.get(url, {}).get("venues", {}).get(heurigen_key)
+        if not venue or content_hash is None or venue["content_hash"] != content_hash:
+            return None
+        return copy.deepcopy(venue["events"])
+
+    def store_events(
+        self,
+        heurigen_key: str,
+        url: str,
+        content_hash: str,
+        events: List[Dict[str, Any]],
+    ):
+        entry = self.entries.setdefault(url, {"venues": {}})
+        entry["venues"][heurigen_key] = {
+            "content_hash": content_hash,
+            "events": copy.deepcopy(events),
+        }
+
+    def prune(self, heurigen_master: Dict[str, Dict[str, Any]]) -> List[str]:
+        """Evict pages and venues that are no longer in the master list"""
+        wanted: Dict[str, set] = {}
+        for heurigen_key, heurigen_data in heurigen_master.items():
+            url = heurigen_data.get("link_opening_hours_page", "")
+            if url:
+                wanted.setdefault(url, set()).add(heurigen_key)
+
+        evicted = []
+        for url in list(self.entries):
+            if url not in wanted:
+                evicted.append(url)
+                del self.entries[url]
+                continue
+            venues = self.entries[url].get("venues", {})
+            for heurigen_key in list(venues):
+                if heurigen_key not in wanted[url]:
+                    evicted.append(f"{url} ({heurigen_key})")
+                    del venues[heurigen_key]
+        return evicted
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False, sort_keys=True)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Concurrent page fetcher for the Auscheckt Is scrapers
+Fetches many venue pages at once over a pooled session, with a global and
+a per-host concurrency limit, retries with backoff and a per-venue deadline
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class FetchResult:
+    key: str
+    url: str
+    status: Optional[int] = None
+    content: bytes = b""
+    headers: Mapping[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    attempts: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status is not None and self.status < 400
+
+
+class FetchEngine:
+    def __init__(
+        self,
+        max_workers: int = 8,
+        per_host: int = 2,
+        timeout: float = 10.0,
+        retries: int = 2,
+        backoff: float = 0.5,
+        deadline: float = 20.0,
+        session: Optional[requests.Session] = None,
+    ):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.deadline = deadline
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=max_workers, pool_maxsize=max_workers
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = (
+                "auschecktis-scraper (+https://auschecktis.at)"
+            )
+        self.session = session
+
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._host_lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_limits[host]
+
+    def fetch(
+        self, key: str, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> FetchResult:
+        """Fetch one page, retrying transient failures until the venue deadline"""
+        result = FetchResult(key=key, url=url)
+        started = time.monotonic()
+        give_up_at = started + self.deadline
+
+        while True:
+            remaining = give_up_at - time.monotonic()
+            if remaining <= 0:
+                result.error = result.error or "deadline exceeded"
+                break
+
+            result.attempts += 1
+            retry = False
+            try:
+                with self._host_limit(url):
+                    response = self.session.get(
+                        url, headers=headers, timeout=min(self.timeout, remaining)
+                    )
+                result.status = response.status_code
+                result.content = response.content
+                result.headers = response.headers
+                result.error = None
+                retry = response.status_code in RETRY_STATUS
+                if retry:
+                    result.error = f"HTTP {response.status_code}"
+            except requests.RequestException as e:
+                result.error = f"{type(e).__name__}: {e}"
+                retry = True
+
+            if not retry or result.attempts > self.retries:
+                break
+
+            # Exponential backoff, but never past the deadline
+            delay = self.backoff * (2 ** (result.attempts - 1))
+            if time.monotonic() + delay >= give_up_at:
+                break
+            time.sleep(delay)
+
+        result.elapsed = time.monotonic() - started
+        return result
+
+    def fetch_all(
+        self,
+        urls: Dict[str, str],
+        headers: Optional[Dict[str, Dict[str, str]]] = None,
+    ) -> Dict[str, FetchResult]:
+        """Fetch {key: url} concurrently; total time is bounded by the slowest venue"""
+        headers = headers or {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                key: pool.submit(self.fetch, key, url, headers.get(key))
+                for key, url in urls.items()
+            }
+            return {key: future.result() for key, future in futures.items()}
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+File helpers shared by the AusCheckt Is build scripts
+"""
+
+import os
+import tempfile
+from typing import Union
+
+
+def write_atomic(path: str, data: Union[str, bytes]):
+    """Write a file via temp file + rename so readers never see a truncated file"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+German date and opening hours extractor for AusCheckt Is
+All patterns are precompiled into one combined scanner that walks the page
+text once and returns typed date range, weekday, time window and exclusion
+records, e.g. for "1.5.-30.8. Fr–So ab 16 Uhr, außer an Feiertagen"
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import FrozenSet, Iterator, List, Optional, Tuple, Union
+
+MONTHS = {
+    "januar": 1,
+    "jänner": 1,
+    "jän": 1,
+    "jan": 1,
+    "februar": 2,
+    "feber": 2,
+    "feb": 2,
+    "märz": 3,
+    "maerz": 3,
+    "mär": 3,
+    "april": 4,
+    "apr": 4,
+    "mai": 5,
+    "juni": 6,
+    "jun": 6,
+    "juli": 7,
+    "jul": 7,
+    "august": 8,
+    "aug": 8,
+    "september": 9,
+    "sept": 9,
+    "sep": 9,
+    "oktober": 10,
+    "okt": 10,
+    "november": 11,
+    "nov": 11,
+    "dezember": 12,
+    "dez": 12,
+}
+
+WEEKDAYS = {
+    "montag": 0,
+    "dienstag": 1,
+    "mittwoch": 2,
+    "donnerstag": 3,
+    "freitag": 4,
+    "samstag": 5,
+    "sonnabend": 5,
+    "sonntag": 6,
+}
+WEEKDAY_ABBREVIATIONS = {"Mo": 0, "Di": 1, "Mi": 2, "Do": 3, "Fr": 4, "Sa": 5, "So": 6}
+WORKDAYS = {"wochentag": range(0, 5), "werktag": range(0, 6)}
+
+# Austrian public holidays: fixed (month, day) and days after Easter Sunday
+FIXED_HOLIDAYS = [
+    (1, 1),
+    (1, 6),
+    (5, 1),
+    (8, 15),
+    (10, 26),
+    (11, 1),
+    (12, 8),
+    (12, 25),
+    (12, 26),
+]
+# Easter Sunday and Monday, Ascension, Whit Sunday and Monday, Corpus Christi
+EASTER_HOLIDAYS = [0, 1, 39, 49, 50, 60]
+
+
+def easter_sunday(year: int) -> date:
+    """Easter Sunday of the Gregorian calendar (anonymous Gregorian algorithm)"""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    g = (8 * b + 13) // 25
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 19 * l) // 433
+    month, day = divmod(h + l - 7 * m + 90, 25)
+    return date(year, month, (h + l - 7 * m + 33 * month + 19) % 32)
+
+
+@lru_cache(maxsize=None)
+def public_holidays(year: int) -> FrozenSet[date]:
+    """Austrian public holidays of a year"""
+    easter = easter_sunday(year)
+    return frozenset(
+        [date(year, month, day) for month, day in FIXED_HOLIDAYS]
+        + [easter + timedelta(days=offset) for offset in EASTER_HOLIDAYS]
+    )
+
+
+def is_public_holiday(day: date) -> bool:
+    return day in public_holidays(day.year)
+
+
+@dataclass(frozen=True)
+class DateRange:
+    start: date
+    end: date
+    span: Tuple[int, int] = (0, 0)
+
+
+@dataclass(frozen=True)
+class WeekdaySet:
+    weekdays: FrozenSet[int]
+    holidays: bool = False
+    span: Tuple[int, int] = (0, 0)
+
+
+@dataclass(frozen=True)
+class TimeWindow:
+    start: time
+    end: Optional[time] = None  # None for open-ended "ab 16 Uhr"
+    span: Tuple[int, int] = (0, 0)
+
+
+@dataclass(frozen=True)
+class Exclusion:
+    weekdays: FrozenSet[int] = frozenset()
+    dates: Tuple[DateRange, ...] = ()
+    holidays: bool = False
+    span: Tuple[int, int] = (0, 0)
+
+
+Record = Union[DateRange, WeekdaySet, TimeWindow, Exclusion]
+
+
+@dataclass(frozen=True)
+class OpeningRule:
+    window: TimeWindow
+    weekdays: Optional[WeekdaySet] = None
+    dates: Optional[DateRange] = None
+    exclusions: Tuple[Exclusion, ...] = ()
+
+
+# Building blocks (longest alternatives first so "Juni" wins over "Jun")
+_NOT_LETTER = r"(?![a-zäöüß])"
+_MONTH = (
+    "(?:"
+    + "|".join(sorted(MONTHS, key=len, reverse=True))
+    + r")\.?"
+    + _NOT_LETTER
+)
+_YEAR = r"(?:19|20)\d{2}(?!\d)"
+_DASH = r"\s*(?:-|–|—|bis(?:\s+zum)?|bis\s+inkl\.?)\s*"
+_WEEKDAY = (
+    r"(?<![a-zäöüß])(?:"
+    + "|".join(f"{name}s?" for name in sorted(WEEKDAYS, key=len, reverse=True))
+    + "|(?-i:"
+    + "|".join(WEEKDAY_ABBREVIATIONS)
+    + "|"
+    + "|".join(name.upper() for name in WEEKDAY_ABBREVIATIONS)
+    + r")\.?)"
+    + _NOT_LETTER
+)
+_WORKDAY = r"(?<![a-zäöüß])(?:" + "|".join(WORKDAYS) + r")(?:e|s)?" + _NOT_LETTER
+_HOLIDAY = r"(?:Sonn-\s*und\s*)?Feiertag(?:e|en|s)?" + _NOT_LETTER
+_DAY_TOKEN = f"(?:{_HOLIDAY}|{_WORKDAY}|{_WEEKDAY})"
+_DAY_SEPARATOR = r"\s*(?:,|und|u\.|&|\+|/|-|–|bis)\s*"
+_WEEKDAY_LIST = f"{_DAY_TOKEN}(?:{_DAY_SEPARATOR}{_DAY_TOKEN})*"
+_HOUR = r"(?<![\d.:])\d{1,2}"
+_DATE_TARGET = (
+    rf"\d{{1,2}}\.(?:\d{{1,2}}\.)?(?:{_DASH}\d{{1,2}}\.(?:\d{{1,2}}\.)?)?"
+    rf"(?:\s*{_MONTH})?(?:\s+{_YEAR})?"
+)
+
+# One alternative per record shape; earlier alternatives win at the same position
+_PATTERNS = [
+    (
+        "exclusion",
+        r"(?:außer|ausser|ausgenommen|nicht\s+(?:an|am))\s+(?:an\s+|am\s+|den\s+)?"
+        rf"(?P<ex_target>{_WEEKDAY_LIST}|{_DATE_TARGET})",
+    ),
+    (
+        "holidays_off",
+        r"(?:Betriebs)?urlaube?\s*:?\s*(?:von\s+)?"
+        rf"(?P<ho_target>{_DATE_TARGET}(?:\s*(?:,|und|&)\s*{_DATE_TARGET})*)",
+    ),
+    ("closed_holidays", r"(?:an\s+)?Feiertag(?:en)?\s+geschlossen"),
+    (
+        "rest_day",
+        rf"(?P<rd_before>{_WEEKDAY_LIST})\s+(?:ist\s+|sind\s+)?Ruhetage?"
+        rf"|Ruhetage?\s*:?\s*(?P<rd_after>{_WEEKDAY_LIST})",
+    ),
+    (
+        "month_range",
+        rf"(?<![\d.])(?P<mr_d1>\d{{1,2}})\.\s*(?P<mr_mo1>{_MONTH})(?:\s+(?P<mr_y1>{_YEAR}))?"
+        rf"{_DASH}(?P<mr_d2>\d{{1,2}})\.\s*(?P<mr_mo2>{_MONTH})(?:\s+(?P<mr_y2>{_YEAR}))?",
+    ),
+    (
+        "day_range",
+        rf"(?<![\d.])(?P<dr_d1>\d{{1,2}})\.?{_DASH}(?P<dr_d2>\d{{1,2}})\.\s*"
+        rf"(?P<dr_mo>{_MONTH})(?:\s+(?P<dr_y>{_YEAR}))?",
+    ),
+    (
+        "numeric_range",
+        rf"(?<![\d.])(?P<nr_d1>\d{{1,2}})\.(?P<nr_m1>\d{{1,2}})\.(?P<nr_y1>{_YEAR})?"
+        rf"{_DASH}(?P<nr_d2>\d{{1,2}})\.(?P<nr_m2>\d{{1,2}})(?:\.(?P<nr_y2>{_YEAR})?)?(?!\d)",
+    ),
+    (
+        "month_date",
+        rf"(?<![\d.])(?P<md_d>\d{{1,2}})\.\s*(?P<md_mo>{_MONTH})(?:\s+(?P<md_y>{_YEAR}))?",
+    ),
+    (
+        "closed_date",
+        rf"(?<![\d.])(?P<cd_d>\d{{1,2}})\.(?P<cd_m>\d{{1,2}})\.(?P<cd_y>{_YEAR})?"
+        r"\s*(?:geschl\.|geschlossen)",
+    ),
+    (
+        "numeric_date",
+        rf"(?<![\d.])(?P<nd_d>\d{{1,2}})\.(?P<nd_m>\d{{1,2}})\.(?P<nd_y>{_YEAR})?",
+    ),
+    (
+        "time_range",
+        rf"(?:von\s+|ab\s+)?(?P<tr_h1>{_HOUR})(?::(?P<tr_m1>\d{{2}})|\.(?P<tr_n1>\d{{2}}))?(?!\d)\s*(?:Uhr)?"
+        rf"{_DASH}(?P<tr_h2>\d{{1,2}})(?:[:.](?P<tr_m2>\d{{2}}))?(?!\d)\s*(?P<tr_uhr>Uhr)?",
+    ),
+    (
+        "time_from",
+        r"(?<![a-zäöüß])ab\s+(?P<tf_h>\d{1,2})(?:[:.](?P<tf_m>\d{2})(?!\d)(?:\s*Uhr)?|\s*Uhr)",
+    ),
+    # A bare clock time after weekdays, e.g. "FR+SA: 15:00"
+    ("time_at", rf"(?P<ta_h>{_HOUR}):(?P<ta_m>\d{{2}})(?!\d)(?:\s*Uhr)?"),
+    ("weekdays", _WEEKDAY_LIST),
+]
+
+SCANNER = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in _PATTERNS), re.IGNORECASE
+)
+_DAY_TOKEN_RE = re.compile(
+    f"(?P<holiday>{_HOLIDAY})|(?P<workday>{_WORKDAY})|(?P<weekday>{_WEEKDAY})",
+    re.IGNORECASE,
+)
+# Text no record was made of that still names a number, month or day
+_LEFTOVER_RE = re.compile(rf"\d|(?<![a-zäöüß]){_MONTH}|{_DAY_TOKEN}", re.IGNORECASE)
+
+
+def _month(name: str) -> int:
+    return MONTHS[name.lower().rstrip(".")]
+
+
+def _year(value: Optional[str], default: int) -> int:
+    return int(value) if value else default
+
+
+def _date_range(
+    first: date, last: date, span: Tuple[int, int], explicit_end_year: bool
+) -> DateRange:
+    # "1.11.-28.2." without a year runs into the next year
+    if last < first and not explicit_end_year:
+        last = last.replace(year=last.year + 1)
+    return DateRange(first, last, span)
+
+
+def _weekday_set(text: str) -> Tuple[FrozenSet[int], bool]:
+    """Weekdays and holiday flag of a matched weekday list like "Fr–So" or "Sa, So und Feiertag" """
+    weekdays = set()
+    holidays = False
+    previous = None
+    position = 0
+    for token in _DAY_TOKEN_RE.finditer(text):
+        separator = text[position : token.start()]
+        position = token.end()
+
+        if token.group("holiday"):
+            holidays = True
+            if token.group("holiday").lower().startswith("sonn"):
+                weekdays.add(6)
+            previous = None
+            continue
+
+        if token.group("workday"):
+            weekdays.update(WORKDAYS[token.group("workday").lower().rstrip("es")])
+            previous = None
+            continue
+
+        raw = token.group("weekday").rstrip(".")
+        name = raw.lower()
+        # "So", "SO", "Sonntag" or plural "Sonntags"
+        day = WEEKDAY_ABBREVIATIONS.get(
+            raw.capitalize(), WEEKDAYS.get(name, WEEKDAYS.get(name[:-1]))
+        )
+
+        if previous is not None and re.search(r"-|–|bis", separator):
+            current = previous
+            while current != day:
+                current = (current + 1) % 7
+                weekdays.add(current)
+        weekdays.add(day)
+        previous = day
+
+    return frozenset(weekdays), holidays
+
+
+def _clock(hour: str, minute: Optional[str]) -> Optional[time]:
+    h = int(hour)
+    m = int(minute) if minute else 0
+    if h == 24 and m == 0:
+        return time(0, 0)
+    if h > 23 or m > 59:
+        return None
+    return time(h, m)
+
+
+def _record(match: re.Match, default_year: int) -> Optional[Record]:
+    kind = match.lastgroup
+    g = match.group
+    span = match.span()
+
+    if kind == "weekdays":
+        weekdays, holidays = _weekday_set(g(kind))
+        return WeekdaySet(weekdays, holidays, span)
+
+    if kind == "time_range":
+        # Without "Uhr" only clock times like 16:00-22:00 count, not "16-22" or "16.30-22"
+        if not g("tr_uhr") and not (g("tr_m1") and g("tr_m2")):
+            return None
+        start = _clock(g("tr_h1"), g("tr_m1") or g("tr_n1"))
+        end = _clock(g("tr_h2"), g("tr_m2"))
+        return TimeWindow(start, end, span) if start and end else None
+
+    if kind == "time_from":
+        start = _clock(g("tf_h"), g("tf_m"))
+        return TimeWindow(start, None, span) if start else None
+
+    if kind == "time_at":
+        start = _clock(g("ta_h"), g("ta_m"))
+        return TimeWindow(start, None, span) if start else None
+
+    if kind == "closed_holidays":
+        return Exclusion(holidays=True, span=span)
+
+    if kind == "rest_day":
+        weekdays, holidays = _weekday_set(g("rd_before") or g("rd_after"))
+        return Exclusion(weekdays=weekdays, holidays=holidays, span=span)
+
+    if kind in ("exclusion", "holidays_off"):
+        target = g("ex_target") or g("ho_target")
+        dates = []
+        weekdays = set()
+        holidays = False
+        for record in extract(target, default_year):
+            if isinstance(record, DateRange):
+                dates.append(record)
+            elif isinstance(record, WeekdaySet):
+                weekdays |= record.weekdays
+                holidays = holidays or record.holidays
+        return Exclusion(frozenset(weekdays), tuple(dates), holidays, span)
+
+    try:
+        if kind == "month_range":
+            year2 = _year(g("mr_y2"), default_year)
+            first = date(_year(g("mr_y1"), year2), _month(g("mr_mo1")), int(g("mr_d1")))
+            last = date(year2, _month(g("mr_mo2")), int(g("mr_d2")))
+            return _date_range(first, last, span, bool(g("mr_y1")))
+
+        if kind == "day_range":
+            year = _year(g("dr_y"), default_year)
+            month = _month(g("dr_mo"))
+            first = date(year, month, int(g("dr_d1")))
+            last = date(year, month, int(g("dr_d2")))
+            return DateRange(first, last, span) if first <= last else None
+
+        if kind == "numeric_range":
+            year2 = _year(g("nr_y2"), default_year)
+            first = date(_year(g("nr_y1"), year2), int(g("nr_m1")), int(g("nr_d1")))
+            last = date(year2, int(g("nr_m2")), int(g("nr_d2")))
+            return _date_range(first, last, span, bool(g("nr_y1")))
+
+        if kind == "month_date":
+            day = date(_year(g("md_y"), default_year), _month(g("md_mo")), int(g("md_d")))
+            return DateRange(day, day, span)
+
+        if kind == "closed_date":
+            day = date(_year(g("cd_y"), default_year), int(g("cd_m")), int(g("cd_d")))
+            return Exclusion(dates=(DateRange(day, day, span),), span=span)
+
+        if kind == "numeric_date":
+            day = date(_year(g("nd_y"), default_year), int(g("nd_m")), int(g("nd_d")))
+            return DateRange(day, day, span)
+    except ValueError:
+        return None
+
+    return None
+
+
+def iter_records(text: str, default_year: Optional[int] = None) -> Iterator[Record]:
+    """Scan text once, yielding records in text order"""
+    if default_year is None:
+        default_year = datetime.now().year
+    for match in SCANNER.finditer(text):
+        record = _record(match, default_year)
+        if record is not None:
+            yield record
+
+
+def extract(text: str, default_year: Optional[int] = None) -> List[Record]:
+    return list(iter_records(text, default_year))
+
+
+def unresolved(text: str, records: List[Record]) -> List[str]:
+    """Parts of the text between the records that still mention numbers, months or days
+
+    "ab 2. Samstag 16 Tage lang" or "Ende April" leave such parts behind; a
+    text without them is fully described by its records.
+    """
+    parts = []
+    position = 0
+    for record in records:
+        parts.append(text[position : record.span[0]])
+        position = max(position, record.span[1])
+    parts.append(text[position:])
+    return [part.strip() for part in parts if _LEFTOVER_RE.search(part)]
+
+
+def opening_rules(records: List[Record]) -> List[OpeningRule]:
+    """Pair each time window with the weekdays and date range mentioned before it
+
+    "1.5.-30.8. Fr–So ab 16 Uhr, Sa 12-22 Uhr" gives two rules; a date range
+    stays in effect until the next one, weekdays only for the next window.
+    Date ranges that only follow the windows ("FR+SA: 15:00 im Zeitraum von
+    28.4.-19.10.") apply to every window without a range of its own.
+    """
+    rules = []
+    exclusions = tuple(r for r in records if isinstance(r, Exclusion))
+    dates = None
+    weekdays = None
+    trailing_dates = []
+    for record in records:
+        if isinstance(record, DateRange):
+            dates = record
+            if rules:
+                trailing_dates.append(record)
+        elif isinstance(record, WeekdaySet):
+            if weekdays is None:
+                weekdays = record
+            else:
+                weekdays = WeekdaySet(
+                    weekdays.weekdays | record.weekdays,
+                    weekdays.holidays or record.holidays,
+                    (weekdays.span[0], record.span[1]),
+                )
+        elif isinstance(record, TimeWindow):
+            rules.append(OpeningRule(record, weekdays, dates, exclusions))
+            weekdays = None
+            trailing_dates = []
+
+    if not trailing_dates:
+        return rules
+    return [
+        OpeningRule(rule.window, rule.weekdays, trailing, rule.exclusions)
+        if rule.dates is None
+        else rule
+        for rule in rules
+        for trailing in (trailing_dates if rule.dates is None else [None])
+    ]
+
+
+def expand_rule(
+    rule: OpeningRule,
+    first: date,
+    last: date,
+    default_end: time = time(22, 0),
+) -> Iterator[Tuple[datetime, datetime]]:
+    """Concrete (start, end) intervals of a rule within [first, last]
+
+    A rule that names holidays ("Sa, So und Feiertag") also opens on public
+    holidays that fall on other weekdays; exclusions win over both.
+    """
+    if rule.dates:
+        first = max(first, rule.dates.start)
+        last = min(last, rule.dates.end)
+
+    excluded_days = set()
+    excluded_weekdays = set()
+    excluded_holidays = False
+    for exclusion in rule.exclusions:
+        excluded_weekdays |= exclusion.weekdays
+        excluded_holidays = excluded_holidays or exclusion.holidays
+        for excluded in exclusion.dates:
+            day = excluded.start
+            while day <= excluded.end:
+                excluded_days.add(day)
+                day += timedelta(days=1)
+
+    opens_on_holidays = rule.weekdays is not None and rule.weekdays.holidays
+    day = first
+    while day <= last:
+        holiday = (opens_on_holidays or excluded_holidays) and is_public_holiday(day)
+        if (
+            (
+                rule.weekdays is None
+                or day.weekday() in rule.weekdays.weekdays
+                or (opens_on_holidays and holiday)
+            )
+            and day.weekday() not in excluded_weekdays
+            and day not in excluded_days
+            and not (excluded_holidays and holiday)
+        ):
+            start = datetime.combine(day, rule.window.start)
+            end = datetime.combine(day, rule.window.end or default_end)
+            if end <= start:
+                end += timedelta(days=1)
+            yield start, end
+        day += timedelta(days=1)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+iCalendar feeds for AusCheckt Is
+Writes generated/ical/<venue>.ics and ical/all.ics for calendar
+subscriptions. Events are streamed from the loader into the file; UID and
+DTSTAMP only depend on the event, so a feed whose events did not change is
+byte-identical to the last one and is not replaced
+"""
+
+import hashlib
+import os
+import tempfile
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Tuple
+
+from build_manifest import BuildManifest
+from event_model import Event
+
+DOMAIN = "auschecktis.at"
+TIMEZONE = "Europe/Vienna"
+
+# Floating times in data/*.json are Vienna wall-clock times
+VTIMEZONE = [
+    "BEGIN:VTIMEZONE",
+    f"TZID:{TIMEZONE}",
+    "BEGIN:DAYLIGHT",
+    "TZOFFSETFROM:+0100",
+    "TZOFFSETTO:+0200",
+    "TZNAME:CEST",
+    "DTSTART:19700329T020000",
+    "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=-1SU",
+    "END:DAYLIGHT",
+    "BEGIN:STANDARD",
+    "TZOFFSETFROM:+0200",
+    "TZOFFSETTO:+0100",
+    "TZNAME:CET",
+    "DTSTART:19701025T030000",
+    "RRULE:FREQ=YEARLY;BYMONTH=10;BYDAY=-1SU",
+    "END:STANDARD",
+    "END:VTIMEZONE",
+]
+
+
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> bytes:
+    """Encode a content line, folded at 75 octets without splitting a character"""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return data + b"\r\n"
+    parts = []
+    limit = 75
+    while data:
+        cut = min(limit, len(data))
+        # Back off to the start of a UTF-8 sequence
+        while cut < len(data) and data[cut] & 0xC0 == 0x80:
+            cut -= 1
+        parts.append(data[:cut])
+        data = data[cut:]
+        limit = 74
+    return b"\r\n ".join(parts) + b"\r\n"
+
+
+def format_time(name: str, moment: datetime) -> str:
+    """DTSTART/DTEND line; floating times in Vienna time, others in UTC"""
+    if moment.tzinfo is None:
+        return f"{name};TZID={TIMEZONE}:{moment.strftime('%Y%m%dT%H%M%S')}"
+    return f"{name}:{moment.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}"
+
+
+def event_uid(event: Event) -> str:
+    """Stable across builds and edits of the closing time: venue and opening"""
+    start = event.start_iso.replace("-", "").replace(":", "")
+    return f"{event.venue.key}-{start}@{DOMAIN}"
+
+
+def event_lines(event: Event) -> Iterator[str]:
+    venue = event.venue
+    # Derived from the event instead of the build time, so output is stable
+    stamp = event.first_day.strftime("%Y%m%d")
+    yield "BEGIN:VEVENT"
+    yield f"UID:{event_uid(event)}"
+    yield f"DTSTAMP:{stamp}T000000Z"
+    yield format_time("DTSTART", event.start)
+    # Without end open until midnight, the same day CalendarIndex assigns it to
+    yield format_time("DTEND", event.end or event.interval()[1])
+    yield f"SUMMARY:{escape_text(venue.title)} - Ausg'steckt"
+    if venue.url:
+        yield f"URL:{venue.url}"
+    if venue.position is not None:
+        yield f"GEO:{venue.lat};{venue.lng}"
+    if venue.map_link:
+        yield f"DESCRIPTION:{escape_text('Google Maps: ' + venue.map_link)}"
+    yield "END:VEVENT"
+
+
+def write_feed(
+    output_dir: str,
+    page: str,
+    name: str,
+    events: Iterable[Event],
+    manifest: BuildManifest,
+) -> Tuple[int, bool]:
+    """Stream events into output_dir/page; returns (event count, written)
+
+    The feed goes to a temp file while it is hashed and only replaces the
+    existing one if the bytes differ from the last build.
+    """
+    path = os.path.join(output_dir, page)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    digest = hashlib.sha256()
+    count = 0
+
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+
+            def emit(line: str):
+                data = fold(line)
+                digest.update(data)
+                f.write(data)
+
+            for line in [
+                "BEGIN:VCALENDAR",
+                "VERSION:2.0",
+                f"PRODID:-//{DOMAIN}//AusCheckt Is//DE",
+                "CALSCALE:GREGORIAN",
+                "METHOD:PUBLISH",
+                f"X-WR-CALNAME:{escape_text(name)}",
+                f"X-WR-TIMEZONE:{TIMEZONE}",
+                "REFRESH-INTERVAL;VALUE=DURATION:PT12H",
+            ] + VTIMEZONE:
+                emit(line)
+            for event in events:
+                for line in event_lines(event):
+                    emit(line)
+                count += 1
+            emit("END:VCALENDAR")
+
+        if manifest.is_current(page, digest.hexdigest()):
+            os.remove(tmp_path)
+            return count, False
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    manifest.record(page, digest.hexdigest())
+    return count, True
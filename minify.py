@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Output minification for AusCheckt Is
+Conservative whitespace and comment removal for the page templates: markup
+keeps one line break where it had indentation, inline scripts lose
+indentation, blank lines and comment lines (never joined, so automatic
+semicolon insertion is unaffected), stylesheets keep strings, url() and the
+spaces selectors depend on, and JSON is re-serialized compactly.
+{{slot}} placeholders pass through untouched
+"""
+
+import json
+import re
+
+_RAW_BLOCK_RE = re.compile(
+    r"(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2>)", re.S | re.I
+)
+_COMMENT_RE = re.compile(r"<!--(?!\[if).*?-->", re.S)
+_LINE_BREAK_RE = re.compile(r"[ \t]*\n\s*")
+# Strings, unquoted url() and comments, which the CSS whitespace rules must not touch
+_CSS_LITERAL_RE = re.compile(
+    r""""(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|url\(\s*[^"'\s)][^)]*\)|/\*.*?\*/""",
+    re.S | re.I,
+)
+_CSS_PLACEHOLDER_RE = re.compile(r"\x00(\d+)\x00")
+_CSS_SPACE_RE = re.compile(r"\s*([{};,>])\s*")
+# Innermost blocks hold declarations; in selectors "a :hover" differs from "a:hover"
+_CSS_DECLARATIONS_RE = re.compile(r"\{[^{}]*\}")
+_CSS_COLON_RE = re.compile(r"\s*:\s*")
+
+
+def minify_js(source: str) -> str:
+    lines = (line.strip() for line in source.split("\n"))
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+def minify_css(source: str) -> str:
+    literals = []
+
+    def stash(match: re.Match) -> str:
+        if match.group(0).startswith("/*"):
+            return " "
+        literals.append(match.group(0))
+        return f"\x00{len(literals) - 1}\x00"
+
+    source = _CSS_LITERAL_RE.sub(stash, source)
+    source = _CSS_SPACE_RE.sub(r"\1", " ".join(source.split()))
+    source = _CSS_DECLARATIONS_RE.sub(
+        lambda match: _CSS_COLON_RE.sub(":", match.group(0)), source
+    )
+    source = source.replace(";}", "}")
+    return _CSS_PLACEHOLDER_RE.sub(lambda match: literals[int(match.group(1))], source)
+
+
+def minify_json(source: str) -> str:
+    """Compact JSON; templates with slots are not valid JSON and only lose indentation"""
+    try:
+        value = json.loads(source)
+    except ValueError:
+        return minify_js(source)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _minify_markup(source: str) -> str:
+    return _LINE_BREAK_RE.sub("\n", _COMMENT_RE.sub("", source))
+
+
+def minify_html(source: str) -> str:
+    parts = []
+    position = 0
+    for match in _RAW_BLOCK_RE.finditer(source):
+        open_tag, tag, body, close_tag = match.groups()
+        tag = tag.lower()
+        if tag == "script":
+            body = minify_json(body) if "json" in open_tag else minify_js(body)
+        elif tag == "style":
+            body = minify_css(body)
+        parts.append(_minify_markup(source[position : match.start()]))
+        parts.append(open_tag + body + close_tag)
+        position = match.end()
+    parts.append(_minify_markup(source[position:]))
+    return "".join(parts).strip()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Event normalization for AusCheckt Is
+Runs right after loading: data files named after an alias (old exports
+listed under "aliases" in input/heurigen_list.json) are filed under their
+canonical venue, and each venue's events are swept once in start order,
+merging duplicate and overlapping openings. What was collapsed is counted
+per venue so the build report shows it
+"""
+
+from collections import Counter
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Iterator
+
+
+def alias_map(heurigen_master: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+    """Alias key -> canonical venue key"""
+    return {
+        alias: key
+        for key, data in heurigen_master.items()
+        for alias in data.get("aliases", [])
+    }
+
+
+def covered_end(event: Dict[str, Any]) -> str:
+    """End of an opening as a comparable string; without end it lasts until midnight"""
+    end = event.get("end")
+    if not end:
+        next_day = date.fromisoformat(event["start"][:10]) + timedelta(days=1)
+        end = f"{next_day.isoformat()}T00:00:00{event['start'][19:]}"
+    return max(end, event["start"])
+
+
+class NormalizationStats:
+    def __init__(self):
+        # Events read from alias files, by alias key
+        self.aliased: Counter = Counter()
+        # Same start and end as the opening before
+        self.duplicates: Counter = Counter()
+        # Starting before the opening before had ended
+        self.overlaps: Counter = Counter()
+
+    @property
+    def collapsed(self) -> int:
+        return sum(self.duplicates.values()) + sum(self.overlaps.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "aliased": dict(sorted(self.aliased.items())),
+            "duplicates": dict(sorted(self.duplicates.items())),
+            "overlaps": dict(sorted(self.overlaps.items())),
+        }
+
+    def summary(self) -> str:
+        parts = [
+            f"{sum(self.duplicates.values())} duplicate",
+            f"{sum(self.overlaps.values())} overlapping",
+        ]
+        text = f"Merged {' and '.join(parts)} events"
+        if self.aliased:
+            text += f", {sum(self.aliased.values())} filed under a canonical venue"
+        return text
+
+
+def merge_overlapping(
+    events: Iterable[Dict[str, Any]], key: str, stats: NormalizationStats
+) -> Iterator[Dict[str, Any]]:
+    """One venue's events in start order with duplicates and overlaps merged
+
+    A merged opening keeps the fields of the first one, takes missing fields
+    from the others and lasts until the latest end. Events have to be sorted
+    by start: one that starts before the opening before it would be merged
+    into it (EventStream sorts data files that are out of order).
+    """
+    pending = None
+    pending_end = ""
+    copied = False
+    for event in events:
+        if pending is not None and (
+            event["start"] == pending["start"] or event["start"] < pending_end
+        ):
+            end = covered_end(event)
+            if event["start"] == pending["start"] and end == pending_end:
+                stats.duplicates[key] += 1
+            else:
+                stats.overlaps[key] += 1
+            if not copied:
+                pending = dict(pending)
+                copied = True
+            for field, value in event.items():
+                pending.setdefault(field, value)
+            if end > pending_end:
+                pending["end"] = event.get("end") or end
+                pending_end = end
+            continue
+
+        if pending is not None:
+            yield pending
+        pending = event
+        pending_end = covered_end(event)
+        copied = False
+
+    if pending is not None:
+        yield pending
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+PDF calendar ingestion for AusCheckt Is
+Extracts the text of venue flyers page by page, feeds it to the German date
+extractor and expands the opening rules into events. Results are cached by
+PDF content hash, so unchanged PDFs are not parsed again. Flyers that only
+mark their open days graphically in month grids are refused, since their
+text layer holds nothing but the general opening hours
+"""
+
+import copy
+import hashlib
+import io
+import json
+import os
+import re
+from collections import Counter
+from datetime import date, time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import german_dates
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # only needed when a PDF actually has to be parsed
+    PdfReader = None
+
+YEAR_RE = re.compile(r"(?<!\d)(20\d{2})(?!\d)")
+# Weekday header of a printed month grid ("M D M D F S S")
+GRID_HEADER_RE = re.compile(r"^\s*M\s+D\s+M\s+D\s+F\s+S\s+S\s*$", re.MULTILINE)
+
+
+class UnmarkedCalendarError(ValueError):
+    """The open days are only marked in month grids (colour), not in the text"""
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def iter_page_text(content: bytes) -> Iterator[str]:
+    """Text of each PDF page, extracted only when the page is reached"""
+    if PdfReader is None:
+        raise RuntimeError("pypdf is not installed (pip install pypdf)")
+    reader = PdfReader(io.BytesIO(content))
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+
+def extract_rules(
+    pages: Iterable[str], default_year: int
+) -> Tuple[int, List[german_dates.OpeningRule]]:
+    """Calendar year and opening rules of a flyer
+
+    The year is the most frequent one on the first page that mentions a
+    year; dates without a year on later pages belong to it.
+    """
+    year = None
+    records = []
+    for text in pages:
+        if year is None:
+            years = Counter(YEAR_RE.findall(text))
+            if years:
+                year = int(years.most_common(1)[0][0])
+        records.extend(german_dates.iter_records(text, year or default_year))
+    year = year or default_year
+    return year, german_dates.opening_rules(records)
+
+
+def rules_to_events(
+    rules: List[german_dates.OpeningRule],
+    year: int,
+    heurigen_data: Dict[str, Any],
+    default_end: time = time(23, 59),
+) -> List[Dict[str, Any]]:
+    """One event per opening day of the calendar year, in data/*.json format"""
+    # Flyers rarely state a closing time, the hand-made data/*.json use 23:59
+    openings = {}
+    for rule in rules:
+        for start, end in german_dates.expand_rule(
+            rule, date(year, 1, 1), date(year, 12, 31), default_end
+        ):
+            day = start.date()
+            if day not in openings or start < openings[day][0]:
+                openings[day] = (start, end)
+
+    return [
+        {
+            "title": heurigen_data["label"],
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "url": heurigen_data["website"],
+            "mapLink": heurigen_data["location"],
+            "lat": heurigen_data["lat"],
+            "lng": heurigen_data["lng"],
+        }
+        for start, end in sorted(openings.values())
+    ]
+
+
+def events_from_pages(
+    pages: Iterable[str], heurigen_data: Dict[str, Any], default_year: int
+) -> List[Dict[str, Any]]:
+    """Events of a flyer's page texts
+
+    Raises UnmarkedCalendarError for month grids without any dated opening:
+    the rules found are then general opening hours, and expanding them over
+    the whole year would invent openings the venue never announced.
+    """
+    grids = 0
+
+    def counted(pages: Iterable[str]) -> Iterator[str]:
+        nonlocal grids
+        for text in pages:
+            grids += len(GRID_HEADER_RE.findall(text))
+            yield text
+
+    year, rules = extract_rules(counted(pages), default_year)
+    if grids and not any(rule.dates for rule in rules):
+        raise UnmarkedCalendarError(
+            f"{grids} month grids but no dated openings in the text, "
+            "the open days are only marked graphically"
+        )
+    return rules_to_events(rules, year, heurigen_data)
+
+
+def events_from_pdf(
+    content: bytes, heurigen_data: Dict[str, Any], default_year: int
+) -> List[Dict[str, Any]]:
+    return events_from_pages(iter_page_text(content), heurigen_data, default_year)
+
+
+class PdfCalendarCache:
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except Exception as e:
+                print(f"⚠️  Warning: Ignoring unreadable PDF calendar cache: {e}")
+
+    def cached_events(
+        self, heurigen_key: str, digest: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Events extracted from exactly this PDF content, if any"""
+        entry = self.entries.get(heurigen_key)
+        if not entry or entry["sha256"] != digest or "events" not in entry:
+            return None
+        return copy.deepcopy(entry["events"])
+
+    def cached_refusal(self, heurigen_key: str, digest: str) -> Optional[str]:
+        """Why exactly this PDF content was refused before, if it was"""
+        entry = self.entries.get(heurigen_key)
+        if not entry or entry["sha256"] != digest:
+            return None
+        return entry.get("refused")
+
+    def store_events(
+        self,
+        heurigen_key: str,
+        source: str,
+        digest: str,
+        events: List[Dict[str, Any]],
+    ):
+        self.entries[heurigen_key] = {
+            "source": source,
+            "sha256": digest,
+            "events": copy.deepcopy(events),
+        }
+
+    def store_refusal(self, heurigen_key: str, source: str, digest: str, reason: str):
+        self.entries[heurigen_key] = {
+            "source": source,
+            "sha256": digest,
+            "refused": reason,
+        }
+
+    def prune(self, heurigen_keys: Iterable[str]) -> List[str]:
+        """Evict venues that no longer have a PDF calendar"""
+        wanted = set(heurigen_keys)
+        evicted = [key for key in self.entries if key not in wanted]
+        for key in evicted:
+            del self.entries[key]
+        return evicted
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, ensure_ascii=False, sort_keys=True)
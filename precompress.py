@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Precompressed output for AusCheckt Is
+Writes a .gz (and a .br, if the brotli package is installed) next to every
+text file in generated/, so a static host or nginx with gzip_static and
+brotli_static serves compressed bytes without compressing per request.
+A file is only recompressed when its bytes changed since the last build
+"""
+
+import gzip
+import hashlib
+import os
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from build_manifest import BuildManifest
+from fileutils import write_atomic
+from regions import SUMMARY_FILENAME
+
+try:
+    import brotli
+except ImportError:  # .gz only; nginx falls back to gzip_static
+    brotli = None
+
+TEXT_EXTENSIONS = (
+    ".html",
+    ".xml",
+    ".css",
+    ".js",
+    ".json",
+    ".webmanifest",
+    ".svg",
+    ".txt",
+    ".ics",
+)
+# Build bookkeeping, not served
+SKIP_FILES = {
+    BuildManifest.FILENAME,
+    "build_report.json",
+    "build_report_shared.json",
+    SUMMARY_FILENAME,
+}
+
+
+def suffixes() -> List[str]:
+    return [".gz", ".br"] if brotli is not None else [".gz"]
+
+
+def compress(data: bytes) -> Dict[str, bytes]:
+    """All compressed variants by file suffix; gzip without timestamp so output is stable"""
+    variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(data, quality=11)
+    return variants
+
+
+def iter_text_files(
+    output_dir: str, owns: Optional[Callable[[str], bool]] = None
+) -> Iterator[str]:
+    """Paths relative to output_dir of every file that gets compressed variants
+
+    owns(path) limits the walk to the files of one build when several builds
+    (regions, shared assets) write into the same tree.
+    """
+    for root, dirs, files in os.walk(output_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename in SKIP_FILES or filename.startswith("."):
+                continue
+            if filename.endswith(TEXT_EXTENSIONS):
+                path = os.path.join(root, filename)
+                relative = os.path.relpath(path, output_dir).replace(os.sep, "/")
+                if owns is None or owns(relative):
+                    yield relative
+
+
+def precompress(
+    output_dir: str,
+    manifest: BuildManifest,
+    owns: Optional[Callable[[str], bool]] = None,
+) -> Tuple[Dict[str, Dict[str, int]], List[str]]:
+    """Compress changed text files; returns sizes per file and the variants written"""
+    sizes: Dict[str, Dict[str, int]] = {}
+    written: List[str] = []
+
+    for relative in iter_text_files(output_dir, owns):
+        path = os.path.join(output_dir, relative)
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+
+        current = manifest.compressed.get(relative) == digest and all(
+            os.path.exists(path + suffix) for suffix in suffixes()
+        )
+        if not current:
+            for suffix, payload in compress(data).items():
+                write_atomic(path + suffix, payload)
+                written.append(path + suffix)
+            manifest.compressed[relative] = digest
+
+        sizes[relative] = {"bytes": len(data)}
+        for suffix in suffixes():
+            sizes[relative][suffix[1:]] = os.path.getsize(path + suffix)
+
+    # Variants of pages that are gone (e.g. deleted day pages)
+    for relative in [name for name in manifest.compressed if name not in sizes]:
+        del manifest.compressed[relative]
+        for suffix in (".gz", ".br"):
+            stale = os.path.join(output_dir, relative + suffix)
+            if os.path.exists(stale):
+                os.remove(stale)
+
+    return sizes, written
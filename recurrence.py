@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Recurrence rules for AusCheckt Is
+A data/*.json entry with a "recurrence" object stands for a whole series of
+openings: its start/end are the first occurrence, "recurrence" names the
+weekdays, the last day and the days it does not open. Occurrences are
+expanded lazily and only for the window that is asked for, and explicit
+events can be compacted into rules and expanded back without any change
+"""
+
+import argparse
+import heapq
+import json
+import os
+from datetime import date, timedelta
+from itertools import count
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+WEEKDAYS = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"]
+
+# Fewer occurrences than this are cheaper to keep as explicit events
+MIN_OCCURRENCES = 3
+# A pause of more than a week starts a new rule instead of a run of exceptions
+MAX_GAP_DAYS = 7
+
+
+def is_rule(entry: Dict[str, Any]) -> bool:
+    return "recurrence" in entry
+
+
+def _span_days(entry: Dict[str, Any]) -> int:
+    """Days between the start and end date of one occurrence (1 when open past midnight)"""
+    if not entry.get("end"):
+        return 0
+    return (
+        date.fromisoformat(entry["end"][:10]) - date.fromisoformat(entry["start"][:10])
+    ).days
+
+
+def iter_occurrences(
+    entry: Dict[str, Any],
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Explicit events of a rule starting between since - span and until, in start order
+
+    Occurrences keep the time (and UTC offset, if any) of the first one, so
+    rules describe wall-clock opening hours.
+    """
+    recurrence = entry["recurrence"]
+    weekdays = {WEEKDAYS.index(day) for day in recurrence["weekdays"]}
+    excluded = set(recurrence.get("except", ()))
+    template = {key: value for key, value in entry.items() if key != "recurrence"}
+    start_time = entry["start"][10:]
+    end_time = entry["end"][10:] if entry.get("end") else None
+    span = timedelta(days=_span_days(entry))
+
+    first = date.fromisoformat(entry["start"][:10])
+    last = date.fromisoformat(recurrence["until"])
+    if since:
+        # An occurrence that started up to `span` days earlier may still be open
+        first = max(first, since - span)
+    if until:
+        last = min(last, until)
+
+    # Day ordinals; ordinal 1 (0001-01-01) was a Monday
+    for ordinal in range(first.toordinal(), last.toordinal() + 1):
+        if (ordinal - 1) % 7 not in weekdays:
+            continue
+        day = date.fromordinal(ordinal)
+        iso_day = day.isoformat()
+        if iso_day in excluded:
+            continue
+        event = template.copy()
+        event["start"] = iso_day + start_time
+        if end_time is not None:
+            event["end"] = (day + span).isoformat() + end_time
+        yield event
+
+
+def iter_expanded(
+    entries: Iterable[Dict[str, Any]],
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Explicit events of a data file in start order, expanding rules on the way
+
+    Entries have to be sorted by start (a rule sorts by its first
+    occurrence), so every occurrence of a pending rule that starts before
+    the next entry can be emitted first. Only the next occurrence of each
+    rule is held in memory.
+    """
+    pending: List[Tuple[str, int, Dict[str, Any], Iterator[Dict[str, Any]]]] = []
+    order = count()
+
+    def push(occurrences: Iterator[Dict[str, Any]]):
+        for event in occurrences:
+            heapq.heappush(pending, (event["start"], next(order), event, occurrences))
+            return
+
+    for entry in entries:
+        while pending and pending[0][0] <= entry["start"]:
+            _, _, event, occurrences = heapq.heappop(pending)
+            yield event
+            push(occurrences)
+
+        if is_rule(entry):
+            push(iter_occurrences(entry, since, until))
+        else:
+            yield entry
+
+    while pending:
+        _, _, event, occurrences = heapq.heappop(pending)
+        yield event
+        push(occurrences)
+
+
+def expand(entries: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Explicit events of a data file, which may be out of order, in start order"""
+    return list(iter_expanded(sorted(entries, key=lambda entry: entry["start"])))
+
+
+def _series_key(event: Dict[str, Any]) -> Tuple:
+    """Everything that has to be equal for two events to belong to one rule"""
+    fields = tuple(
+        sorted(
+            (key, json.dumps(value, sort_keys=True))
+            for key, value in event.items()
+            if key not in ("start", "end")
+        )
+    )
+    end_time = event["end"][10:] if event.get("end") else None
+    return fields, event["start"][10:], end_time, _span_days(event)
+
+
+def _regular_weekdays(days: List[date]) -> set:
+    """Weekdays open on at least half of their dates between the first and last day"""
+    possible = [0] * 7
+    day = days[0]
+    while day <= days[-1]:
+        possible[day.weekday()] += 1
+        day += timedelta(days=1)
+    opened = [0] * 7
+    for day in days:
+        opened[day.weekday()] += 1
+    return {
+        weekday for weekday in range(7) if opened[weekday] * 2 >= possible[weekday] > 0
+    }
+
+
+def _rule_from_run(run: List[Dict[str, Any]]) -> Dict[str, Any]:
+    days = [date.fromisoformat(event["start"][:10]) for event in run]
+    weekdays = sorted({day.weekday() for day in days})
+    present = set(days)
+
+    excluded = []
+    day = days[0]
+    while day <= days[-1]:
+        if day.weekday() in weekdays and day not in present:
+            excluded.append(day.isoformat())
+        day += timedelta(days=1)
+
+    rule = dict(run[0])
+    rule["recurrence"] = {
+        "weekdays": [WEEKDAYS[weekday] for weekday in weekdays],
+        "until": days[-1].isoformat(),
+    }
+    if excluded:
+        rule["recurrence"]["except"] = excluded
+    return rule
+
+
+def compact(events: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Replace series of explicit events by rules; expand() gives back the same events
+
+    Events sharing everything but the date form a series. A series is
+    split where it pauses for more than MAX_GAP_DAYS or opens twice on one
+    day. Days on weekdays the run rarely opens, and runs shorter than
+    MIN_OCCURRENCES, stay explicit.
+    """
+    events = list(events)
+    series: Dict[Tuple, List[int]] = {}
+    for index, event in enumerate(events):
+        if is_rule(event):
+            continue
+        series.setdefault(_series_key(event), []).append(index)
+
+    entries = []
+    compacted = set()
+    for indices in series.values():
+        runs = [[indices[0]]]
+        for index in indices[1:]:
+            previous = events[runs[-1][-1]]["start"][:10]
+            gap = (
+                date.fromisoformat(events[index]["start"][:10])
+                - date.fromisoformat(previous)
+            ).days
+            if 0 < gap <= MAX_GAP_DAYS:
+                runs[-1].append(index)
+            else:
+                runs.append([index])
+
+        for run in runs:
+            # Occasional extra days (holidays) stay explicit instead of
+            # turning every other week of their weekday into an exception
+            days = [date.fromisoformat(events[i]["start"][:10]) for i in run]
+            weekdays = _regular_weekdays(days)
+            members = [i for i, day in zip(run, days) if day.weekday() in weekdays]
+            if len(members) >= MIN_OCCURRENCES:
+                entries.append(
+                    (members[0], _rule_from_run([events[i] for i in members]))
+                )
+                compacted.update(members)
+
+    entries.extend(
+        (index, event) for index, event in enumerate(events) if index not in compacted
+    )
+    # Keep the file sorted by start; ties keep the original order
+    entries.sort(key=lambda item: (item[1]["start"], item[0]))
+    return [entry for _, entry in entries]
+
+
+def _rewrite(path: str, transform) -> Tuple[int, int]:
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    result = transform(entries)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    return len(entries), len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compact data/*.json files into recurrence rules or expand them back"
+    )
+    parser.add_argument("command", choices=["compact", "expand"])
+    parser.add_argument(
+        "files", nargs="*", help="data files (default: every data/*.json)"
+    )
+    args = parser.parse_args()
+
+    files = args.files or [
+        os.path.join("data", filename)
+        for filename in sorted(os.listdir("data"))
+        if filename.endswith(".json")
+    ]
+    transform = compact if args.command == "compact" else expand
+    for path in files:
+        before, after = _rewrite(path, transform)
+        print(f"📄 {path}: {before} -> {after} entries")
+
+
+if __name__ == "__main__":
+    main()
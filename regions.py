@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Regions for AusCheckt Is
+input/regions.json defines every wine region the site covers: its master
+list and data directory, map center, address defaults for structured data
+and the path its pages are generated under. Each region is built on its
+own into generated/<path>/, with its own build manifest, so a change in one
+region's data never re-renders another one
+"""
+
+import json
+import os
+from typing import Any, Dict, List
+
+REGIONS_FILENAME = "regions.json"
+# Top-level output shared by all regions
+RESERVED_PATHS = {"assets", "day", "ical", "map", "regions", "stats"}
+# Per-region summary the cross-region index is built from
+SUMMARY_FILENAME = "region.json"
+
+# Used when input/regions.json does not exist (e.g. benchmark datasets)
+DEFAULT_REGIONS = {
+    "stammersdorf": {
+        "name": "Stammersdorf",
+        "path": "",
+        "master_list": "input/heurigen_list.json",
+        "data_dir": "data",
+        "center": [48.3006, 16.3906],
+        "place": "Stammersdorf, Wien",
+        "address": {
+            "addressLocality": "Wien",
+            "addressRegion": "Wien",
+            "addressCountry": "AT",
+            "postalCode": "1210",
+        },
+    }
+}
+
+
+class Region:
+    def __init__(self, key: str, config: Dict[str, Any], base_dir: str = "."):
+        self.key = key
+        self.config = config
+        self.name: str = config["name"]
+        self.genitive: str = config.get("genitive", f"{self.name}s")
+        # Output below generated/; "" puts the region at the site root
+        self.path: str = config.get("path", key).strip("/")
+        self.master_list = os.path.join(
+            base_dir, config.get("master_list", f"input/{key}/heurigen_list.json")
+        )
+        self.data_dir = os.path.join(base_dir, config.get("data_dir", f"data/{key}"))
+        self.center: List[float] = config["center"]
+        self.zoom: int = config.get("zoom", 13)
+        self.place: str = config.get("place", self.name)
+        self.address: Dict[str, str] = config.get("address", {})
+        self.calendar_url: str = config.get("calendar_url", "")
+
+    @property
+    def url_prefix(self) -> str:
+        """Absolute URL path of the region's index, with trailing slash"""
+        return f"/{self.path}/" if self.path else "/"
+
+    def output_dir(self, site_dir: str) -> str:
+        return os.path.join(site_dir, self.path) if self.path else site_dir
+
+
+def load_regions(base_dir: str = ".") -> Dict[str, Region]:
+    """All regions in definition order; the first one is the default"""
+    path = os.path.join(base_dir, "input", REGIONS_FILENAME)
+    config = DEFAULT_REGIONS
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    regions = {key: Region(key, value, base_dir) for key, value in config.items()}
+    for region in regions.values():
+        if region.path.split("/")[0] in RESERVED_PATHS:
+            raise ValueError(f"Region {region.key}: path '{region.path}' is reserved")
+    return regions
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Service worker for AusCheckt Is
+generated/sw.js precaches the page shell (stylesheet, font, icons and the
+Bootstrap/Leaflet files from the CDNs) in a cache named after a hash of
+exactly these files, so a new build only replaces the shell when one of
+them changed. Pages and JSON are answered stale-while-revalidate; the shell
+of the build before is kept, since cached pages still reference its files
+"""
+
+import json
+from typing import Dict
+
+from asset_pipeline import HASH_LENGTH, AssetPipeline, content_hash
+from site_templates import SiteTemplates
+
+# Not requested by pages
+SKIP_FILES = {"CNAME", "robots.txt"}
+
+
+def precache_manifest(
+    assets: AssetPipeline, templates: SiteTemplates
+) -> Dict[str, str]:
+    """URL -> revision of every shell file; CDN URLs carry their version already"""
+    manifest = {}
+    for output in sorted(assets.files):
+        if output not in SKIP_FILES:
+            manifest[f"/{output}"] = content_hash(assets.content(output))[:HASH_LENGTH]
+    for url in templates.external_urls:
+        manifest[url] = ""
+    return manifest
+
+
+def cache_version(manifest: Dict[str, str]) -> str:
+    payload = json.dumps(manifest, sort_keys=True).encode("utf-8")
+    return content_hash(payload)[:HASH_LENGTH]
+
+
+def render_service_worker(manifest: Dict[str, str], templates: SiteTemplates) -> bytes:
+    return templates.service_worker.render(
+        version=cache_version(manifest),
+        precache=json.dumps(list(manifest), separators=(",", ":")),
+    )
@@ -0,0 +1,681 @@
+#!/usr/bin/env python3
+"""
+Page templates for AusCheckt Is
+Constant page fragments are compiled once into pre-encoded byte chunks;
+rendering a page only joins them with its per-page {{slot}} values
+"""
+
+import re
+from typing import Callable, List, Optional, Tuple, Union
+
+from minify import minify_html, minify_js
+from regions import Region, load_regions
+
+EXTERNAL_URL_RE = re.compile(r'(?:href|src)="(https://[^"]+\.(?:css|js))"')
+
+
+class PageTemplate:
+    SLOT_RE = re.compile(r"\{\{(\w+)\}\}")
+
+    def __init__(self, source: str, **constants: str):
+        # Inline constant fragments first so they become part of the literal chunks
+        source = self.SLOT_RE.sub(
+            lambda m: constants.get(m.group(1), m.group(0)), source
+        )
+        parts = self.SLOT_RE.split(source)
+
+        # Literal chunks at even positions, slot values are filled in at odd ones
+        self._chunks: List[bytes] = [
+            part.encode("utf-8") if i % 2 == 0 else b"" for i, part in enumerate(parts)
+        ]
+        self._slots: List[Tuple[int, str]] = [
+            (i, part) for i, part in enumerate(parts) if i % 2 == 1
+        ]
+
+    @property
+    def slots(self) -> List[str]:
+        return [slot for _, slot in self._slots]
+
+    def render(self, **values: Union[str, bytes]) -> bytes:
+        """Join literal chunks and slot values into the encoded page"""
+        chunks = self._chunks.copy()
+        for position, slot in self._slots:
+            value = values[slot]
+            chunks[position] = value if type(value) is bytes else value.encode("utf-8")
+        return b"".join(chunks)
+
+
+HEAD_LINKS = """    <!-- Favicons -->
+    <link rel="icon" type="image/png" href="/favicon-96x96.png" sizes="96x96" />
+    <link rel="icon" type="image/svg+xml" href="/favicon.svg" />
+    <link rel="shortcut icon" href="/favicon.ico" />
+    <link rel="apple-touch-icon" sizes="180x180" href="/apple-touch-icon.png" />
+    <link rel="manifest" href="/site.webmanifest" />
+    
+    <!-- CSS -->
+    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
+    <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css" />
+    <link rel="stylesheet" href="/custom.css">
+    
+    <!-- Offline cache -->
+    <script>
+        if ('serviceWorker' in navigator) {
+            navigator.serviceWorker.register('/sw.js');
+        }
+    </script>
+"""
+
+DAY_PAGE = """<!DOCTYPE html>
+<html lang="de">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AusCheckt is - Heurigenkalender für {{region_name}} am {{date_german}}</title>
+    <meta name="description" content="Welche Heurige in {{region_name}} haben heute ausg'steckt? Der Heurigenkalender zeigt alle Öffnungszeiten und Standorte der schönsten Heurigen {{region_genitive}}. Die Informationen werden laufend von den Webseiten der Heurigen aktualisiert.">
+    
+{{head_links}}    
+    <!-- Structured Data -->
+    <script type="application/ld+json">
+    [
+        {{json_ld}}
+    ]
+    </script>
+</head>
+<body>
+    <div class="container mt-4">
+        <header class="text-center mb-5">
+            <h1 class="text-primary old-london">Auscheckt is</h1>
+            <p class="text-primary"><strong>Wo auscheckt is, wo ausg'steckt is.</strong></p>
+            <nav>
+                <a href="{{home}}" class="btn btn-outline-primary">← Zurück zur Übersicht</a>
+            </nav>
+        </header>
+        
+        <main>
+            <h2 class="mb-4">Heurigen am {{date_german}}</h2>
+            
+            {{map_container}}
+            
+            <div class="events-list">
+                {{events_html}}
+            </div>
+        </main>
+        
+        <footer class="text-center mt-5 py-4 border-top" style="background-color: #f1f1f1;">
+            <p><small>Open-Source-Projekt für Heurigenliebhaber:innen und Aficionados.</small></p>
+            <p><small><a href="https://github.com/sektionschef/auschecktis">GitHub Repo</a></small></p>
+        </footer>
+    </div>
+    
+    <!-- JavaScript -->
+    <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
+    <script>
+        {{map_js}}
+    </script>
+</body>
+</html>"""
+
+EVENT_CARD = """
+        <div class="event-card mb-3 p-3 border rounded" itemscope itemtype="https://schema.org/Event">
+            <h4 itemprop="name">{{title}}</h4>
+            <div class="event-details">
+                <time itemprop="startDate" datetime="{{start}}" class="text-muted">
+                    ab {{start_time}} Uhr
+                </time>
+                <div itemprop="location" itemscope itemtype="https://schema.org/Place">
+                    <span itemprop="name" class="d-none">{{title}}</span>
+                    <div itemprop="address" itemscope itemtype="https://schema.org/PostalAddress">
+                        <span itemprop="addressLocality" class="d-none">{{address_locality}}</span>
+                        <span itemprop="addressRegion" class="d-none">{{address_region}}</span>
+                        <span itemprop="postalCode" class="d-none">{{postal_code}}</span>
+                    </div>
+                </div>
+            </div>
+            <div class="event-actions mt-2">
+                <a href="{{url}}" target="_blank" class="btn btn-sm btn-outline-primary" itemprop="url">
+                    Website
+                </a>
+                {{map_button}}
+            </div>
+        </div>"""
+
+MAP_JS = """
+        // Initialize map
+        const map = L.map('map').setView([{{map_center}}], {{map_zoom}});
+        
+        L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+            attribution: '&copy; OpenStreetMap contributors'
+        }).addTo(map);
+        
+        // Custom green icon
+        const greenIcon = L.icon({
+            iconUrl: 'data:image/svg+xml;utf8,<svg xmlns="http://www.w3.org/2000/svg" width="32" height="48" viewBox="0 0 32 48"><path fill="%23457c43" stroke="white" stroke-width="2" d="M16 2C8.268 2 2 8.268 2 16c0 10.493 12.03 28.01 12.53 28.74a2 2 0 0 0 3.94 0C17.97 44.01 30 26.493 30 16c0-7.732-6.268-14-14-14zm0 20a6 6 0 1 1 0-12 6 6 0 0 1 0 12z"/></svg>',
+            iconSize: [32, 48],
+            iconAnchor: [16, 47],
+            popupAnchor: [0, -40]
+        });
+        
+        // Add markers
+        {{markers}}
+        
+        // Fit bounds if multiple markers
+        {{fit_bounds}}
+        """
+
+MAP_MARKER = """
+            L.marker([{{lat}}, {{lng}}], {icon: greenIcon})
+                .bindPopup(`{{popup}}`)
+                .addTo(map);"""
+
+INDEX_PAGE = """<!DOCTYPE html>
+<html lang="de">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AusCheckt is - Heurigenkalender für {{region_name}}</title>
+    <meta name="description" content="Welche Heurige in {{region_name}} haben heute ausg'steckt? Der Heurigenkalender zeigt alle Öffnungszeiten und Standorte der schönsten Heurigen {{region_genitive}}. Die Informationen werden laufend von den Webseiten der Heurigen aktualisiert.">
+    
+{{head_links}}</head>
+<body>
+    <div id="main">
+        <div class="mb-5 container text-center">
+            <h1 class="text-primary old-london">Auscheckt is</h1>
+            <p class="text-primary"><strong>Wo auscheckt is, wo ausg'steckt is.</strong></p>
+        </div>
+        <div class="container text-center mb-4">
+            <p>Der Heurigenkalender zeigt die <strong>Öffnungszeiten und Standorte</strong> der schönsten Heurigen in <strong>{{region_name}}</strong>. Die Öffnungszeiten werden regelmäßig automatisch von den Webseiten der Heurigen{{calendar_source}} aktualisiert.</p>
+        </div>
+        <div id="open-today" class="container text-center mb-4">
+            <div class="mb-4">
+                <button id="prev-day" class="btn btn-primary btn-lg rounded-circle me-2 d-inline-flex align-items-center justify-content-center" style="width:2.5em; height:2.5em;" disabled title="Vortag">
+                    <span class="visually-hidden">Vortag</span>
+                    <svg xmlns="http://www.w3.org/2000/svg" width="1.5em" height="1.5em" fill="currentColor" viewBox="0 0 16 16">
+                        <path fill-rule="evenodd" d="M11.354 1.646a.5.5 0 0 1 0 .708L5.707 8l5.647 5.646a.5.5 0 0 1-.708.708l-6-6a.5.5 0 0 1 0-.708l6-6a.5.5 0 0 1 .708 0z"/>
+                    </svg>
+                </button>
+                <button id="next-day" class="btn btn-primary btn-lg rounded-circle d-inline-flex align-items-center justify-content-center" style="width:2.5em; height:2.5em;" title="Nächster Tag">
+                    <span class="visually-hidden">Nächster Tag</span>
+                    <svg xmlns="http://www.w3.org/2000/svg" width="1.5em" height="1.5em" fill="currentColor" viewBox="0 0 16 16">
+                        <path fill-rule="evenodd" d="M4.646 14.354a.5.5 0 0 1 0-.708L10.293 8 4.646 2.354a.5.5 0 1 1 .708-.708l6 6a.5.5 0 0 1 0 .708l-6 6a.5.5 0 0 1-.708 0z"/>
+                    </svg>
+                </button>
+            </div>
+            <h2 class="mb-4 text-primary"><span id="current-date"></span></h2>
+            <div id="map" class="mb-4" style="height: 320px; width: 100%; margin-bottom: 1em;"></div>
+            <ul id="open-today-list" class="list-unstyled text-start mx-auto" style="max-width: 300px;"></ul>
+            <button id="nearest-open" class="btn btn-sm btn-outline-primary" hidden>📍 Nächster offener Heuriger</button>
+            <p id="nearest-result" class="mt-2"></p>
+        </div>
+    </div>
+    <footer class="text-center mt-5 py-4 border-top" style="background-color: #f1f1f1;">
+        <p>
+            <small>Open-Source-Projekt für Heurigenliebhaber:innen und Aficionados.</small>
+        </p>
+        <p>
+            <small><img src="/assets/github-mark.svg" alt="GitHub" style="height: 1em; vertical-align: middle; margin-right: 0.3em;"> <a href="https://github.com/sektionschef/auschecktis">GitHub Repo</a> · <a href="stats/">Statistik</a> · <a href="ical/all.ics">Kalender abonnieren (iCal)</a>{{region_links}}</small>
+        </p>
+    </footer>
+    
+    <!-- JavaScript -->
+    <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"></script>
+    <script>
+        // Compact events data: v = venues [title, url, mapLink], e = [venue id, start, end],
+        // r = recurring [venue id, first start, first end, weekdays (0 = Monday), until, except days]
+        const eventData = {{events_json}};
+        
+        // Last day an event covers (an end at midnight belongs to the previous day)
+        function lastDayOf(start, end) {
+            if (!end || end <= start) return start.slice(0, 10);
+            const endDay = new Date(end.slice(0, 10) + 'T00:00:00Z');
+            if (/T00:00(:00)?$/.test(end)) endDay.setUTCDate(endDay.getUTCDate() - 1);
+            return endDay.toISOString().slice(0, 10);
+        }
+        
+        // Occurrences of a rule keep the time of the first one
+        function expandRule([venueId, start, end, weekdays, until, except]) {
+            const occurrences = [];
+            const firstDay = start.slice(0, 10);
+            const spanDays = end ? (Date.parse(end.slice(0, 10)) - Date.parse(firstDay)) / 86400000 : 0;
+            for (const day = new Date(firstDay + 'T00:00:00Z'); day.toISOString().slice(0, 10) <= until; day.setUTCDate(day.getUTCDate() + 1)) {
+                const iso = day.toISOString().slice(0, 10);
+                if (!weekdays.includes((day.getUTCDay() + 6) % 7) || except.includes(iso)) continue;
+                const endDay = new Date(day);
+                endDay.setUTCDate(endDay.getUTCDate() + spanDays);
+                occurrences.push([venueId, iso + start.slice(10), end ? endDay.toISOString().slice(0, 10) + end.slice(10) : '']);
+            }
+            return occurrences;
+        }
+        
+        const compactEvents = eventData.e.concat(...eventData.r.map(expandRule))
+            .sort((a, b) => a[1] < b[1] ? -1 : a[1] > b[1] ? 1 : 0);
+        
+        const allEvents = compactEvents.map(([venueId, start, end]) => {
+            const [title, url, mapLink] = eventData.v[venueId];
+            return {
+                title, url, mapLink, start, end,
+                firstDay: start.slice(0, 10),
+                lastDay: lastDayOf(start, end)
+            };
+        });
+        
+        // Wait for DOM to be ready
+        document.addEventListener('DOMContentLoaded', function() {
+            const today = new Date();
+            const maxDate = new Date(today);
+            maxDate.setDate(today.getDate() + 7);
+            
+            let currentDate = new Date(today);
+            
+            const ul = document.getElementById('open-today-list');
+            const currentDateSpan = document.getElementById('current-date');
+            const prevBtn = document.getElementById('prev-day');
+            const nextBtn = document.getElementById('next-day');
+            
+            function formatDate(date) {
+                return date.toLocaleDateString('de-AT', { weekday: 'long', year: 'numeric', month: '2-digit', day: '2-digit' });
+            }
+            
+            function getISO(date) {
+                return date.toISOString().slice(0, 10);
+            }
+            
+            // Initialize map
+            let map = L.map('map').setView([{{map_center}}], {{map_zoom}}); // Center on {{region_name}}
+            
+            L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+                attribution: '&copy; OpenStreetMap contributors'
+            }).addTo(map);
+            
+            let markerGroup = L.layerGroup().addTo(map);
+            
+            function clearMarkers() {
+                markerGroup.clearLayers();
+            }
+            
+            function addMarker(lat, lng, popupHtml) {
+                L.marker([lat, lng], { icon: greenIcon }).bindPopup(popupHtml).addTo(markerGroup);
+            }
+            
+            // Custom green icon
+            const greenIcon = L.icon({
+                iconUrl: 'data:image/svg+xml;utf8,<svg xmlns="http://www.w3.org/2000/svg" width="32" height="48" viewBox="0 0 32 48"><path fill="%23457c43" stroke="white" stroke-width="2" d="M16 2C8.268 2 2 8.268 2 16c0 10.493 12.03 28.01 12.53 28.74a2 2 0 0 0 3.94 0C17.97 44.01 30 26.493 30 16c0-7.732-6.268-14-14-14zm0 20a6 6 0 1 1 0-12 6 6 0 0 1 0 12z"/></svg>',
+                iconSize:     [32, 48],
+                iconAnchor:   [16, 47],
+                popupAnchor:  [0, -40]
+            });
+            
+            function venuePopup([title, url, mapLink]) {
+                let popupHtml = `<strong>${title}</strong><br>
+                    <a href="${url}" target="_blank" style="color:#457c43;text-decoration:underline;">Website</a>`;
+                if (mapLink) {
+                    popupHtml += ` &middot; <a href="${mapLink}" target="_blank" style="color:#457c43;text-decoration:underline;">Google Maps</a>`;
+                }
+                return popupHtml;
+            }
+            
+            // Map layer of the day, built by spatial.py: v = open venues [title, url, mapLink, lat, lng],
+            // c = marker clusters [lat, lng, venue indices], b = bounds,
+            // g = grid (origin o, cell size s, rows/cols n) with the nearest open venue per cell (v)
+            let layer = null;
+            let layerRequest = 0;
+            const nearestBtn = document.getElementById('nearest-open');
+            const nearestResult = document.getElementById('nearest-result');
+            
+            function drawLayer(iso) {
+                const request = ++layerRequest;
+                clearMarkers();
+                layer = null;
+                nearestBtn.hidden = true;
+                nearestResult.textContent = '';
+                fetch(`map/${iso}.json`)
+                    .then(response => response.ok ? response.json() : null)
+                    .catch(() => null)
+                    .then(data => {
+                        if (request !== layerRequest) return;
+                        layer = data;
+                        if (!layer || layer.c.length === 0) {
+                            map.setView([{{map_center}}], {{map_zoom}});
+                            return;
+                        }
+                        layer.c.forEach(([lat, lng, members]) => {
+                            addMarker(lat, lng, members.map(i => venuePopup(layer.v[i])).join('<hr class="my-1">'));
+                        });
+                        map.fitBounds(layer.b, {padding: [30, 30]});
+                        nearestBtn.hidden = !layer.g || !navigator.geolocation;
+                    });
+            }
+            
+            // Grid cell of the position (clamped to the region grid) -> precomputed nearest venue
+            function nearestOpen(lat, lng) {
+                const g = layer.g;
+                const row = Math.min(g.n[0] - 1, Math.max(0, Math.floor((lat - g.o[0]) / g.s[0])));
+                const col = Math.min(g.n[1] - 1, Math.max(0, Math.floor((lng - g.o[1]) / g.s[1])));
+                const index = g.v[row * g.n[1] + col];
+                return index >= 0 ? layer.v[index] : null;
+            }
+            
+            nearestBtn.addEventListener('click', () => {
+                nearestResult.textContent = 'Standort wird ermittelt …';
+                navigator.geolocation.getCurrentPosition(position => {
+                    const {latitude, longitude} = position.coords;
+                    const venue = layer && layer.g ? nearestOpen(latitude, longitude) : null;
+                    if (!venue) {
+                        nearestResult.textContent = 'Kein Heuriger geöffnet.';
+                        return;
+                    }
+                    const km = map.distance([latitude, longitude], [venue[3], venue[4]]) / 1000;
+                    nearestResult.innerHTML = `Am nächsten: <strong><a href="${venue[1]}" target="_blank">${venue[0]}</a></strong> (ca. ${km.toFixed(1).replace('.', ',')} km)`;
+                    map.setView([venue[3], venue[4]], 16);
+                }, () => {
+                    nearestResult.textContent = 'Standort nicht verfügbar.';
+                });
+            });
+            
+            function renderList() {
+                const currentISO = getISO(currentDate);
+                const todayISO = getISO(today);
+                const tomorrow = new Date(today);
+                tomorrow.setDate(today.getDate() + 1);
+                const tomorrowISO = getISO(tomorrow);
+            
+                // Set heading text
+                if (currentISO === todayISO) {
+                    currentDateSpan.textContent = "Heute geöffnet";
+                } else if (currentISO === tomorrowISO) {
+                    currentDateSpan.textContent = "Morgen geöffnet";
+                } else {
+                    currentDateSpan.textContent = "Geöffnet am " + formatDate(currentDate);
+                }
+            
+                // Enable/disable prev/next buttons
+                prevBtn.disabled = currentISO <= todayISO;
+                nextBtn.disabled = currentISO >= getISO(maxDate);
+            
+                // Filter for current date
+                const openToday = allEvents.filter(event => event.firstDay <= currentISO && currentISO <= event.lastDay);
+            
+                ul.innerHTML = '';
+            
+                if (openToday.length === 0) {
+                    ul.innerHTML = '<li>Kein Heuriger geöffnet.</li>';
+                } else {
+                    openToday.forEach(event => {
+                        const li = document.createElement('li');
+                        li.innerHTML = `<strong><a href="${event.url}" target="_blank">${event.title}</a></strong> 
+            (ab ${new Date(event.start).toLocaleTimeString('de-AT', {hour: '2-digit', minute:'2-digit', hour12: false})} Uhr)`;
+                        ul.appendChild(li);
+                    });
+                }
+            
+                // Markers and bounds are precomputed per day
+                drawLayer(currentISO);
+            }
+            
+            // Helper to extract lat/lng from Google Maps short links
+            function extractLatLng(mapLink) {
+                try {
+                    if (mapLink.includes('@')) {
+                        const match = mapLink.match(/@([0-9\\.\\-]+),([0-9\\.\\-]+)/);
+                        if (match) return [parseFloat(match[1]), parseFloat(match[2])];
+                    }
+                } catch (e) {}
+                return null;
+            }
+            
+            // Initialize and render
+            renderList();
+            
+            prevBtn.addEventListener('click', () => {
+                if (getISO(currentDate) > getISO(today)) {
+                    currentDate.setDate(currentDate.getDate() - 1);
+                    renderList();
+                }
+            });
+            
+            nextBtn.addEventListener('click', () => {
+                if (getISO(currentDate) < getISO(maxDate)) {
+                    currentDate.setDate(currentDate.getDate() + 1);
+                    renderList();
+                }
+            });
+        });
+    </script>
+    <!-- GoatCounter -->
+    <script data-goatcounter="https://auschecktis.goatcounter.com/count"
+       async
+       src="//gc.zgo.at/count.js"></script>
+</body>
+</html>"""
+
+
+STATS_PAGE = """<!DOCTYPE html>
+<html lang="de">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AusCheckt is - Statistik der Heurigen in {{region_name}}</title>
+    <meta name="description" content="Wann haben die Heurigen in {{region_name}} ausg'steckt? Offene Tage pro Monat, Saisonbeginn und -ende, beliebte Wochentage und Uhrzeiten aus dem Archiv des Heurigenkalenders.">
+    
+{{head_links}}</head>
+<body>
+    <div class="container mt-4">
+        <header class="text-center mb-5">
+            <h1 class="text-primary old-london">Auscheckt is</h1>
+            <p class="text-primary"><strong>Wo auscheckt is, wo ausg'steckt is.</strong></p>
+            <nav>
+                <a href="{{home}}" class="btn btn-outline-primary">← Zurück zur Übersicht</a>
+            </nav>
+        </header>
+        
+        <main>
+            <h2 class="mb-4">Statistik</h2>
+            <p>{{event_count}} Termine von {{venue_count}} Heurigen, {{period}}. Statistik über das Archiv aus <code>data/</code>. <a href="{{home}}stats/stats.json">Daten als JSON</a></p>
+            
+            <h3 class="h4 mt-5">Wie viele Heurige haben offen?</h3>
+            {{timeline}}
+            
+            <h3 class="h4 mt-5">Wochentag und Uhrzeit</h3>
+            <p class="text-muted">Geöffnete Stunden aller Heurigen, je dunkler desto mehr.</p>
+            <div class="table-responsive">
+                {{heatmap}}
+            </div>
+            
+            <h3 class="h4 mt-5">Saison</h3>
+            <div class="table-responsive">
+                {{seasons}}
+            </div>
+            
+            <h3 class="h4 mt-5">Offene Tage pro Monat</h3>
+            {{months}}
+        </main>
+        
+        <footer class="text-center mt-5 py-4 border-top" style="background-color: #f1f1f1;">
+            <p><small>Open-Source-Projekt für Heurigenliebhaber:innen und Aficionados.</small></p>
+            <p><small><a href="https://github.com/sektionschef/auschecktis">GitHub Repo</a></small></p>
+        </footer>
+    </div>
+</body>
+</html>"""
+
+REGIONS_PAGE = """<!DOCTYPE html>
+<html lang="de">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AusCheckt is - Heurigenkalender für alle Regionen</title>
+    <meta name="description" content="Welche Heurige haben heute ausg'steckt? Die Heurigenkalender aller Weinorte auf einen Blick.">
+    
+{{head_links}}</head>
+<body>
+    <div class="container mt-4">
+        <header class="text-center mb-5">
+            <h1 class="text-primary old-london">Auscheckt is</h1>
+            <p class="text-primary"><strong>Wo auscheckt is, wo ausg'steckt is.</strong></p>
+        </header>
+        
+        <main>
+            <h2 class="mb-4">Regionen</h2>
+            <ul id="regions" class="list-unstyled">
+                {{regions_html}}
+            </ul>
+        </main>
+        
+        <footer class="text-center mt-5 py-4 border-top" style="background-color: #f1f1f1;">
+            <p><small>Open-Source-Projekt für Heurigenliebhaber:innen und Aficionados.</small></p>
+            <p><small><a href="https://github.com/sektionschef/auschecktis">GitHub Repo</a></small></p>
+        </footer>
+    </div>
+    <script>
+        // Open venues per region and day; the page itself only changes when a region is rebuilt
+        const openPerDay = {{open_json}};
+        const today = new Date().toISOString().slice(0, 10);
+        document.querySelectorAll('[data-region]').forEach(item => {
+            const open = (openPerDay[item.dataset.region] || {})[today] || 0;
+            item.querySelector('.open-today').textContent = open === 1 ? '1 Heuriger hat heute offen' : open + ' Heurige haben heute offen';
+        });
+    </script>
+</body>
+</html>"""
+
+REGION_ITEM = """
+                <li class="mb-3" data-region="{{key}}">
+                    <a href="{{url}}" class="h4">{{name}}</a>
+                    <div class="text-muted"><span class="open-today"></span> · {{venue_count}} Heurige</div>
+                </li>"""
+
+
+SERVICE_WORKER = """// Generated by build_static_site.py
+const VERSION = '{{version}}';
+const SHELL_CACHE = 'shell-' + VERSION;
+const DATA_CACHE = 'data';
+// Shell of the build before: cached pages of that build still reference it
+const PREVIOUS_CACHE = 'shell-previous';
+// Stylesheet, font, icons and CDN files of this build
+const PRECACHE = {{precache}};
+
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(SHELL_CACHE)
+            .then(cache => cache.addAll(PRECACHE))
+            .then(() => caches.open(DATA_CACHE))
+            .then(cache => cache.add('/'))
+            .then(() => self.skipWaiting())
+    );
+});
+
+// Keep the shell of the build before as PREVIOUS_CACHE, drop everything older
+function keepPrevious(key) {
+    return caches.delete(PREVIOUS_CACHE)
+        .then(() => Promise.all([caches.open(key), caches.open(PREVIOUS_CACHE)]))
+        .then(([old, previous]) => old.keys().then(requests => Promise.all(
+            requests.map(request => old.match(request)
+                .then(response => previous.put(request, response)))
+        )));
+}
+
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => {
+                const old = keys.find(key => key.startsWith('shell-')
+                    && key !== SHELL_CACHE && key !== PREVIOUS_CACHE);
+                return (old ? keepPrevious(old) : Promise.resolve()).then(() => keys);
+            })
+            .then(keys => Promise.all(
+                keys.filter(key => key !== SHELL_CACHE && key !== DATA_CACHE
+                    && key !== PREVIOUS_CACHE)
+                    .map(key => caches.delete(key))
+            ))
+            .then(() => self.clients.claim())
+    );
+});
+
+// Pages and event data: answer from the cache at once, refresh it in the background
+function staleWhileRevalidate(event, key) {
+    const network = fetch(event.request).then(response => {
+        if (response.ok) {
+            const copy = response.clone();
+            caches.open(DATA_CACHE).then(cache => cache.put(key, copy));
+        }
+        return response;
+    });
+    event.waitUntil(network.catch(() => null));
+    return caches.match(key).then(cached => cached || network);
+}
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+    const url = new URL(request.url);
+    const local = url.origin === self.location.origin;
+
+    if (PRECACHE.includes(local ? url.pathname : url.href)) {
+        event.respondWith(caches.match(request).then(cached => cached || fetch(request)));
+    } else if (local && (request.mode === 'navigate' || /\\.(html|json)$/.test(url.pathname))) {
+        event.respondWith(staleWhileRevalidate(event, url.origin + url.pathname));
+    } else if (local) {
+        // Assets of a page cached by an earlier build, gone from the server
+        event.respondWith(caches.match(request, { cacheName: PREVIOUS_CACHE })
+            .then(cached => cached || fetch(request)));
+    }
+});
+"""
+
+
+class SiteTemplates:
+    """All page templates of one build, compiled once (and minified once)"""
+
+    def __init__(
+        self,
+        minify: bool = False,
+        rewrite_urls: Optional[Callable[[str], str]] = None,
+        region: Optional[Region] = None,
+        region_links: str = "",
+    ):
+        if region is None:
+            region = next(iter(load_regions().values()))
+
+        def html(source: str) -> str:
+            # Asset URLs (fingerprinted names) first, then minification
+            if rewrite_urls is not None:
+                source = rewrite_urls(source)
+            return minify_html(source) if minify else source
+
+        js = minify_js if minify else str
+        # Region specifics are inlined like the head links
+        constants = {
+            "head_links": html(HEAD_LINKS),
+            "region_name": region.name,
+            "region_genitive": region.genitive,
+            "home": region.url_prefix,
+            "map_center": f"{region.center[0]}, {region.center[1]}",
+            "map_zoom": str(region.zoom),
+            "address_locality": region.address.get("addressLocality", ""),
+            "address_region": region.address.get("addressRegion", ""),
+            "postal_code": region.address.get("postalCode", ""),
+            "calendar_source": (
+                f' und dem <a href="{region.calendar_url}" target="_blank">offiziellen Kalender</a>'
+                if region.calendar_url
+                else ""
+            ),
+            "region_links": region_links,
+        }
+
+        self.day_page = PageTemplate(html(DAY_PAGE), **constants)
+        self.event_card = PageTemplate(html(EVENT_CARD), **constants)
+        self.map_js = PageTemplate(js(MAP_JS), **constants)
+        self.map_marker = PageTemplate(js(MAP_MARKER))
+        self.index_page = PageTemplate(html(INDEX_PAGE), **constants)
+        self.stats_page = PageTemplate(html(STATS_PAGE), **constants)
+        self.regions_page = PageTemplate(html(REGIONS_PAGE), **constants)
+        self.region_item = PageTemplate(html(REGION_ITEM))
+        self.service_worker = PageTemplate(js(SERVICE_WORKER))
+
+        # Stylesheets and scripts the pages load from CDNs (versioned URLs)
+        self.external_urls = sorted(
+            {
+                url
+                for source in (HEAD_LINKS, DAY_PAGE, INDEX_PAGE, STATS_PAGE)
+                for url in EXTERNAL_URL_RE.findall(source)
+            }
+        )
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Sitemaps for AusCheckt Is
+URLs are streamed into gzipped child sitemaps next to the pages they list
+(one per region and year, split again at 50,000 URLs or 50 MB) and
+generated/sitemap.xml is the sitemap index over all of them. Only the URL
+being written is held in memory. A shard whose bytes did not change is not
+replaced, so its lastmod in the index is the time its content last changed
+"""
+
+import gzip
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from build_manifest import BuildManifest
+from fileutils import write_atomic
+
+# Protocol limits per sitemap file (uncompressed)
+MAX_URLS = 50000
+MAX_BYTES = 50 * 1024 * 1024
+
+NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+HEADER = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = HEADER + f'<urlset xmlns="{NAMESPACE}">\n'.encode("utf-8")
+URLSET_CLOSE = b"</urlset>\n"
+INDEX_OPEN = HEADER + f'<sitemapindex xmlns="{NAMESPACE}">\n'.encode("utf-8")
+INDEX_CLOSE = b"</sitemapindex>\n"
+
+
+def url_entry(url: Dict[str, Optional[str]]) -> bytes:
+    """<url> element; lastmod, changefreq and priority are left out when unknown"""
+    lines = ["  <url>", f"    <loc>{escape(url['loc'])}</loc>"]
+    for field in ("lastmod", "changefreq", "priority"):
+        if url.get(field):
+            lines.append(f"    <{field}>{url[field]}</{field}>")
+    lines.append("  </url>")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def sitemap_entry(loc: str, lastmod: Optional[str]) -> bytes:
+    lines = ["  <sitemap>", f"    <loc>{escape(loc)}</loc>"]
+    if lastmod:
+        lines.append(f"    <lastmod>{lastmod}</lastmod>")
+    lines.append("  </sitemap>")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def write_urlset(f: BinaryIO, urls: Iterable[Dict[str, Optional[str]]]) -> int:
+    """Stream a plain <urlset> into a binary file, return the URL count"""
+    count = 0
+    f.write(URLSET_OPEN)
+    for url in urls:
+        f.write(url_entry(url))
+        count += 1
+    f.write(URLSET_CLOSE)
+    return count
+
+
+class ShardFile:
+    """One .xml.gz child sitemap, gzipped into a temp file and hashed while written"""
+
+    def __init__(self, directory: str, filename: str):
+        self.filename = filename
+        self.path = os.path.join(directory, filename)
+        self.urls = 0
+        self.size = 0
+        self.digest = hashlib.sha256()
+
+        fd, self.tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=f".{filename}.", suffix=".tmp"
+        )
+        self.raw = os.fdopen(fd, "wb")
+        # No name or timestamp in the header, so unchanged shards are byte-identical
+        self.gzip = gzip.GzipFile(
+            filename="", mode="wb", fileobj=self.raw, compresslevel=9, mtime=0
+        )
+        self.write(URLSET_OPEN)
+
+    def write(self, data: bytes):
+        self.gzip.write(data)
+        self.digest.update(data)
+        self.size += len(data)
+
+    def fits(self, entry: bytes) -> bool:
+        return (
+            self.urls < MAX_URLS
+            and self.size + len(entry) + len(URLSET_CLOSE) <= MAX_BYTES
+        )
+
+    def add(self, entry: bytes):
+        self.write(entry)
+        self.urls += 1
+
+    def finish(self, manifest: BuildManifest, page: str) -> bool:
+        """Close the shard and replace the old one if its content changed"""
+        self.write(URLSET_CLOSE)
+        self.gzip.close()
+        self.raw.close()
+        digest = self.digest.hexdigest()
+        if manifest.is_current(page, digest):
+            os.remove(self.tmp_path)
+            return False
+        os.chmod(self.tmp_path, 0o644)
+        os.replace(self.tmp_path, self.path)
+        manifest.record(page, digest)
+        return True
+
+    def discard(self):
+        self.gzip.close()
+        self.raw.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+def write_shards(
+    manifest: BuildManifest,
+    directory: str,
+    base_url: str,
+    urls: Iterable[Tuple[str, Dict[str, Optional[str]]]],
+) -> Tuple[List[Dict[str, Optional[str]]], int, List[str]]:
+    """Stream (shard, URL) pairs, grouped by shard, into <directory>/sitemap-<shard>.xml.gz
+
+    directory is relative to the manifest's output directory and base_url is
+    its public URL. Returns the index entries (loc, lastmod) of all shards,
+    the URL count and the paths of the shards that were rewritten. Shards
+    from earlier builds that are no longer produced are removed.
+    """
+    target_dir = os.path.join(manifest.output_dir, directory)
+    os.makedirs(target_dir, exist_ok=True)
+    pages: List[str] = []
+    written: List[str] = []
+    count = 0
+
+    shard: Optional[ShardFile] = None
+    current = None
+    part = 1
+
+    def finish():
+        page = "/".join(filter(None, [directory, shard.filename]))
+        pages.append(page)
+        if shard.finish(manifest, page):
+            written.append(shard.path)
+
+    try:
+        for name, url in urls:
+            entry = url_entry(url)
+            if name != current or not shard.fits(entry):
+                if shard is not None:
+                    finish()
+                part = part + 1 if name == current else 1
+                current = name
+                suffix = f"-{part}" if part > 1 else ""
+                shard = ShardFile(target_dir, f"sitemap-{name}{suffix}.xml.gz")
+            shard.add(entry)
+            count += 1
+        if shard is not None:
+            finish()
+    except BaseException:
+        if shard is not None:
+            shard.discard()
+        raise
+
+    produced = {page.rsplit("/", 1)[-1] for page in pages}
+    for filename in sorted(os.listdir(target_dir)):
+        if (
+            filename.startswith("sitemap-")
+            and filename.endswith(".xml.gz")
+            and filename not in produced
+        ):
+            os.remove(os.path.join(target_dir, filename))
+            manifest.forget("/".join(filter(None, [directory, filename])))
+            print(f"🗑️  Removed {filename}")
+
+    entries = [
+        {"loc": f"{base_url}/{page}", "lastmod": manifest.lastmod(page)}
+        for page in pages
+    ]
+    return entries, count, written
+
+
+def write_index(
+    manifest: BuildManifest, page: str, sitemaps: Iterable[Dict[str, Optional[str]]]
+) -> bool:
+    """Sitemap index over (loc, lastmod) entries, only rewritten when it changed"""
+    content = (
+        INDEX_OPEN
+        + b"".join(
+            sitemap_entry(sitemap["loc"], sitemap.get("lastmod"))
+            for sitemap in sitemaps
+        )
+        + INDEX_CLOSE
+    )
+    digest = hashlib.sha256(content).hexdigest()
+    if manifest.is_current(page, digest):
+        return False
+    write_atomic(os.path.join(manifest.output_dir, page), content)
+    manifest.record(page, digest)
+    return True
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Spatial index for AusCheckt Is
+Lays a grid over the venues of a region's master list. For every day the
+open venues are grouped into marker clusters (venues a few metres apart
+share one marker) with the bounds to fit, and every grid cell gets the
+nearest venue open that day, so the map only draws what the build computed
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+from event_model import Event
+
+M_PER_DEG_LAT = 110574.0
+# Smallest grid cell and the most cells per side of the region grid
+CELL_METERS = 250
+MAX_CELLS = 16
+# Venues closer than this share one marker
+CLUSTER_METERS = 50
+# Up to this many open venues a plain scan beats walking rings of cells
+SCAN_POINTS = 24
+
+Point = Tuple[float, float]
+
+
+def distance_m(a: Point, b: Point) -> float:
+    """Equirectangular distance; exact enough within a wine region"""
+    mean_lat = math.radians((a[0] + b[0]) / 2)
+    dy = (a[0] - b[0]) * M_PER_DEG_LAT
+    dx = (a[1] - b[1]) * M_PER_DEG_LAT * math.cos(mean_lat)
+    return math.hypot(dx, dy)
+
+
+def bounds(points: List[Point]) -> Optional[List[List[float]]]:
+    """[[south, west], [north, east]] of the points"""
+    if not points:
+        return None
+    lats = [lat for lat, _ in points]
+    lngs = [lng for _, lng in points]
+    return [[min(lats), min(lngs)], [max(lats), max(lngs)]]
+
+
+class SpatialIndex:
+    def __init__(self, heurigen_master: Dict[str, Dict[str, Any]]):
+        # Venue key -> position from the master list
+        self.positions: Dict[str, Point] = {
+            key: (data["lat"], data["lng"])
+            for key, data in heurigen_master.items()
+            if data.get("lat") is not None and data.get("lng") is not None
+        }
+
+        # Grid over the venues, one cell of margin on every side
+        box = bounds(list(self.positions.values())) or [[0.0, 0.0], [0.0, 0.0]]
+        (south, west), (north, east) = box
+        lng_scale = math.cos(math.radians((south + north) / 2))
+        self.cell = (
+            max(CELL_METERS / M_PER_DEG_LAT, (north - south) / (MAX_CELLS - 2)),
+            max(
+                CELL_METERS / (M_PER_DEG_LAT * lng_scale),
+                (east - west) / (MAX_CELLS - 2),
+            ),
+        )
+        self.origin = (south - self.cell[0], west - self.cell[1])
+        self.rows = math.floor((north - self.origin[0]) / self.cell[0]) + 2
+        self.cols = math.floor((east - self.origin[1]) / self.cell[1]) + 2
+        # Lower bound of the distance covered by one ring of cells
+        self.ring_m = min(
+            self.cell[0] * M_PER_DEG_LAT,
+            self.cell[1] * M_PER_DEG_LAT * lng_scale,
+        )
+
+    def cell_of(self, point: Point) -> Optional[Tuple[int, int]]:
+        row = math.floor((point[0] - self.origin[0]) / self.cell[0])
+        col = math.floor((point[1] - self.origin[1]) / self.cell[1])
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
+    def cell_center(self, row: int, col: int) -> Point:
+        return (
+            self.origin[0] + (row + 0.5) * self.cell[0],
+            self.origin[1] + (col + 0.5) * self.cell[1],
+        )
+
+    def position(self, event: Event) -> Optional[Point]:
+        """Venue position from the master list, else the event's own coordinates"""
+        return self.positions.get(event.venue.key) or event.venue.position
+
+    def cluster(self, points: List[Point]) -> List[List[int]]:
+        """Indices of the points grouped so no member is further than
+        CLUSTER_METERS from the first point of its cluster"""
+        size = (
+            CLUSTER_METERS / M_PER_DEG_LAT,
+            CLUSTER_METERS / (M_PER_DEG_LAT * math.cos(math.radians(self.origin[0]))),
+        )
+        clusters: List[List[int]] = []
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for index, point in enumerate(points):
+            row = math.floor(point[0] / size[0])
+            col = math.floor(point[1] / size[1])
+            found = None
+            for cell in [
+                (row + dr, col + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+            ]:
+                for cluster_id in buckets.get(cell, []):
+                    seed = points[clusters[cluster_id][0]]
+                    if distance_m(seed, point) <= CLUSTER_METERS:
+                        found = cluster_id
+                        break
+                if found is not None:
+                    break
+            if found is None:
+                found = len(clusters)
+                clusters.append([])
+                buckets.setdefault((row, col), []).append(found)
+            clusters[found].append(index)
+        return clusters
+
+    def nearest_grid(self, points: List[Point]) -> List[int]:
+        """Index of the nearest point for the center of every cell, row-major"""
+        # Points outside the grid (or all of them, if few) are checked for every cell
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        scanned = []
+        for index, point in enumerate(points):
+            cell = self.cell_of(point)
+            if cell is None or len(points) <= SCAN_POINTS:
+                scanned.append(index)
+            else:
+                buckets.setdefault(cell, []).append(index)
+
+        nearest = []
+        for row in range(self.rows):
+            for col in range(self.cols):
+                center = self.cell_center(row, col)
+                best, best_m = -1, math.inf
+                for index in scanned:
+                    d = distance_m(center, points[index])
+                    if d < best_m:
+                        best, best_m = index, d
+                # Rings of cells around this one until no closer point can follow
+                ring = 0
+                while buckets and ring <= max(self.rows, self.cols):
+                    if best_m <= ring * self.ring_m - self.ring_m / 2:
+                        break
+                    for r in range(row - ring, row + ring + 1):
+                        for c in range(col - ring, col + ring + 1):
+                            if max(abs(r - row), abs(c - col)) != ring:
+                                continue
+                            for index in buckets.get((r, c), []):
+                                d = distance_m(center, points[index])
+                                if d < best_m or (d == best_m and index < best):
+                                    best, best_m = index, d
+                    ring += 1
+                nearest.append(best)
+        return nearest
+
+    def day_layer(
+        self, day_events: List[Event], nearest: bool = True
+    ) -> Dict[str, Any]:
+        """Map data of one day: open venues, marker clusters, bounds and (with
+        nearest) the nearest open venue per grid cell"""
+        venues = []
+        points: List[Point] = []
+        seen = set()
+        for event in day_events:
+            venue = event.venue
+            position = self.position(event)
+            if venue.key in seen or position is None:
+                continue
+            seen.add(venue.key)
+            venues.append(
+                [venue.title, venue.url or "#", venue.map_link or ""] + list(position)
+            )
+            points.append(position)
+
+        clusters = []
+        for members in self.cluster(points):
+            lat = sum(points[i][0] for i in members) / len(members)
+            lng = sum(points[i][1] for i in members) / len(members)
+            clusters.append([round(lat, 6), round(lng, 6), members])
+
+        layer: Dict[str, Any] = {"v": venues, "c": clusters, "b": bounds(points)}
+        if nearest and points:
+            layer["g"] = {
+                "o": [round(self.origin[0], 6), round(self.origin[1], 6)],
+                "s": [round(self.cell[0], 8), round(self.cell[1], 8)],
+                "n": [self.rows, self.cols],
+                "v": self.nearest_grid(points),
+            }
+        return layer
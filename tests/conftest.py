@@ -0,0 +1,95 @@
+import json
+import os
+import shutil
+import sys
+from datetime import datetime
+
+import pytest
+
+# Modules live flat in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 3, 1, 10, 0, tzinfo=tz)
+
+
+def venue(label: str, lat: float, lng: float):
+    key = label.lower()
+    return {
+        "label": label,
+        "website": f"https://example.com/{key}/",
+        "link_opening_hours_page": f"https://example.com/{key}/",
+        "comment": "",
+        "location": f"https://maps.example.com/{key}",
+        "lat": lat,
+        "lng": lng,
+    }
+
+
+def opening(label: str, day: str, start: str = "16:00", end: str = "22:00"):
+    return {
+        "title": label,
+        "start": f"{day}T{start}:00",
+        "end": f"{day}T{end}:00",
+    }
+
+
+def write_json(path, value):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(value, f, ensure_ascii=False, indent=2)
+
+
+@pytest.fixture
+def small_site(tmp_path, monkeypatch):
+    """Two regions with two venues each and a few March 2026 openings,
+    built with today frozen to 2026-03-01"""
+    import build_static_site
+
+    monkeypatch.setattr(build_static_site, "datetime", FrozenDatetime)
+    shutil.copytree(
+        os.path.join(ROOT, "input", "assets"), tmp_path / "input" / "assets"
+    )
+    stammersdorf = json.load(
+        open(os.path.join(ROOT, "input", "regions.json"), encoding="utf-8")
+    )["stammersdorf"]
+    write_json(
+        tmp_path / "input" / "regions.json",
+        {
+            "stammersdorf": stammersdorf,
+            "wachau": {
+                "name": "Wachau",
+                "center": [48.36, 15.42],
+                "place": "Wachau, Niederösterreich",
+            },
+        },
+    )
+    write_json(
+        tmp_path / "input" / "heurigen_list.json",
+        {
+            "presshaus": venue("Presshaus", 48.3032, 16.4107),
+            "zahel": venue("Zahel", 48.3061, 16.4019),
+        },
+    )
+    write_json(
+        tmp_path / "input" / "wachau" / "heurigen_list.json",
+        {"donauhof": venue("Donauhof", 48.3601, 15.4203)},
+    )
+    write_json(
+        tmp_path / "data" / "presshaus.json",
+        [opening("Presshaus", day) for day in ("2026-03-06", "2026-03-07")],
+    )
+    write_json(
+        tmp_path / "data" / "zahel.json",
+        [opening("Zahel", "2026-03-07", "12:00", "23:00")],
+    )
+    write_json(
+        tmp_path / "data" / "wachau" / "donauhof.json",
+        [opening("Donauhof", "2026-03-08")],
+    )
+    return tmp_path
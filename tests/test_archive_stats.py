@@ -0,0 +1,113 @@
+"""Archive statistics against a brute-force count of the same openings"""
+
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+import archive_stats
+from event_store import EventStore, write_store
+
+
+def store_of(tmp_path, events):
+    path = str(tmp_path / "events.evs")
+    write_store(path, events)
+    return EventStore(path)
+
+
+def brute_force(events):
+    """Distinct open (venue, day) and (venue, hour) pairs, hour by hour"""
+    days = set()
+    hours = set()
+    for key, event in events:
+        start = datetime.fromisoformat(event["start"])
+        end = datetime.fromisoformat(event["end"]) if event.get("end") else None
+        if end is None or end <= start:
+            days.add((key, start.date()))
+            hours.add((key, start.replace(minute=0, second=0)))
+            continue
+        day = start.date()
+        while day <= (end - timedelta(microseconds=1)).date():
+            days.add((key, day))
+            day += timedelta(days=1)
+        hour = start.replace(minute=0, second=0)
+        while hour < end:
+            hours.add((key, hour))
+            hour += timedelta(hours=1)
+    return days, hours
+
+
+def random_events(seed: int = 1):
+    rng = random.Random(seed)
+    events = []
+    for venue in ["a", "b", "c"]:
+        for _ in range(300):
+            start = datetime(2023, 1, 1, rng.randint(0, 23), rng.choice([0, 30]))
+            start += timedelta(days=rng.randint(0, 3 * 365))
+            event = {"title": venue, "start": start.isoformat()}
+            if rng.random() < 0.8:
+                # Up to two days, some closing at midnight, a few ending before they start
+                hours = rng.choice([-1, 0, 1, 5, 8, 24, 47])
+                event["end"] = (start + timedelta(hours=hours)).isoformat()
+            events.append((venue, event))
+    return events
+
+
+def test_matches_brute_force(tmp_path):
+    events = random_events()
+    days, hours = brute_force(events)
+
+    with store_of(tmp_path, events) as store:
+        stats = archive_stats.compute_stats(store, {"a": "Venue A"})
+
+    assert stats["events"] == len(events)
+    assert stats["venues"]["a"]["label"] == "Venue A"
+    for key in ["a", "b", "c"]:
+        open_days = sorted(day for venue, day in days if venue == key)
+        venue = stats["venues"][key]
+        assert venue["open_days"] == len(open_days)
+        assert venue["months"] == dict(
+            sorted(Counter(day.strftime("%Y-%m") for day in open_days).items())
+        )
+        for year, season in venue["seasons"].items():
+            in_year = [day for day in open_days if day.year == int(year)]
+            assert season == {
+                "first": in_year[0].isoformat(),
+                "last": in_year[-1].isoformat(),
+                "open_days": len(in_year),
+            }
+
+    per_day = Counter(day for _, day in days)
+    assert stats["open_venues_per_day"] == {
+        day.isoformat(): count for day, count in sorted(per_day.items())
+    }
+    assert stats["first_day"] == min(per_day).isoformat()
+    assert stats["last_day"] == max(per_day).isoformat()
+
+    heatmap = [[0] * 24 for _ in range(7)]
+    for _, hour in hours:
+        heatmap[hour.weekday()][hour.hour] += 1
+    assert stats["heatmap"]["open_hours"] == heatmap
+
+
+def test_overlapping_files_count_once(tmp_path):
+    opening = {"start": "2026-05-01T16:00:00", "end": "2026-05-02T01:00:00"}
+    events = [("a", dict(opening, title="a")), ("a", dict(opening, title="a (2025)"))]
+
+    with store_of(tmp_path, events) as store:
+        stats = archive_stats.compute_stats(store, {})
+
+    assert stats["venues"]["a"]["open_days"] == 2
+    assert stats["open_venues_per_day"] == {"2026-05-01": 1, "2026-05-02": 1}
+    # Friday 16:00-24:00 and Saturday 00:00-01:00
+    assert sum(map(sum, stats["heatmap"]["open_hours"])) == 9
+    assert stats["heatmap"]["open_hours"][4][16] == 1
+    assert stats["heatmap"]["open_hours"][5][0] == 1
+
+
+def test_empty_store(tmp_path):
+    with store_of(tmp_path, []) as store:
+        stats = archive_stats.compute_stats(store, {})
+
+    assert stats["venues"] == {}
+    assert stats["first_day"] is None
+    assert stats["open_venues_per_day"] == {}
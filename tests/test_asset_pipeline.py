@@ -0,0 +1,90 @@
+"""Asset fingerprinting, reference rewriting and retirement of old fingerprints"""
+
+import json
+
+import asset_pipeline
+from asset_pipeline import AssetPipeline
+
+
+def make_source(tmp_path, css='@font-face { src: url("assets/font/a.ttf"); }'):
+    source = tmp_path / "assets"
+    (source / "font").mkdir(parents=True, exist_ok=True)
+    (source / "font" / "a.ttf").write_bytes(b"font")
+    (source / "custom.css").write_text(css, encoding="utf-8")
+    (source / "robots.txt").write_text("User-agent: *\n", encoding="utf-8")
+    return str(source)
+
+
+def test_fingerprints_and_rewrites(tmp_path):
+    pipeline = AssetPipeline(make_source(tmp_path))
+
+    font = pipeline.urls["assets/font/a.ttf"]
+    css = pipeline.urls["custom.css"]
+    assert font == asset_pipeline.fingerprint("assets/font/a.ttf", b"font")
+    assert css.startswith("custom.") and css.endswith(".css") and css != "custom.css"
+    assert pipeline.urls["robots.txt"] == "robots.txt"
+    # custom.css is served from the root, the font from /assets/
+    assert f'url("{font}")'.encode() in pipeline.content(css)
+
+    html = pipeline.rewrite_html(
+        '<link href="/custom.css"><a href="/other.html"><img src="assets/font/a.ttf">'
+    )
+    assert html == f'<link href="/{css}"><a href="/other.html"><img src="{font}">'
+
+
+def test_sync_writes_only_changes(tmp_path):
+    out = tmp_path / "site"
+    out.mkdir()
+    pipeline = AssetPipeline(make_source(tmp_path))
+
+    written, unchanged, removed, kept = pipeline.sync(str(out))
+    assert len(written) == 3 and unchanged == 0 and removed == kept == []
+    manifest = json.loads((out / asset_pipeline.MANIFEST_FILENAME).read_text())
+    assert manifest == pipeline.urls
+
+    written, unchanged, removed, kept = AssetPipeline(pipeline.source_dir).sync(
+        str(out)
+    )
+    assert written == [] and unchanged == 3 and removed == kept == []
+
+
+def test_old_fingerprints_outlive_the_next_builds(tmp_path):
+    out = tmp_path / "site"
+    out.mkdir()
+    first = AssetPipeline(make_source(tmp_path))
+    first.sync(str(out), keep_builds=2)
+    old_css = first.urls["custom.css"]
+
+    # A cached page of the first build still references the old stylesheet
+    second = AssetPipeline(make_source(tmp_path, css="body { color: red; }"))
+    written, _, removed, kept = second.sync(str(out), keep_builds=2)
+    assert [str(out / second.urls["custom.css"])] == written
+    assert removed == [] and kept == [old_css]
+    assert (out / old_css).exists()
+
+    _, _, removed, kept = AssetPipeline(second.source_dir).sync(str(out), keep_builds=2)
+    assert removed == [] and kept == [old_css]
+
+    _, _, removed, kept = AssetPipeline(second.source_dir).sync(str(out), keep_builds=2)
+    assert removed == [str(out / old_css)] and kept == []
+    assert not (out / old_css).exists()
+    assert json.loads((out / asset_pipeline.RETIRED_FILENAME).read_text()) == {}
+
+
+def test_restored_fingerprint_is_no_longer_retired(tmp_path):
+    out = tmp_path / "site"
+    out.mkdir()
+    first = AssetPipeline(make_source(tmp_path))
+    first.sync(str(out), keep_builds=1)
+    second = AssetPipeline(make_source(tmp_path, css="p {}"))
+    second.sync(str(out), keep_builds=1)
+
+    # Reverting the stylesheet brings the first fingerprint back into use
+    _, _, removed, kept = AssetPipeline(make_source(tmp_path)).sync(
+        str(out), keep_builds=1
+    )
+
+    assert removed == [] and kept == [second.urls["custom.css"]]
+    assert (out / first.urls["custom.css"]).exists()
+    retired = json.loads((out / asset_pipeline.RETIRED_FILENAME).read_text())
+    assert retired == {second.urls["custom.css"]: 1}
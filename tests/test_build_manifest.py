@@ -0,0 +1,72 @@
+"""Incremental builds: pages whose inputs did not change are not rewritten"""
+
+import json
+import os
+
+from build_manifest import BuildManifest
+from conftest import opening, write_json
+
+
+def build(base, minify=True):
+    from build_static_site import build_region
+
+    build_region(str(base), minify, "stammersdorf")
+    with open(base / "generated" / "build_report.json", encoding="utf-8") as f:
+        return json.load(f)["counts"]
+
+
+def day_pages(base):
+    day_dir = base / "generated" / "day"
+    return {
+        name: os.stat(day_dir / name).st_ino
+        for name in os.listdir(day_dir)
+        if name.endswith(".html")
+    }
+
+
+def test_unchanged_build_writes_nothing(small_site):
+    first = build(small_site)
+    pages = day_pages(small_site)
+    lastmod = BuildManifest(str(small_site / "generated")).lastmod(
+        "day/2026-03-06.html"
+    )
+
+    second = build(small_site)
+
+    # index.html, seven day pages and the stats page
+    assert first["pages_written"] == second["pages_skipped"] == 9
+    assert second["pages_written"] == 0
+    assert second["map_layers_written"] == second["feeds_written"] == 0
+    assert second["files_compressed"] == 0
+    assert day_pages(small_site) == pages
+    manifest = BuildManifest(str(small_site / "generated"))
+    assert manifest.lastmod("day/2026-03-06.html") == lastmod
+
+
+def test_changed_venue_rewrites_only_its_days(small_site):
+    build(small_site)
+    pages = day_pages(small_site)
+    write_json(
+        small_site / "data" / "zahel.json",
+        [opening("Zahel", "2026-03-05", "12:00", "23:00")],
+    )
+
+    counts = build(small_site)
+
+    rewritten = {
+        name for name, inode in day_pages(small_site).items() if pages[name] != inode
+    }
+    assert rewritten == {"2026-03-05.html", "2026-03-07.html"}
+    # Both day pages, the index and the stats
+    assert counts["pages_written"] == 4
+    day_dir = small_site / "generated" / "day"
+    assert b"Zahel" in (day_dir / "2026-03-05.html").read_bytes()
+    assert b"Zahel" not in (day_dir / "2026-03-07.html").read_bytes()
+
+
+def test_template_change_rewrites_everything(small_site):
+    build(small_site)
+
+    counts = build(small_site, minify=False)
+
+    assert counts["pages_written"] == 9 and counts["pages_skipped"] == 0
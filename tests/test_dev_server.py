@@ -0,0 +1,62 @@
+"""DevSite re-rendering after a data file changed"""
+
+import json
+import os
+import shutil
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip("bs4")
+
+
+def opening(day: date):
+    return {
+        "title": "Presshaus",
+        "start": f"{day.isoformat()}T14:00:00",
+        "end": f"{day.isoformat()}T23:59:00",
+    }
+
+
+@pytest.fixture
+def site(tmp_path):
+    from build_static_site import HeurigenSiteGenerator
+    from dev_server import DevSite
+
+    shutil.copytree(os.path.join(ROOT, "input"), tmp_path / "input")
+    (tmp_path / "data").mkdir()
+    for filename in os.listdir(os.path.join(ROOT, "data")):
+        if filename.endswith(".json"):
+            shutil.copy(os.path.join(ROOT, "data", filename), tmp_path / "data")
+    return DevSite(HeurigenSiteGenerator(str(tmp_path)))
+
+
+def test_out_of_order_opening_is_rendered(site):
+    later = site.today + timedelta(days=21)
+    appended = site.today + timedelta(days=7)
+    path = os.path.join(site.generator.data_dir, "presshaus.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([opening(later)], f)
+    site.update_venues(["presshaus"])
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([opening(later), opening(appended)], f)
+    rendered = site.update_venues(["presshaus"])
+
+    assert rendered > 0
+    assert [event.first_day for event in site.venues["presshaus"]] == [
+        appended,
+        later,
+    ]
+    assert b"Presshaus" in site.pages[site.day_page(appended)]
+
+
+def test_lastmod_is_utc(site):
+    before = datetime.now(timezone.utc).replace(microsecond=0)
+    site.render([site.today])
+    after = datetime.now(timezone.utc)
+
+    lastmod = datetime.fromisoformat(site.page_lastmod("index.html"))
+    assert before <= lastmod <= after
@@ -0,0 +1,156 @@
+"""Columnar event store: JSON round trip, date range queries and staleness"""
+
+import json
+import os
+from datetime import date
+
+import pytest
+
+import event_store
+from event_store import EventStore, import_if_stale, import_json, write_store
+
+
+def event(day: str, start: str = "16:00", end: str = "23:00", **extra):
+    return {
+        "title": "Presshaus",
+        "start": f"{day}T{start}:00",
+        "end": f"{day}T{end}:00",
+        "url": "https://example.com/presshaus/",
+        "mapLink": "https://maps.example.com/presshaus",
+        "lat": 48.3,
+        "lng": 16.4,
+        **extra,
+    }
+
+
+def write(path, events):
+    path.write_text(json.dumps(events), encoding="utf-8")
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    data = tmp_path / "data"
+    (data / "archive").mkdir(parents=True)
+    (tmp_path / "heurigen_list.json").write_text(
+        json.dumps(
+            {
+                "presshaus": {"label": "Presshaus", "aliases": ["presshaus_alt"]},
+                "zahel": {"label": "Zahel"},
+            }
+        ),
+        encoding="utf-8",
+    )
+    write(data / "presshaus.json", [event("2026-10-24"), event("2026-10-25")])
+    write(
+        data / "zahel.json",
+        [
+            {
+                "title": "Zahel",
+                "start": "2026-10-24T12:00:00+02:00",
+                "end": "2026-10-25T01:00:00+02:00",
+            }
+        ],
+    )
+    # The archive repeats a current opening and has an older one under an alias
+    write(
+        data / "archive" / "presshaus_alt.json",
+        [
+            event("2025-10-24"),
+            {
+                "title": "Presshaus",
+                "start": "2026-10-24T16:00:00",
+                "allDay": False,
+                "extendedProps": {"end": "2026-10-24T23:00:00"},
+            },
+        ],
+    )
+    return data
+
+
+def test_import_merges_archive_and_aliases(data_dir, tmp_path):
+    path = str(tmp_path / "events.evs")
+
+    count = import_json(str(data_dir), str(tmp_path / "heurigen_list.json"), path)
+
+    with EventStore(path) as store:
+        assert count == len(store) == 4
+        # Sorted by wall-clock start, the repeated opening stored once
+        assert [store.venue_key(i) for i in range(len(store))] == [
+            "presshaus",
+            "zahel",
+            "presshaus",
+            "presshaus",
+        ]
+        assert store.event(2) == event("2026-10-24")
+        # Offsets survive the round trip
+        assert store.event(1) == {
+            "title": "Zahel",
+            "start": "2026-10-24T12:00:00+02:00",
+            "end": "2026-10-25T01:00:00+02:00",
+        }
+
+
+def test_range_query_includes_openings_past_midnight(tmp_path):
+    path = str(tmp_path / "events.evs")
+    write_store(
+        path,
+        [
+            ("presshaus", event("2026-10-23", "18:00", "23:00")),
+            (
+                "zahel",
+                event("2026-10-23", "20:00", "02:00") | {"end": "2026-10-24T02:00:00"},
+            ),
+            ("presshaus", event("2026-10-24")),
+            ("presshaus", event("2026-10-26")),
+            ("presshaus", event("2026-10-27", **{"allDay": True})),
+        ],
+    )
+
+    with EventStore(path) as store:
+        starts = [
+            e["start"]
+            for e in store.events_between(date(2026, 10, 24), date(2026, 10, 26))
+        ]
+        assert starts == [
+            "2026-10-23T20:00:00",
+            "2026-10-24T16:00:00",
+            "2026-10-26T16:00:00",
+        ]
+        assert store.events_between(date(2026, 10, 27), date(2026, 10, 27))[0]["allDay"]
+        assert store.events_between(date(2026, 11, 1), date(2026, 12, 31)) == []
+
+
+def test_export_writes_the_json_format_back(data_dir, tmp_path):
+    path = str(tmp_path / "events.evs")
+    import_json(
+        str(data_dir), str(tmp_path / "heurigen_list.json"), path, archive=False
+    )
+    out = tmp_path / "export"
+
+    with EventStore(path) as store:
+        counts = store.export_json(str(out))
+
+    assert counts == {"presshaus": 2, "zahel": 1}
+    assert json.loads((out / "presshaus.json").read_text()) == json.loads(
+        (data_dir / "presshaus.json").read_text()
+    )
+
+
+def test_store_is_rebuilt_only_when_data_changed(data_dir, tmp_path):
+    master = str(tmp_path / "heurigen_list.json")
+    path = str(data_dir / "events.evs")
+
+    assert import_if_stale(str(data_dir), master, path)
+    assert not import_if_stale(str(data_dir), master, path)
+
+    later = os.path.getmtime(path) + 10
+    os.utime(data_dir / "zahel.json", (later, later))
+    assert import_if_stale(str(data_dir), master, path)
+
+
+def test_foreign_file_is_refused(tmp_path):
+    path = tmp_path / "events.evs"
+    path.write_bytes(b"AUSEVT0\n" + b"\0" * event_store.HEADER.size)
+
+    with pytest.raises(ValueError):
+        EventStore(str(path))
@@ -0,0 +1,158 @@
+"""EventStream on data files written out of start order"""
+
+import json
+
+import event_stream
+import recurrence
+from event_stream import EventStream
+
+MASTER = {
+    "presshaus": {"label": "Presshaus", "aliases": ["presshaus_alt"]},
+    "zahel": {"label": "Zahel"},
+}
+
+
+def opening(title: str, day: str, start: str = "16:00", end: str = "22:00"):
+    return {
+        "title": title,
+        "start": f"{day}T{start}:00",
+        "end": f"{day}T{end}:00",
+    }
+
+
+def write(data_dir, key: str, events):
+    (data_dir / f"{key}.json").write_text(json.dumps(events), encoding="utf-8")
+
+
+def test_unsorted_file_is_sorted(tmp_path):
+    write(
+        tmp_path,
+        "presshaus",
+        [
+            opening("Presshaus", "2026-11-08"),
+            opening("Presshaus", "2026-10-24"),
+            opening("Presshaus", "2026-10-25"),
+        ],
+    )
+    write(tmp_path, "zahel", [opening("Zahel", "2026-10-24", "12:00")])
+    stream = EventStream(str(tmp_path), MASTER)
+
+    events = list(stream)
+
+    assert [(event.venue.key, event.start_iso) for event in events] == [
+        ("zahel", "2026-10-24T12:00:00"),
+        ("presshaus", "2026-10-24T16:00:00"),
+        ("presshaus", "2026-10-25T16:00:00"),
+        ("presshaus", "2026-11-08T16:00:00"),
+    ]
+    assert stream.unsorted_files == ["presshaus.json"]
+
+
+def test_unsorted_alias_file_is_merged_in_order(tmp_path):
+    write(tmp_path, "presshaus", [opening("Presshaus", "2026-10-31")])
+    write(
+        tmp_path,
+        "presshaus_alt",
+        [opening("Presshaus", "2026-11-07"), opening("Presshaus", "2026-10-30")],
+    )
+    stream = EventStream(str(tmp_path), MASTER)
+
+    starts = [event["start"] for event in stream.iter_normalized("presshaus")]
+
+    assert starts == [
+        "2026-10-30T16:00:00",
+        "2026-10-31T16:00:00",
+        "2026-11-07T16:00:00",
+    ]
+    assert stream.normalization.aliased["presshaus_alt"] == 2
+
+
+def test_sorted_files_are_not_reported(tmp_path):
+    write(
+        tmp_path,
+        "presshaus",
+        [opening("Presshaus", "2026-10-24"), opening("Presshaus", "2026-10-25")],
+    )
+    stream = EventStream(str(tmp_path), MASTER)
+
+    assert len(list(stream)) == 2
+    assert stream.unsorted_files == []
+
+
+def test_appended_opening_survives_overlap_sweep(tmp_path):
+    # Appended after a later opening it used to be swallowed as an overlap
+    write(
+        tmp_path,
+        "presshaus",
+        [
+            opening("Presshaus", "2026-10-24"),
+            opening("Presshaus", "2026-11-08", "14:00", "23:59"),
+            opening("Presshaus", "2026-10-25", "14:00", "23:59"),
+        ],
+    )
+    stream = EventStream(str(tmp_path), MASTER)
+
+    starts = [event.start_iso for event in stream.iter_key("presshaus")]
+
+    assert starts == [
+        "2026-10-24T16:00:00",
+        "2026-10-25T14:00:00",
+        "2026-11-08T14:00:00",
+    ]
+    assert stream.normalization.collapsed == 0
+
+
+def test_files_are_decoded_once(tmp_path, monkeypatch):
+    write(tmp_path, "presshaus", [opening("Presshaus", "2026-10-25")])
+    write(
+        tmp_path,
+        "zahel",
+        [opening("Zahel", "2026-10-24", "12:00"), opening("Zahel", "2026-10-23")],
+    )
+    decoded = []
+    iter_json_array = event_stream.iter_json_array
+
+    def counting(path, *args):
+        decoded.append(path.rsplit("/", 1)[-1])
+        return iter_json_array(path, *args)
+
+    monkeypatch.setattr(event_stream, "iter_json_array", counting)
+
+    assert len(list(EventStream(str(tmp_path), MASTER))) == 3
+    assert sorted(decoded) == ["presshaus.json", "zahel.json"]
+
+
+def test_entries_beyond_the_window_are_kept(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(event_stream, "SORT_WINDOW", 2)
+    days = ["2026-10-20", "2026-10-21", "2026-10-22", "2026-10-23", "2026-10-24"]
+    # Two places out of order is repaired, four is not
+    write(
+        tmp_path,
+        "presshaus",
+        [opening("Presshaus", day) for day in days[1:3] + days[:1] + days[3:]],
+    )
+    write(
+        tmp_path,
+        "zahel",
+        [opening("Zahel", day) for day in days[1:] + days[:1]],
+    )
+    stream = EventStream(str(tmp_path), MASTER)
+
+    presshaus = [event.start_iso[:10] for event in stream.iter_key("presshaus")]
+    zahel = [event["start"][:10] for event in stream.iter_venue("zahel.json")]
+
+    assert presshaus == days
+    # Yielded as soon as it is read rather than dropped
+    assert zahel == days[1:3] + days[:1] + days[3:]
+    assert stream.unsorted_files == ["presshaus.json", "zahel.json"]
+    out = capsys.readouterr().out
+    assert "zahel.json has entries more than 2 places out of order" in out
+    assert "presshaus.json has entries" not in out
+
+
+def test_expand_sorts_the_file():
+    entries = [opening("Presshaus", "2026-11-08"), opening("Presshaus", "2026-10-24")]
+
+    starts = [event["start"] for event in recurrence.expand(entries)]
+
+    assert starts == ["2026-10-24T16:00:00", "2026-11-08T16:00:00"]
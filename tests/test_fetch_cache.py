@@ -0,0 +1,94 @@
+"""Conditional requests and content-hash change detection of the scrapers"""
+
+import os
+import shutil
+
+import pytest
+
+from fetch_engine import FetchResult
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+URL = "https://example.com/oeffnungszeiten"
+
+pytest.importorskip("bs4")
+
+
+def page(content: bytes, status: int = 200, **headers) -> FetchResult:
+    return FetchResult(
+        key="presshaus", url=URL, status=status, content=content, headers=headers
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    from fetch_cache import FetchCache
+
+    return FetchCache(str(tmp_path / "fetch_cache.json"))
+
+
+def test_hash_ignores_markup_and_scripts(cache):
+    html = b"<p>Ausg'steckt <b>ab 16 Uhr</b></p><script>var t = 1</script>"
+
+    assert cache.content_hash(html) == cache.content_hash(
+        b"<div>Ausg'steckt\n  ab 16 Uhr</div><script>var t = 2</script>"
+    )
+    assert cache.content_hash(html) != cache.content_hash(b"<p>ab 17 Uhr</p>")
+
+
+def test_unchanged_page_reuses_events(cache):
+    events = [{"title": "Presshaus", "start": "2026-03-06T16:00:00"}]
+    # Nothing to reuse yet, so no conditional request
+    assert cache.conditional_headers("presshaus", URL) == {}
+
+    digest = cache.page_hash(page(b"<p>ab 16 Uhr</p>", ETag='"v1"'))
+    assert cache.cached_events("presshaus", URL, digest) is None
+    cache.store_events("presshaus", URL, digest, events)
+
+    assert cache.conditional_headers("presshaus", URL) == {"If-None-Match": '"v1"'}
+    assert cache.conditional_headers("zahel", URL) == {}
+    # 304 and a re-sent page with the same text both hit
+    assert cache.page_hash(page(b"", status=304)) == digest
+    assert cache.cached_events("presshaus", URL, digest) == events
+    same = cache.page_hash(page(b"<p>ab  16 Uhr</p>", ETag='"v2"'))
+    assert cache.cached_events("presshaus", URL, same) == events
+    changed = cache.page_hash(page(b"<p>ab 17 Uhr</p>"))
+    assert cache.cached_events("presshaus", URL, changed) is None
+
+
+def test_saved_cache_is_pruned_to_the_master_list(cache):
+    from fetch_cache import FetchCache
+
+    digest = cache.page_hash(page(b"<p>ab 16 Uhr</p>", **{"Last-Modified": "x"}))
+    cache.store_events("presshaus", URL, digest, [])
+    cache.store_events("zahel", URL, digest, [])
+    cache.store_events("klager", "https://example.com/klager", digest, [])
+
+    evicted = cache.prune({"presshaus": {"link_opening_hours_page": URL}})
+    cache.save()
+
+    assert sorted(evicted) == ["https://example.com/klager", f"{URL} (zahel)"]
+    reloaded = FetchCache(cache.path)
+    assert list(reloaded.entries) == [URL]
+    assert reloaded.conditional_headers("presshaus", URL) == {"If-Modified-Since": "x"}
+
+
+def test_scraper_runs_only_for_changed_content(tmp_path, monkeypatch):
+    from enhanced_site_generator import EnhancedHeurigenSiteGenerator
+
+    shutil.copytree(os.path.join(ROOT, "input"), tmp_path / "input")
+    generator = EnhancedHeurigenSiteGenerator(str(tmp_path))
+    scraped = []
+
+    def scrape(heurigen_key, heurigen_data, fetched):
+        scraped.append(fetched.content)
+        return [{"title": heurigen_data["label"], "start": "2026-03-06T16:00:00"}]
+
+    monkeypatch.setattr(generator, "scrape_opening_hours", scrape)
+    presshaus = generator.heurigen_master["presshaus"]
+
+    first = generator.scrape_if_changed("presshaus", presshaus, page(b"<p>16</p>"))
+    again = generator.scrape_if_changed("presshaus", presshaus, page(b"<p> 16 </p>"))
+    changed = generator.scrape_if_changed("presshaus", presshaus, page(b"<p>17</p>"))
+
+    assert first == again == changed
+    assert scraped == [b"<p>16</p>", b"<p>17</p>"]
@@ -0,0 +1,201 @@
+"""FetchEngine against local stand-in HTTP servers
+
+Every server is a separate host to the engine (host:port), and all of them
+record how many requests were in flight at once, per host and in total.
+"""
+
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from fetch_engine import FetchEngine
+
+HOSTS = 3
+
+
+class StandIn:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.active = Counter()
+            self.max_active = Counter()
+            self.total = 0
+            self.max_total = 0
+            # Requests seen per path, for failing the first N of them
+            self.hits = Counter()
+
+    def enter(self, host: str, path: str) -> int:
+        with self.lock:
+            self.active[host] += 1
+            self.total += 1
+            self.max_active[host] = max(self.max_active[host], self.active[host])
+            self.max_total = max(self.max_total, self.total)
+            self.hits[path] += 1
+            return self.hits[path]
+
+    def leave(self, host: str):
+        with self.lock:
+            self.active[host] -= 1
+            self.total -= 1
+
+
+def make_handler(state: StandIn):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            host = self.headers["Host"]
+            hit = state.enter(host, self.path)
+            try:
+                time.sleep(float(query.get("sleep", 0)))
+                status = 200
+                if hit <= int(query.get("fail", 0)):
+                    status = int(query.get("status", 503))
+                body = f"{url.path} {hit}".encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                state.leave(host)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+@pytest.fixture(scope="module")
+def servers():
+    state = StandIn()
+    started = []
+    for _ in range(HOSTS):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(state))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        started.append(server)
+    yield state, [f"http://127.0.0.1:{server.server_address[1]}" for server in started]
+    for server in started:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def stand_in(servers):
+    state, bases = servers
+    state.reset()
+    return state, bases
+
+
+def test_per_host_limit(stand_in):
+    state, bases = stand_in
+    engine = FetchEngine(max_workers=8, per_host=2)
+    urls = {f"page{i}": f"{bases[0]}/page{i}?sleep=0.2" for i in range(6)}
+
+    results = engine.fetch_all(urls)
+
+    assert all(result.ok for result in results.values())
+    assert state.max_active[bases[0][len("http://") :]] == 2
+
+
+def test_global_limit(stand_in):
+    state, bases = stand_in
+    engine = FetchEngine(max_workers=2, per_host=4)
+    urls = {f"page{i}": f"{bases[i % HOSTS]}/page{i}?sleep=0.2" for i in range(6)}
+
+    results = engine.fetch_all(urls)
+
+    assert all(result.ok for result in results.values())
+    assert state.max_total == 2
+
+
+def test_total_time_is_bounded_by_slowest_site(stand_in):
+    _, bases = stand_in
+    engine = FetchEngine(max_workers=6, per_host=2)
+    urls = {f"page{i}": f"{bases[i % HOSTS]}/page{i}?sleep=0.3" for i in range(6)}
+
+    started = time.monotonic()
+    results = engine.fetch_all(urls)
+    elapsed = time.monotonic() - started
+
+    assert all(result.ok for result in results.values())
+    # One after another would take 1.8s
+    assert elapsed < 0.9
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_retries_transient_status(stand_in, status):
+    _, bases = stand_in
+    engine = FetchEngine(retries=2, backoff=0.01)
+
+    result = engine.fetch("venue", f"{bases[0]}/flaky?fail=2&status={status}")
+
+    assert result.ok
+    assert result.attempts == 3
+    assert result.content == b"/flaky 3"
+
+
+def test_gives_up_after_retries(stand_in):
+    _, bases = stand_in
+    engine = FetchEngine(retries=2, backoff=0.01)
+
+    result = engine.fetch("venue", f"{bases[0]}/down?fail=10&status=503")
+
+    assert not result.ok
+    assert result.attempts == 3
+    assert result.status == 503
+    assert result.error == "HTTP 503"
+
+
+def test_no_retry_on_client_error(stand_in):
+    _, bases = stand_in
+    engine = FetchEngine(retries=2, backoff=0.01)
+
+    result = engine.fetch("venue", f"{bases[0]}/missing?fail=1&status=404")
+
+    assert not result.ok
+    assert result.attempts == 1
+    assert result.status == 404
+
+
+def test_backoff_doubles(stand_in):
+    _, bases = stand_in
+    engine = FetchEngine(retries=2, backoff=0.1)
+
+    result = engine.fetch("venue", f"{bases[0]}/backoff?fail=2")
+
+    assert result.ok
+    # 0.1s after the first attempt, 0.2s after the second
+    assert result.elapsed >= 0.3
+
+
+def test_deadline_stops_slow_request(stand_in):
+    _, bases = stand_in
+    engine = FetchEngine(timeout=10, deadline=0.3)
+
+    result = engine.fetch("venue", f"{bases[0]}/hang?sleep=2")
+
+    assert not result.ok
+    assert result.error is not None
+    assert result.elapsed < 1.0
+
+
+def test_deadline_cuts_retries_short(stand_in):
+    _, bases = stand_in
+    engine = FetchEngine(retries=5, backoff=0.2, deadline=0.5)
+
+    result = engine.fetch("venue", f"{bases[0]}/always?fail=10&status=503")
+
+    assert not result.ok
+    # Attempts at 0s, 0.2s; the next backoff (0.4s) would pass the deadline
+    assert result.attempts == 2
+    assert result.elapsed < 0.5
@@ -0,0 +1,134 @@
+"""Opening hours comments of the master list turned into events
+
+The comments are pinned: when one changes, check what the generic scraper
+makes of it before updating the expectations below.
+"""
+
+import json
+import os
+from collections import Counter
+from datetime import date, datetime
+
+import pytest
+
+import recurrence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip("bs4")
+
+# Comment -> (weekday, start) -> events between 2026-04-20 and 2026-06-14
+RESOLVED = {
+    "almdudler_standl": (
+        "Dieser Heuriger hat immer Samstag und Sonntag geöffnet, ab 16 Uhr bis 22 Uhr.",
+        {(5, "16:00"): 8, (6, "16:00"): 8},
+    ),
+    "wieninger": (
+        "Die Öffnungszeiten auf der Website sind nicht eindeutig. Die sichere Variante "
+        "ist folgende: Samstag 12:00 - 00:00 und Sonntag & Feiertags 12:00 - 22:00 Uhr",
+        # May Day, Ascension, Whit Monday and Corpus Christi
+        {
+            (0, "12:00"): 1,
+            (3, "12:00"): 2,
+            (4, "12:00"): 1,
+            (5, "12:00"): 8,
+            (6, "12:00"): 8,
+        },
+    ),
+    "biohof_nummer_5": (
+        "bei Schönwetter Samstag und Sonntag ab 14:00 Uhr",
+        {(5, "14:00"): 8, (6, "14:00"): 8},
+    ),
+    "lentner_koarl": (
+        "Die Öffnungszeiten sind Samstag, Sonntag u. Feiertag ab 14:00 Uhr",
+        {
+            (0, "14:00"): 1,
+            (3, "14:00"): 2,
+            (4, "14:00"): 1,
+            (5, "14:00"): 8,
+            (6, "14:00"): 8,
+        },
+    ),
+    "reinbacher": (
+        "MO-FR 14:00 in folgendem Zeitraum von 13.1.-31.1. 22.4.-16.5. 2.6.-27.6. 9.6. "
+        "geschl. 24.2.-28.3. 4.8.-5.9. 6.10.-7.11. / 1.12. -30.12",
+        # 22.4.-16.5. and 2.6.-14.6. without 9.6.
+        {
+            (0, "14:00"): 4,
+            (1, "14:00"): 4,
+            (2, "14:00"): 6,
+            (3, "14:00"): 6,
+            (4, "14:00"): 6,
+        },
+    ),
+    "weinhandwerk": (
+        "FR+SA: 15:00, SO: 12:00 im Zeitraum von 28.4.-19.10.",
+        {(4, "15:00"): 7, (5, "15:00"): 7, (6, "12:00"): 7},
+    ),
+    "duschl": ("Bitte ignoriere das Facebook Widget.", {}),
+    "kammerer": ("Öffnungszeiten beziehen sich auf das ganze Jahr.", {}),
+}
+
+# Comments the rules cannot fully describe keep the venue's data file
+UNRESOLVED = {
+    "klager": "hier ist ein genauer Plan als pdf lokal gespeichert: "
+    "input/WeingutKlager_2026_105x74mm_final.pdf",
+    "dornroeschenkeller": "8. März - 21. Dezember 2025 | März, April, Mai, Juli, August, "
+    "Oktober, November: ab 2. Samstag 16 Tage lang geöffnet | Monaten März, April, Mai, "
+    "Juli, August, Oktober, November ab 2. Samstag 16 Tage lang geöffnet. Im Dezember "
+    "bis am 3. Adventsonntag. 16 Tage-Block: täglich 14.00 bis 23.00 Uhr (Montag bis "
+    "Sonntag und Feiertag)",
+    "gustl": "FR-S0: 12:00 im Zeitraum von Ende April bis Mitte Juli / September / Oktober",
+}
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2026, 4, 20, 9, 0, tzinfo=tz)
+
+
+@pytest.fixture(scope="module")
+def generator():
+    import enhanced_site_generator
+
+    patch = pytest.MonkeyPatch()
+    patch.setattr(enhanced_site_generator, "datetime", FrozenDatetime)
+    yield enhanced_site_generator.EnhancedHeurigenSiteGenerator(ROOT)
+    patch.undo()
+
+
+def test_comments_are_pinned(generator):
+    comments = {
+        key: data["comment"]
+        for key, data in generator.heurigen_master.items()
+        if data.get("comment")
+    }
+
+    assert comments == {
+        **{key: comment for key, (comment, _) in RESOLVED.items()},
+        **UNRESOLVED,
+    }
+
+
+@pytest.mark.parametrize("key", sorted(RESOLVED))
+def test_resolved_comment(generator, key):
+    events = recurrence.expand(
+        generator._scrape_generic(key, generator.heurigen_master[key])
+    )
+
+    opened = Counter(
+        (date.fromisoformat(event["start"][:10]).weekday(), event["start"][11:16])
+        for event in events
+    )
+    assert opened == Counter(RESOLVED[key][1])
+    assert all("2026-04-20" <= event["start"] < "2026-06-15" for event in events)
+
+
+@pytest.mark.parametrize("key", sorted(UNRESOLVED))
+def test_unresolved_comment_keeps_data(generator, key, capsys):
+    events = generator._scrape_generic(key, generator.heurigen_master[key])
+
+    with open(os.path.join(ROOT, "data", f"{key}.json"), encoding="utf-8") as f:
+        assert events == json.load(f)
+    assert "Could not resolve the schedule" in capsys.readouterr().out
@@ -0,0 +1,67 @@
+"""Opening hours rules expanded across Austrian public holidays"""
+
+from datetime import date
+
+import pytest
+
+import german_dates
+
+
+def open_days(text: str, first: date, last: date):
+    rules = german_dates.opening_rules(german_dates.extract(text, first.year))
+    return sorted(
+        start.date()
+        for rule in rules
+        for start, _ in german_dates.expand_rule(rule, first, last)
+    )
+
+
+@pytest.mark.parametrize(
+    "year, easter",
+    [(2024, date(2024, 3, 31)), (2025, date(2025, 4, 20)), (2026, date(2026, 4, 5))],
+)
+def test_easter_sunday(year, easter):
+    assert german_dates.easter_sunday(year) == easter
+
+
+def test_public_holidays():
+    holidays = german_dates.public_holidays(2026)
+
+    assert len(holidays) == 15
+    # Easter Monday, Ascension, Whit Monday, Corpus Christi, National Day
+    for day in [(4, 6), (5, 14), (5, 25), (6, 4), (10, 26)]:
+        assert date(2026, *day) in holidays
+    assert not german_dates.is_public_holiday(date(2026, 5, 13))
+
+
+def test_weekend_rule_opens_on_weekday_holiday():
+    # Ascension is a Thursday in 2026
+    days = open_days(
+        "Sa, So und Feiertag ab 14 Uhr", date(2026, 5, 11), date(2026, 5, 17)
+    )
+
+    assert days == [date(2026, 5, 14), date(2026, 5, 16), date(2026, 5, 17)]
+
+
+def test_closed_on_holidays():
+    # May Day is a Friday in 2026
+    days = open_days(
+        "Fr ab 16 Uhr, an Feiertagen geschlossen", date(2026, 4, 27), date(2026, 5, 8)
+    )
+
+    assert days == [date(2026, 5, 8)]
+
+
+def test_except_holidays():
+    # Corpus Christi is a Thursday in 2026
+    days = open_days(
+        "Do–So 16-22 Uhr außer Feiertag", date(2026, 6, 1), date(2026, 6, 7)
+    )
+
+    assert days == [date(2026, 6, 5), date(2026, 6, 6), date(2026, 6, 7)]
+
+
+def test_rules_without_holidays_ignore_them():
+    days = open_days("Do ab 16 Uhr", date(2026, 5, 11), date(2026, 5, 17))
+
+    assert days == [date(2026, 5, 14)]
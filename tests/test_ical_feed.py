@@ -0,0 +1,129 @@
+"""iCalendar feeds per venue and for all venues"""
+
+import os
+
+import ical_feed
+from event_model import Event, Venue, parse_datetime
+
+
+def build(base):
+    from build_static_site import build_region
+
+    build_region(str(base), True, "stammersdorf")
+
+
+def unfold(path):
+    with open(path, "rb") as f:
+        content = f.read()
+    assert content.endswith(b"\r\n") and b"\n" not in content.replace(b"\r\n", b"")
+    return content.replace(b"\r\n ", b"").decode("utf-8").split("\r\n")[:-1]
+
+
+def events(lines):
+    """(UID, DTSTART) of every VEVENT, skipping the VTIMEZONE block"""
+    found = []
+    uid = None
+    for line in lines:
+        if line.startswith("UID:"):
+            uid = line[4:]
+        elif line.startswith("DTSTART") and uid:
+            found.append((uid, line))
+            uid = None
+    return found
+
+
+def test_long_lines_fold_between_characters():
+    line = "SUMMARY:" + "Weingut Klager – Heuriger in Stammersdorf ö" * 4
+
+    folded = ical_feed.fold(line)
+
+    first, *continued = folded.split(b"\r\n")[:-1]
+    assert continued and all(len(part) <= 75 for part in [first] + continued)
+    # Continuation lines start with a space and never split a character
+    assert all(part.startswith(b" ") for part in continued)
+    assert [part.decode("utf-8") for part in [first] + continued]
+    unfolded = first + b"".join(part[1:] for part in continued)
+    assert unfolded.decode("utf-8") == line
+
+
+def test_event_lines_escape_text_and_carry_the_venue():
+    venue = Venue(
+        "klager",
+        "Klager; Stammersdorf, Wien",
+        url="https://example.com/klager/",
+        map_link="https://maps.example.com/klager",
+        lat=48.3032,
+        lng=16.4107,
+    )
+    # Open past midnight, and a UTC timestamp as some scrapers deliver
+    late = Event(
+        venue,
+        parse_datetime("2026-03-06T18:00:00"),
+        parse_datetime("2026-03-07T01:00:00"),
+    )
+    utc = Event(venue, parse_datetime("2026-03-08T15:00:00Z"))
+
+    assert list(ical_feed.event_lines(late)) == [
+        "BEGIN:VEVENT",
+        "UID:klager-20260306T180000@auschecktis.at",
+        "DTSTAMP:20260306T000000Z",
+        "DTSTART;TZID=Europe/Vienna:20260306T180000",
+        "DTEND;TZID=Europe/Vienna:20260307T010000",
+        "SUMMARY:Klager\\; Stammersdorf\\, Wien - Ausg'steckt",
+        "URL:https://example.com/klager/",
+        "GEO:48.3032;16.4107",
+        "DESCRIPTION:Google Maps: https://maps.example.com/klager",
+        "END:VEVENT",
+    ]
+    assert list(ical_feed.event_lines(utc))[3:5] == [
+        "DTSTART:20260308T150000Z",
+        "DTEND:20260309T000000Z",
+    ]
+
+
+def test_feeds_per_venue_and_combined(small_site):
+    build(small_site)
+    ical_dir = small_site / "generated" / "ical"
+
+    presshaus = unfold(ical_dir / "presshaus.ics")
+    combined = unfold(ical_dir / "all.ics")
+
+    assert presshaus[0] == "BEGIN:VCALENDAR" and presshaus[-1] == "END:VCALENDAR"
+    assert "X-WR-CALNAME:AusCheckt Is - Presshaus" in presshaus
+    assert events(presshaus) == [
+        (
+            "presshaus-20260306T160000@auschecktis.at",
+            "DTSTART;TZID=Europe/Vienna:20260306T160000",
+        ),
+        (
+            "presshaus-20260307T160000@auschecktis.at",
+            "DTSTART;TZID=Europe/Vienna:20260307T160000",
+        ),
+    ]
+    # All venues of the region in start order, none of the other region
+    assert [uid for uid, _ in events(combined)] == [
+        "presshaus-20260306T160000@auschecktis.at",
+        "zahel-20260307T120000@auschecktis.at",
+        "presshaus-20260307T160000@auschecktis.at",
+    ]
+    assert sorted(name for name in os.listdir(ical_dir) if name.endswith(".ics")) == [
+        "all.ics",
+        "presshaus.ics",
+        "zahel.ics",
+    ]
+
+
+def test_unchanged_feeds_are_kept_and_gone_venues_removed(small_site):
+    build(small_site)
+    ical_dir = small_site / "generated" / "ical"
+    inode = os.stat(ical_dir / "presshaus.ics").st_ino
+    os.remove(small_site / "data" / "zahel.json")
+
+    build(small_site)
+
+    assert os.stat(ical_dir / "presshaus.ics").st_ino == inode
+    assert not (ical_dir / "zahel.ics").exists()
+    assert [uid for uid, _ in events(unfold(ical_dir / "all.ics"))] == [
+        "presshaus-20260306T160000@auschecktis.at",
+        "presshaus-20260307T160000@auschecktis.at",
+    ]
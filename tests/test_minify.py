@@ -0,0 +1,101 @@
+"""Template minification and precompressed variants"""
+
+import gzip
+import json
+
+from build_manifest import BuildManifest
+from minify import minify_css, minify_html, minify_js, minify_json
+from precompress import precompress, suffixes
+
+
+def test_css_declarations_lose_whitespace():
+    source = """
+    /* layout */
+    .card , .list > li {
+        margin : 0 auto ;
+        color: #333;
+    }
+    @media (max-width: 600px) {
+        .card { padding : 0 }
+    }
+    """
+
+    assert minify_css(source) == (
+        ".card,.list>li{margin:0 auto;color:#333}"
+        "@media (max-width: 600px){.card{padding:0}}"
+    )
+
+
+def test_css_selectors_strings_and_urls_are_kept():
+    source = """
+    nav a :hover { color: red; }
+    .note::before { content: " : > ; { } "; }
+    .logo { background: url(data:image/svg+xml;utf8,<svg></svg>); }
+    @font-face { src: url( "assets/font : a.ttf" ) format("truetype"); }
+    """
+
+    assert minify_css(source) == (
+        "nav a :hover{color:red}"
+        '.note::before{content:" : > ; { } "}'
+        ".logo{background:url(data:image/svg+xml;utf8,<svg></svg>)}"
+        '@font-face{src:url( "assets/font : a.ttf" ) format("truetype")}'
+    )
+
+
+def test_html_keeps_slots_and_script_lines():
+    source = """<html>
+        <!-- navigation -->
+        <p>{{title}}</p>
+        <script>
+            // one line each
+            var a = 1
+            var b = a
+        </script>
+        <script type="application/ld+json">
+            {"name": "{{title}}",
+             "url": "https://example.com/"}
+        </script>
+        <style>a :hover { color : red ; }</style>
+    </html>"""
+
+    assert minify_html(source) == (
+        "<html>\n<p>{{title}}</p>\n"
+        "<script>var a = 1\nvar b = a</script>\n"
+        '<script type="application/ld+json">'
+        '{"name":"{{title}}","url":"https://example.com/"}</script>\n'
+        "<style>a :hover{color:red}</style>\n</html>"
+    )
+
+
+def test_json_templates_with_slots_only_lose_indentation():
+    assert minify_json("[\n  {{events}}\n]") == "[\n{{events}}\n]"
+    assert minify_js("  a()\n\n  // b\n  c()") == "a()\nc()"
+
+
+def test_precompress_skips_unchanged_files(tmp_path):
+    page = tmp_path / "index.html"
+    page.write_text("<p>" + "Heuriger " * 200 + "</p>", encoding="utf-8")
+    (tmp_path / "build_report.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "font.ttf").write_bytes(b"\0" * 100)
+    manifest = BuildManifest(str(tmp_path))
+
+    sizes, written = precompress(str(tmp_path), manifest)
+
+    assert list(sizes) == ["index.html"]
+    assert written == [str(page) + suffix for suffix in suffixes()]
+    assert gzip.decompress((tmp_path / "index.html.gz").read_bytes()) == (
+        page.read_bytes()
+    )
+    assert sizes["index.html"]["gz"] < sizes["index.html"]["bytes"]
+
+    _, written = precompress(str(tmp_path), manifest)
+    assert written == []
+
+    page.write_text("<p>geschlossen</p>", encoding="utf-8")
+    _, written = precompress(str(tmp_path), manifest)
+    assert written == [str(page) + suffix for suffix in suffixes()]
+
+    page.unlink()
+    sizes, _ = precompress(str(tmp_path), manifest)
+    assert sizes == {} and not (tmp_path / "index.html.gz").exists()
+    assert json.loads((tmp_path / "build_report.json").read_text()) == {}
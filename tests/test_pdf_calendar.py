@@ -0,0 +1,103 @@
+"""PDF calendar ingestion against the bundled Klager flyer"""
+
+import json
+import os
+import shutil
+from datetime import time
+
+import pytest
+
+import pdf_calendar
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KLAGER_PDF = os.path.join(ROOT, "input", "WeingutKlager_2026_105x74mm_final.pdf")
+
+pytest.importorskip("pypdf")
+
+
+@pytest.fixture(scope="module")
+def klager_pages():
+    with open(KLAGER_PDF, "rb") as f:
+        return list(pdf_calendar.iter_page_text(f.read()))
+
+
+@pytest.fixture(scope="module")
+def klager():
+    with open(os.path.join(ROOT, "input", "heurigen_list.json"), encoding="utf-8") as f:
+        return json.load(f)["klager"]
+
+
+def test_klager_text_has_opening_hours_only(klager_pages):
+    year, rules = pdf_calendar.extract_rules(klager_pages, 2025)
+
+    assert year == 2026
+    assert len(pdf_calendar.GRID_HEADER_RE.findall("\n".join(klager_pages))) == 12
+    # Weekdays from 15:00, weekends and holidays from 12:00, none of them dated
+    assert sorted(rule.window.start for rule in rules) == [time(12), time(15)]
+    assert all(rule.dates is None for rule in rules)
+    for rule in rules:
+        closed = [exclusion.weekdays for exclusion in rule.exclusions]
+        assert frozenset({1, 2}) in closed
+
+
+def test_klager_flyer_is_refused(klager_pages, klager):
+    # The open days are colour-marked in the grids; the text would open the whole year
+    with pytest.raises(pdf_calendar.UnmarkedCalendarError):
+        pdf_calendar.events_from_pages(klager_pages, klager, 2026)
+
+
+def test_dated_flyer_is_accepted(klager):
+    pages = [
+        " M D M D F S S\n 1 2 3 4 5 6 7\n",
+        "Ausg'steckt 26.-28. Juni 2026, Fr–So ab 16 Uhr",
+    ]
+
+    events = pdf_calendar.events_from_pages(pages, klager, 2025)
+
+    assert [event["start"] for event in events] == [
+        "2026-06-26T16:00:00",
+        "2026-06-27T16:00:00",
+        "2026-06-28T16:00:00",
+    ]
+    assert events[0]["title"] == klager["label"]
+
+
+def test_ingestion_keeps_hand_made_data(tmp_path):
+    pytest.importorskip("bs4")
+    from enhanced_site_generator import EnhancedHeurigenSiteGenerator
+
+    shutil.copytree(os.path.join(ROOT, "input"), tmp_path / "input")
+    (tmp_path / "data").mkdir()
+    data_file = tmp_path / "data" / "klager.json"
+    shutil.copy(os.path.join(ROOT, "data", "klager.json"), data_file)
+    before = data_file.read_bytes()
+
+    generator = EnhancedHeurigenSiteGenerator(str(tmp_path))
+    calendars = generator.ingest_pdf_calendars()
+
+    assert "klager" not in calendars
+    assert data_file.read_bytes() == before
+
+
+def test_refusal_is_cached(tmp_path, monkeypatch, capsys):
+    pytest.importorskip("bs4")
+    from enhanced_site_generator import EnhancedHeurigenSiteGenerator
+
+    shutil.copytree(os.path.join(ROOT, "input"), tmp_path / "input")
+    (tmp_path / "data").mkdir()
+    shutil.copy(os.path.join(ROOT, "data", "klager.json"), tmp_path / "data")
+    EnhancedHeurigenSiteGenerator(str(tmp_path)).ingest_pdf_calendars()
+
+    def parse(*args):
+        raise AssertionError("unchanged PDF parsed again")
+
+    monkeypatch.setattr(pdf_calendar, "events_from_pdf", parse)
+    calendars = EnhancedHeurigenSiteGenerator(str(tmp_path)).ingest_pdf_calendars()
+
+    assert "klager" not in calendars
+    assert "PDF unchanged, still not using it" in capsys.readouterr().out
+    cache = pdf_calendar.PdfCalendarCache(
+        str(tmp_path / "input" / "pdf_calendar_cache.json")
+    )
+    assert "month grids" in cache.entries["klager"]["refused"]
+    assert cache.cached_events("klager", cache.entries["klager"]["sha256"]) is None
@@ -0,0 +1,95 @@
+"""Recurrence rules: compact/expand round trip and windowed expansion"""
+
+import glob
+import json
+import os
+from datetime import date
+
+import pytest
+
+import recurrence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_FILES = sorted(
+    glob.glob(os.path.join(ROOT, "data", "*.json"))
+    + glob.glob(os.path.join(ROOT, "data", "archive", "*.json"))
+)
+
+RULE = {
+    "title": "Zahel",
+    "start": "2026-03-06T18:00:00",
+    "end": "2026-03-07T01:00:00",
+    "recurrence": {
+        "weekdays": ["Fr", "Sa"],
+        "until": "2026-03-21",
+        "except": ["2026-03-13"],
+    },
+}
+
+
+@pytest.mark.parametrize(
+    "path", DATA_FILES, ids=[os.path.basename(path) for path in DATA_FILES]
+)
+def test_data_files_round_trip(path):
+    with open(path, "r", encoding="utf-8") as f:
+        events = recurrence.expand(json.load(f))
+
+    compacted = recurrence.compact(events)
+
+    assert recurrence.expand(compacted) == events
+    assert len(compacted) <= len(events)
+
+
+def test_regular_openings_become_one_rule():
+    events = recurrence.expand([RULE])
+
+    assert [event["start"][:10] for event in events] == [
+        "2026-03-06",
+        "2026-03-07",
+        "2026-03-14",
+        "2026-03-20",
+        "2026-03-21",
+    ]
+    # Open past midnight: every occurrence ends the next day
+    assert events[-1]["end"] == "2026-03-22T01:00:00"
+    assert recurrence.compact(events) == [RULE]
+
+
+def test_expansion_is_limited_to_the_window():
+    # The Saturday opening of the 7th is still open on the 8th
+    events = list(
+        recurrence.iter_occurrences(
+            RULE, since=date(2026, 3, 8), until=date(2026, 3, 14)
+        )
+    )
+
+    assert [event["start"][:10] for event in events] == ["2026-03-07", "2026-03-14"]
+
+
+def test_rules_and_explicit_events_merge_in_start_order():
+    explicit = {
+        "title": "Zahel",
+        "start": "2026-03-10T12:00:00",
+        "end": "2026-03-10T22:00:00",
+    }
+
+    starts = [
+        event["start"][:10] for event in recurrence.iter_expanded([RULE, explicit])
+    ]
+
+    assert starts == [
+        "2026-03-06",
+        "2026-03-07",
+        "2026-03-10",
+        "2026-03-14",
+        "2026-03-20",
+        "2026-03-21",
+    ]
+
+
+def test_short_and_irregular_series_stay_explicit():
+    events = [
+        {"title": "Zahel", "start": f"2026-03-{day:02d}T16:00:00"} for day in (6, 7)
+    ] + [{"title": "Zahel", "start": "2026-04-30T16:00:00"}]
+
+    assert recurrence.compact(events) == events
@@ -0,0 +1,94 @@
+"""Regions: each one is built from its own data into its own output"""
+
+import json
+import os
+
+import pytest
+
+from conftest import opening, write_json
+from regions import load_regions
+
+
+def pages(directory):
+    """Day page name -> inode"""
+    return {
+        name: os.stat(directory / name).st_ino
+        for name in os.listdir(directory)
+        if name.endswith(".html")
+    }
+
+
+def test_regions_default_to_their_own_directories(small_site):
+    regions = load_regions(str(small_site))
+
+    assert list(regions) == ["stammersdorf", "wachau"]
+    wachau = regions["wachau"]
+    assert wachau.path == "wachau" and wachau.url_prefix == "/wachau/"
+    assert wachau.master_list == os.path.join(
+        str(small_site), "input/wachau/heurigen_list.json"
+    )
+    assert wachau.data_dir == os.path.join(str(small_site), "data/wachau")
+    assert regions["stammersdorf"].output_dir("generated") == "generated"
+
+
+def test_region_paths_must_not_shadow_shared_output(small_site):
+    write_json(
+        small_site / "input" / "regions.json",
+        {"wachau": {"name": "Wachau", "center": [48.36, 15.42], "path": "map/wachau"}},
+    )
+
+    with pytest.raises(ValueError, match="reserved"):
+        load_regions(str(small_site))
+
+
+def test_regions_only_show_their_own_venues(small_site):
+    from build_static_site import build_regions
+
+    build_regions(str(small_site))
+    generated = small_site / "generated"
+
+    for name in os.listdir(generated / "day"):
+        assert b"Donauhof" not in (generated / "day" / name).read_bytes()
+    assert sorted(pages(generated / "wachau" / "day")) == [
+        f"2026-03-0{day}.html" for day in range(1, 9)
+    ]
+    saturday = (generated / "wachau" / "day" / "2026-03-08.html").read_bytes()
+    assert b"Donauhof" in saturday and b"Presshaus" not in saturday
+    summary = json.loads((generated / "wachau" / "region.json").read_bytes())
+    assert summary["url"] == "/wachau/" and summary["venues"] == 1
+    assert summary["open"] == {"2026-03-08": 1}
+    regions_page = (generated / "regions" / "index.html").read_text(encoding="utf-8")
+    assert "Stammersdorf" in regions_page and "Wachau" in regions_page
+
+
+def test_rebuilding_one_region_leaves_the_others_alone(small_site):
+    from build_static_site import build_regions
+
+    build_regions(str(small_site))
+    generated = small_site / "generated"
+    stammersdorf = pages(generated / "day")
+    write_json(
+        small_site / "data" / "wachau" / "donauhof.json",
+        [opening("Donauhof", day) for day in ("2026-03-08", "2026-03-09")],
+    )
+
+    build_regions(str(small_site), keys=["wachau"])
+
+    assert pages(generated / "day") == stammersdorf
+    assert "2026-03-09.html" in pages(generated / "wachau" / "day")
+    summary = json.loads((generated / "wachau" / "region.json").read_bytes())
+    assert summary["open"] == {"2026-03-08": 1, "2026-03-09": 1}
+
+
+def test_root_region_does_not_own_other_regions_or_shared_files(small_site):
+    from build_static_site import HeurigenSiteGenerator
+
+    regions = load_regions(str(small_site))
+    root = HeurigenSiteGenerator(str(small_site), True, regions["stammersdorf"])
+    wachau = HeurigenSiteGenerator(str(small_site), True, regions["wachau"])
+
+    assert root.owns("day/2026-03-06.html") and root.owns("index.html")
+    assert not root.owns("wachau/day/2026-03-08.html")
+    assert not root.owns("sw.js") and not root.owns("regions/index.html")
+    assert wachau.owns("day/2026-03-08.html")
+    assert root.is_shared("sitemap.xml") and not root.is_shared("sitemap-2026.xml.gz")
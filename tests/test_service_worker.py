@@ -0,0 +1,145 @@
+"""generated sw.js run under node against an in-memory Cache Storage"""
+
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+import service_worker
+from asset_pipeline import AssetPipeline
+from site_templates import SiteTemplates
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Installs and activates each build's worker against that build's server, then
+# fetches the given paths through the last worker
+HARNESS = r"""
+const vm = require('vm');
+const { builds, fetches } = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const ORIGIN = 'https://auschecktis.test';
+const response = (body, status = 200) => ({
+    body, status, ok: status === 200, clone() { return response(body, status); },
+});
+const key = request => new URL(typeof request === 'string' ? request : request.url, ORIGIN).href;
+let server = {};
+const fetchUrl = async request => {
+    const path = new URL(key(request)).pathname;
+    return path in server ? response(server[path]) : response('', 404);
+};
+const stores = new Map();
+const open = name => {
+    if (!stores.has(name)) stores.set(name, new Map());
+    const store = stores.get(name);
+    return {
+        match: async request => store.get(key(request)),
+        put: async (request, value) => { store.set(key(request), value); },
+        add: async request => { store.set(key(request), await fetchUrl(request)); },
+        addAll: async requests => {
+            for (const request of requests) store.set(key(request), await fetchUrl(request));
+        },
+        keys: async () => [...store.keys()].map(url => ({ url })),
+    };
+};
+const caches = {
+    open: async name => open(name),
+    keys: async () => [...stores.keys()],
+    delete: async name => stores.delete(name),
+    match: async (request, options = {}) => {
+        const names = options.cacheName ? [options.cacheName] : [...stores.keys()];
+        for (const name of names) {
+            if (stores.has(name) && stores.get(name).has(key(request))) {
+                return stores.get(name).get(key(request));
+            }
+        }
+    },
+};
+
+(async () => {
+    let handlers;
+    for (const [source, files] of builds) {
+        server = files;
+        handlers = {};
+        const self = {
+            location: { origin: ORIGIN },
+            addEventListener: (type, handler) => { handlers[type] = handler; },
+            skipWaiting: async () => {},
+            clients: { claim: async () => {} },
+        };
+        vm.runInNewContext(source, { self, caches, fetch: fetchUrl, URL, Promise });
+        for (const type of ['install', 'activate']) {
+            let done;
+            handlers[type]({ waitUntil: promise => { done = promise; } });
+            await done;
+        }
+    }
+    const answers = {};
+    for (const path of fetches) {
+        const request = { url: ORIGIN + path, method: 'GET', mode: 'no-cors' };
+        let answer = fetchUrl(request);
+        handlers.fetch({ request, respondWith: promise => { answer = promise; }, waitUntil: () => {} });
+        const result = await answer;
+        answers[path] = [result.status, result.body];
+    }
+    console.log(JSON.stringify({ caches: [...stores.keys()].sort(), answers }));
+})();
+"""
+
+
+def build(minify: bool, stylesheet: str):
+    """sw.js of a build whose stylesheet has the given name, and what it serves"""
+    templates = SiteTemplates(minify=minify)
+    precache = {
+        (f"/{stylesheet}" if url.startswith("/custom.") else url): revision
+        for url, revision in service_worker.precache_manifest(
+            AssetPipeline(os.path.join(ROOT, "input", "assets")), templates
+        ).items()
+    }
+    files = {url: url for url in precache}
+    files["/"] = "index"
+    sw = service_worker.render_service_worker(precache, templates).decode("utf-8")
+    return sw, files
+
+
+def run_builds(builds, fetches):
+    if shutil.which("node") is None:
+        pytest.skip("node is not installed")
+    result = subprocess.run(
+        ["node", "-e", HARNESS],
+        input=json.dumps({"builds": builds, "fetches": fetches}),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+@pytest.mark.parametrize("minify", [False, True])
+def test_cached_pages_keep_their_stylesheet(minify):
+    builds = [build(minify, f"custom.{n}{n}{n}{n}{n}{n}{n}{n}.css") for n in (1, 2)]
+    shell = "shell-" + builds[1][0].split("'")[1]
+
+    # The second build's server no longer has the first stylesheet
+    result = run_builds(
+        builds, ["/custom.11111111.css", "/custom.22222222.css", "/missing.png"]
+    )
+
+    assert result["answers"] == {
+        "/custom.11111111.css": [200, "/custom.11111111.css"],
+        "/custom.22222222.css": [200, "/custom.22222222.css"],
+        "/missing.png": [404, ""],
+    }
+    assert result["caches"] == ["data", shell, "shell-previous"]
+
+
+def test_only_the_build_before_is_kept():
+    builds = [build(False, f"custom.{n}{n}{n}{n}{n}{n}{n}{n}.css") for n in (1, 2, 3)]
+
+    result = run_builds(builds, ["/custom.11111111.css", "/custom.22222222.css"])
+
+    assert result["answers"] == {
+        "/custom.11111111.css": [404, ""],
+        "/custom.22222222.css": [200, "/custom.22222222.css"],
+    }
+    assert len(result["caches"]) == 3
@@ -0,0 +1,102 @@
+"""Gzipped sitemap shards and the sitemap index over all regions"""
+
+import gzip
+import os
+import xml.etree.ElementTree as ET
+
+import sitemap
+from build_manifest import BuildManifest
+
+NS = {"sm": sitemap.NAMESPACE}
+BASE_URL = "https://auschecktis.at"
+
+
+def locs(path):
+    """<loc> of every <url> or <sitemap> in a (gzipped) sitemap file"""
+    with open(path, "rb") as f:
+        content = f.read()
+    if path.endswith(".gz"):
+        content = gzip.decompress(content)
+    return [loc.text for loc in ET.fromstring(content).iterfind(".//sm:loc", NS)]
+
+
+def urls(shard, days):
+    for day in days:
+        yield shard, {"loc": f"{BASE_URL}/day/{day}.html?a=1&b=2", "lastmod": None}
+
+
+def test_shards_split_at_the_url_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(sitemap, "MAX_URLS", 2)
+    manifest = BuildManifest(str(tmp_path))
+    days = ["2026-03-06", "2026-03-07", "2026-03-08"]
+
+    entries, count, written = sitemap.write_shards(
+        manifest, "", BASE_URL, urls("2026", days)
+    )
+
+    assert count == 3
+    assert [entry["loc"] for entry in entries] == [
+        f"{BASE_URL}/sitemap-2026.xml.gz",
+        f"{BASE_URL}/sitemap-2026-2.xml.gz",
+    ]
+    assert all(entry["lastmod"] for entry in entries)
+    assert written == [
+        str(tmp_path / "sitemap-2026.xml.gz"),
+        str(tmp_path / "sitemap-2026-2.xml.gz"),
+    ]
+    # & is escaped in the XML and comes back unescaped
+    assert locs(written[0]) + locs(written[1]) == [
+        f"{BASE_URL}/day/{day}.html?a=1&b=2" for day in days
+    ]
+
+
+def test_unchanged_shards_are_kept_and_dropped_ones_removed(tmp_path):
+    manifest = BuildManifest(str(tmp_path))
+    sitemap.write_shards(
+        manifest,
+        "",
+        BASE_URL,
+        list(urls("2025", ["2025-12-31"])) + list(urls("2026", ["2026-03-06"])),
+    )
+    inode = os.stat(tmp_path / "sitemap-2026.xml.gz").st_ino
+    lastmod = manifest.lastmod("sitemap-2026.xml.gz")
+
+    entries, _, written = sitemap.write_shards(
+        manifest, "", BASE_URL, urls("2026", ["2026-03-06"])
+    )
+
+    assert written == []
+    assert entries == [{"loc": f"{BASE_URL}/sitemap-2026.xml.gz", "lastmod": lastmod}]
+    assert os.stat(tmp_path / "sitemap-2026.xml.gz").st_ino == inode
+    assert not (tmp_path / "sitemap-2025.xml.gz").exists()
+    assert manifest.lastmod("sitemap-2025.xml.gz") is None
+
+
+def test_index_lists_the_shards_of_every_region(small_site):
+    from build_static_site import SHARED_MANIFEST, build_regions
+
+    build_regions(str(small_site))
+    generated = small_site / "generated"
+
+    assert locs(str(generated / "sitemap.xml")) == [
+        f"{BASE_URL}/sitemap-pages.xml.gz",
+        f"{BASE_URL}/sitemap-2026.xml.gz",
+        f"{BASE_URL}/wachau/sitemap-pages.xml.gz",
+        f"{BASE_URL}/wachau/sitemap-2026.xml.gz",
+        f"{BASE_URL}/regions/sitemap-regions.xml.gz",
+    ]
+    # Only days with events, each in its own region's shard
+    assert locs(str(generated / "sitemap-2026.xml.gz")) == [
+        f"{BASE_URL}/day/2026-03-06.html",
+        f"{BASE_URL}/day/2026-03-07.html",
+    ]
+    assert locs(str(generated / "wachau" / "sitemap-2026.xml.gz")) == [
+        f"{BASE_URL}/wachau/day/2026-03-08.html",
+    ]
+    index = BuildManifest(str(generated), SHARED_MANIFEST).lastmod("sitemap.xml")
+    assert index
+
+    build_regions(str(small_site))
+
+    manifest = BuildManifest(str(generated), SHARED_MANIFEST)
+    assert manifest.lastmod("sitemap.xml") == index
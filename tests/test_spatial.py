@@ -0,0 +1,81 @@
+"""Marker clusters and the nearest open venue per grid cell of the map layers"""
+
+import json
+import random
+
+import spatial
+from conftest import venue
+from event_model import Event, Venue, parse_datetime
+from spatial import SpatialIndex, distance_m
+
+
+def event(key, lat=None, lng=None):
+    return Event(
+        Venue(key, key.title(), lat=lat, lng=lng),
+        parse_datetime("2026-03-07T16:00:00"),
+    )
+
+
+def test_nearest_grid_matches_a_full_scan():
+    rng = random.Random(7)
+    master = {
+        f"v{i}": venue(
+            f"V{i}", 48.28 + rng.random() * 0.05, 16.37 + rng.random() * 0.06
+        )
+        for i in range(80)
+    }
+    index = SpatialIndex(master)
+    # More points than SCAN_POINTS, so the ring search is used
+    points = [index.positions[key] for key in list(master)[::2]]
+    assert len(points) > spatial.SCAN_POINTS
+
+    nearest = index.nearest_grid(points)
+
+    assert len(nearest) == index.rows * index.cols
+    for cell, found in enumerate(nearest):
+        center = index.cell_center(*divmod(cell, index.cols))
+        best = min(distance_m(center, point) for point in points)
+        assert distance_m(center, points[found]) == best
+
+
+def test_close_venues_share_a_marker():
+    index = SpatialIndex({})
+    points = [(48.3032, 16.4107), (48.3061, 16.4019), (48.3033, 16.4108)]
+
+    assert index.cluster(points) == [[0, 2], [1]]
+
+
+def test_day_layer_lists_each_placed_venue_once():
+    index = SpatialIndex(
+        {
+            "presshaus": venue("Presshaus", 48.3032, 16.4107),
+            "zahel": venue("Zahel", 48.3061, 16.4019),
+        }
+    )
+    layer = index.day_layer(
+        [
+            event("presshaus"),
+            event("presshaus"),
+            # Not in the master list: placed by its own coordinates, or not at all
+            event("klager", 48.2998, 16.4052),
+            event("wieninger"),
+        ]
+    )
+
+    assert [name for name, *_ in layer["v"]] == ["Presshaus", "Klager"]
+    assert layer["b"] == [[48.2998, 16.4052], [48.3032, 16.4107]]
+    assert layer["g"]["n"] == [index.rows, index.cols]
+    assert set(layer["g"]["v"]) == {0, 1}
+    assert "g" not in index.day_layer([event("presshaus")], nearest=False)
+
+
+def test_map_layers_per_day(small_site):
+    from build_static_site import build_region
+
+    build_region(str(small_site), True, "stammersdorf")
+    map_dir = small_site / "generated" / "map"
+    saturday = json.loads((map_dir / "2026-03-07.json").read_bytes())
+    assert [name for name, *_ in saturday["v"]] == ["Zahel", "Presshaus"]
+    assert len(saturday["c"]) == 2
+    empty = json.loads((map_dir / "2026-03-01.json").read_bytes())
+    assert empty["v"] == [] and empty["b"] is None